@@ -1,14 +1,32 @@
 #!/usr/bin/env python3
-"""Interactive CLI for the Yaesu FT-1000MP CAT control."""
+"""Interactive CLI for the Yaesu FT-1000MP CAT control.
+
+Besides the interactive prompt, ``--script FILE`` (or ``--script -`` for
+stdin) runs a command file non-interactively: every line is parsed and
+validated before the port is opened, and consecutive write-only commands
+are sent back to back in one batch.  ``--json`` prints the results, or
+the error that stopped the script, as a single JSON document instead of
+text.
+"""
 
-import argparse
 import os
 import sys
-
-from ft1000mp import FT1000MP, FT1000MPError
-from ft1000mp.protocol import MODE_BY_NAME
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Callable, NoReturn
+
+# Only light modules at import time so ``--help`` and one-shot scripts
+# start fast; the transceiver (and pyserial) load when first needed.
+from ft1000mp.exceptions import FT1000MPError
 from ft1000mp.serial_port import DEFAULT_PORT, detect_port
 
+if TYPE_CHECKING:
+    import argparse
+
+    from ft1000mp.profiler import WireProfiler
+    from ft1000mp.transceiver import FT1000MP
+
 
 def print_help():
     print(
@@ -30,6 +48,9 @@ FT-1000MP CAT Control Commands:
   mem <1-99>        Recall memory channel
   vfo2mem <1-99>    Store VFO to memory channel
   mem2vfo <1-99>    Recall memory channel to VFO
+  watch [rate_hz]   Live VFO/flag dashboard (default 2 Hz, Ctrl-C to stop)
+  profile [reset]   Per-opcode wire-time report (needs --profile)
+  calibrate         Measure per-opcode settle times and save them for this port
   ports             List available serial ports
   help              Show this help
   quit              Exit
@@ -51,16 +72,20 @@ def _env_bool(name: str) -> "bool | None":
     return val.lower() in ("1", "true")
 
 
-def _parse_args() -> argparse.Namespace:
+def _parse_args() -> "argparse.Namespace":
+    import argparse
+
     parser = argparse.ArgumentParser(description="FT-1000MP CAT Control")
     parser.add_argument(
         "port", nargs="?", default=None,
-        help=f"serial port — e.g. COM3 (Windows) or /dev/ttyUSB0 (Linux). "
+        help=f"serial port — e.g. COM3 (Windows) or /dev/ttyUSB0 (Linux), "
+             f"or tcp://host:port, rfc2217://host:port, loop:// (emulator). "
              f"Default: {DEFAULT_PORT}, or FT1000MP_PORT env var.",
     )
     parser.add_argument(
         "--detect", action="store_true",
-        help="auto-detect the serial port by unplugging/replugging the cable",
+        help="auto-detect the serial port by probing every port for the radio "
+             "(falls back to unplugging/replugging the cable)",
     )
     parser.add_argument(
         "--rts", choices=["on", "off"], default=None,
@@ -71,7 +96,29 @@ def _parse_args() -> argparse.Namespace:
         "--dtr", choices=["on", "off"], default=None,
         help="force DTR line state (default: driver default, or FT1000MP_DTR env var)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--wait", metavar="SECONDS", type=float, default=0.0,
+        help="if another program holds the port, ask it to hand over and "
+             "wait up to SECONDS (default: fail at once)",
+    )
+    parser.add_argument(
+        "--script", metavar="FILE", default=None,
+        help="run commands from FILE ('-' for stdin) non-interactively "
+             "instead of starting the prompt",
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="with --script, print results (and any error) as one JSON document",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="time every command (pacing, wire, first byte, read) and print "
+             "a per-opcode report on exit",
+    )
+    args = parser.parse_args()
+    if args.json and args.script is None:
+        parser.error("--json needs --script")
+    return args
 
 
 def _resolve_bool(cli_val: "str | None", env_name: str) -> "bool | None":
@@ -81,16 +128,497 @@ def _resolve_bool(cli_val: "str | None", env_name: str) -> "bool | None":
     return _env_bool(env_name)
 
 
+# ---------------------------------------------------------------------------
+# Radio commands — parsed and validated into actions before they run
+# ---------------------------------------------------------------------------
+
+USAGE = {
+    "vfo": "vfo a|b",
+    "split": "split on|off",
+    "clar": "clar on|off | clar <offset_hz>",
+    "ptt": "ptt on|off",
+    "mem": "mem <1-99>",
+    "vfo2mem": "vfo2mem <1-99>",
+    "mem2vfo": "mem2vfo <1-99>",
+}
+
+
+class UsageError(ValueError):
+    """A command was given without its required argument."""
+
+
+class UnknownCommandError(ValueError):
+    """The command name is not a radio command."""
+
+
+@dataclass
+class Result:
+    """Outcome of one command: JSON-friendly data plus the text rendering."""
+    data: dict
+    lines: list = field(default_factory=list)
+
+
+@dataclass
+class Action:
+    """A validated command, ready to run against the radio."""
+    command: str
+    run: "Callable[[FT1000MP], Result]"
+    write: bool
+    line: int = 0
+
+
+def _on_off(cmd: str, args: "list[str]") -> bool:
+    if not args:
+        raise UsageError(USAGE[cmd])
+    val = args[0].lower()
+    if val not in ("on", "off"):
+        raise ValueError(f"expected on|off, got '{args[0]}'")
+    return val == "on"
+
+
+def _channel(cmd: str, args: "list[str]") -> int:
+    if not args:
+        raise UsageError(USAGE[cmd])
+    channel = int(args[0])
+    if not (1 <= channel <= 99):
+        raise ValueError(f"Channel must be 1-99, got {channel}")
+    return channel
+
+
+def _mhz_to_hz(arg: str) -> int:
+    from ft1000mp.transceiver import FT1000MP
+
+    freq_hz = int(float(arg) * 1_000_000)
+    FT1000MP._validate_freq(freq_hz)
+    return freq_hz
+
+
+def _vfo_lines(st) -> list:
+    return [
+        f"    Frequency : {format_freq(st.frequency_hz)}",
+        f"    Mode      : {st.mode_name}",
+        f"    Clarifier : {st.clarifier_offset:+d} Hz",
+        f"    RIT       : {'ON' if st.rit else 'OFF'}",
+        f"    XIT       : {'ON' if st.xit else 'OFF'}",
+    ]
+
+
+def build_action(cmd: str, args: "list[str]", line: int = 0) -> Action:
+    """Parse and validate one radio command without touching the radio.
+
+    Raises:
+        UsageError: A required argument is missing.
+        UnknownCommandError: ``cmd`` is not a radio command.
+        ValueError, FT1000MPError: The command or an argument is invalid.
+    """
+    from ft1000mp.protocol import MODE_BY_NAME
+    from ft1000mp.transceiver import CLARIFIER_MAX_HZ, FT1000MP
+
+    data = {"command": cmd}
+
+    if cmd == "status":
+        if args and args[0].lower() == "ab":
+            def run(radio):
+                vfo_a, vfo_b = radio.get_both_vfo_status()
+                lines = []
+                for label, st in [("VFO-A", vfo_a), ("VFO-B", vfo_b)]:
+                    lines.append(f"  {label}:")
+                    lines.extend(_vfo_lines(st))
+                return Result({**data, "vfo_a": asdict(vfo_a), "vfo_b": asdict(vfo_b)}, lines)
+        else:
+            def run(radio):
+                status = radio.get_vfo_status()
+                return Result(
+                    {**data, "current": asdict(status)},
+                    ["  Current VFO:"] + _vfo_lines(status),
+                )
+        return Action(cmd, run, write=False, line=line)
+
+    if cmd == "flags":
+        def run(radio):
+            flags = radio.read_flags()
+            return Result({**data, **asdict(flags)}, [
+                f"  Split       : {'ON' if flags.split else 'OFF'}",
+                f"  Clarifier   : {'ON' if flags.clarifier else 'OFF'}",
+                f"  VFO         : {'B' if flags.vfo_b_selected else 'A'}",
+                f"  TX          : {'ON' if flags.transmitting else 'OFF'}",
+                f"  Priority    : {'ON' if flags.priority else 'OFF'}",
+                f"  Raw flags   : 0x{flags.raw:02X}",
+            ])
+        return Action(cmd, run, write=False, line=line)
+
+    if cmd in ("freq", "freqb"):
+        if not args:
+            def run(radio):
+                status = radio.get_vfo_status()
+                return Result(
+                    {**data, "frequency_hz": status.frequency_hz},
+                    [f"  VFO: {format_freq(status.frequency_hz)}"],
+                )
+            return Action(cmd, run, write=False, line=line)
+        freq_hz = _mhz_to_hz(args[0])
+        vfo = "A" if cmd == "freq" else "B"
+
+        def run(radio):
+            if vfo == "A":
+                radio.set_frequency_a(freq_hz)
+            else:
+                radio.set_frequency_b(freq_hz)
+            return Result(
+                {**data, "vfo": vfo, "frequency_hz": freq_hz},
+                [f"  VFO-{vfo} set to {format_freq(freq_hz)}"],
+            )
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd in ("mode", "modeb"):
+        if not args:
+            available = sorted(MODE_BY_NAME.keys())
+
+            def run(radio):
+                return Result(
+                    {**data, "available": available},
+                    [f"  Available: {', '.join(available)}"],
+                )
+            return Action(cmd, run, write=False, line=line)
+        FT1000MP._validate_mode(args[0])
+        mode = args[0].upper()
+        vfo_b = cmd == "modeb"
+
+        def run(radio):
+            radio.set_mode(mode, vfo_b=vfo_b)
+            text = f"  VFO-B mode set to {mode}" if vfo_b else f"  Mode set to {mode}"
+            return Result({**data, "vfo": "B" if vfo_b else "A", "mode": mode}, [text])
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd == "vfo":
+        if not args:
+            raise UsageError(USAGE[cmd])
+        vfo = args[0].upper()
+        if vfo not in ("A", "B"):
+            raise ValueError(f"expected a|b, got '{args[0]}'")
+
+        def run(radio):
+            radio.select_vfo(vfo)
+            return Result({**data, "vfo": vfo}, [f"  Selected VFO-{vfo}"])
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd == "ab":
+        def run(radio):
+            radio.copy_vfo_a_to_b()
+            return Result(data, ["  Copied VFO-A to VFO-B"])
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd in ("split", "ptt"):
+        on = _on_off(cmd, args)
+        label = cmd.capitalize() if cmd == "split" else "PTT"
+
+        def run(radio):
+            if cmd == "split":
+                radio.set_split(on)
+            else:
+                radio.set_ptt(on)
+            return Result({**data, "on": on}, [f"  {label} {'ON' if on else 'OFF'}"])
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd == "clar":
+        if not args:
+            raise UsageError(USAGE[cmd])
+        if args[0].lower() in ("on", "off"):
+            on = args[0].lower() == "on"
+
+            def run(radio):
+                radio.set_clarifier(on)
+                return Result({**data, "on": on}, [f"  Clarifier {'ON' if on else 'OFF'}"])
+        else:
+            offset = int(args[0])
+            if abs(offset) > CLARIFIER_MAX_HZ:
+                raise ValueError(
+                    f"clarifier offset must be within ±{CLARIFIER_MAX_HZ} Hz, got {offset}"
+                )
+
+            def run(radio):
+                radio.set_clarifier_offset(offset)
+                return Result(
+                    {**data, "offset_hz": offset},
+                    [f"  Clarifier offset set to {offset:+d} Hz"],
+                )
+        return Action(cmd, run, write=True, line=line)
+
+    if cmd in ("mem", "vfo2mem", "mem2vfo"):
+        channel = _channel(cmd, args)
+
+        def run(radio):
+            if cmd == "mem":
+                radio.recall_memory(channel)
+                text = f"  Recalled memory channel {channel}"
+            elif cmd == "vfo2mem":
+                radio.vfo_to_memory(channel)
+                text = f"  VFO stored to memory channel {channel}"
+            else:
+                radio.memory_to_vfo(channel)
+                text = f"  Memory channel {channel} recalled to VFO"
+            return Result({**data, "channel": channel}, [text])
+        return Action(cmd, run, write=True, line=line)
+
+    raise UnknownCommandError(f"Unknown command: {cmd}")
+
+
+# ---------------------------------------------------------------------------
+# Watch mode — live dashboard that only redraws fields that changed
+# ---------------------------------------------------------------------------
+
+WATCH_FIELDS = [
+    ("a_freq", "VFO-A"),
+    ("a_mode", "  Mode"),
+    ("a_clar", "  Clarifier"),
+    ("b_freq", "VFO-B"),
+    ("b_mode", "  Mode"),
+    ("b_clar", "  Clarifier"),
+    ("split", "Split"),
+    ("tx", "TX"),
+    ("rit", "Active RIT"),
+    ("rate", "Poll rate"),
+    ("latency", "Latency"),
+]
+
+
+class WatchDisplay:
+    """Fixed-layout dashboard that rewrites only the fields that changed.
+
+    On a terminal, changed values are redrawn in place with ANSI cursor
+    movement.  Otherwise (pipe, log file) each change is printed as a line.
+    """
+
+    def __init__(self, out=None, ansi: "bool | None" = None):
+        self.out = out or sys.stdout
+        self.ansi = self.out.isatty() if ansi is None else ansi
+        self._shown: dict = {}
+
+    @staticmethod
+    def _line(label: str, value: str) -> str:
+        return f"  {label:<12}: {value}"
+
+    def update(self, values: dict) -> None:
+        if self.ansi and not self._shown:
+            for key, label in WATCH_FIELDS:
+                self.out.write(self._line(label, values[key]) + "\n")
+            self._shown = dict(values)
+            self.out.flush()
+            return
+
+        for row, (key, label) in enumerate(WATCH_FIELDS):
+            value = values[key]
+            if self._shown.get(key) == value:
+                continue
+            self._shown[key] = value
+            if self.ansi:
+                up = len(WATCH_FIELDS) - row
+                # up to the field's row, rewrite it, clear the tail, back down
+                self.out.write(f"\x1b[{up}A\r{self._line(label, value)}\x1b[K\x1b[{up}B\r")
+            else:
+                self.out.write(self._line(label.strip(), value) + "\n")
+        self.out.flush()
+
+
+def _watch_values(vfos, flags, rate_hz: float, latency_s: float) -> dict:
+    vfo_a, vfo_b = vfos.a, vfos.b
+    active = vfo_b if vfos.selected == "B" else vfo_a
+    # "?" when the A/B labels are a guess (see get_vfos(probe=False))
+    which = f"VFO-{vfos.selected}{'' if vfos.confident else '?'}"
+
+    def clar(st) -> str:
+        return f"{st.clarifier_offset:+d} Hz  RIT {'ON' if st.rit else 'OFF'}  XIT {'ON' if st.xit else 'OFF'}"
+
+    return {
+        "a_freq": format_freq(vfo_a.frequency_hz),
+        "a_mode": vfo_a.mode_name,
+        "a_clar": clar(vfo_a),
+        "b_freq": format_freq(vfo_b.frequency_hz),
+        "b_mode": vfo_b.mode_name,
+        "b_clar": clar(vfo_b),
+        "split": "ON" if flags.split else "OFF",
+        "tx": "ON" if flags.transmitting else "OFF",
+        # read_flags().clarifier is unreliable; RIT on the active VFO is not
+        "rit": f"{'ON' if active.rit else 'OFF'} ({which})",
+        "rate": f"{rate_hz:.1f} Hz",
+        "latency": f"{latency_s * 1000:.0f} ms",
+    }
+
+
+def watch(radio: "FT1000MP", rate_hz: float = 2.0) -> None:
+    """Poll both VFOs and the flags at ``rate_hz`` until Ctrl-C.
+
+    Each cycle is one 32-byte VFO read plus one 5-byte flag read, labelled
+    A and B by ``get_vfos(probe=False)`` (never the slow all-data probe).
+    If the link cannot keep up, cycles run back to back instead of
+    bunching up.
+    """
+    if rate_hz <= 0:
+        raise ValueError(f"rate must be positive, got {rate_hz}")
+    period = 1.0 / rate_hz
+    display = WatchDisplay()
+    stamps: deque = deque(maxlen=10)
+    next_at = time.monotonic()
+    try:
+        while True:
+            start = time.monotonic()
+            vfos = radio.get_vfos(probe=False)
+            flags = radio.read_flags()
+            latency = time.monotonic() - start
+            stamps.append(start)
+            achieved = (
+                (len(stamps) - 1) / (stamps[-1] - stamps[0]) if len(stamps) > 1 else 0.0
+            )
+            display.update(_watch_values(vfos, flags, achieved, latency))
+
+            next_at += period
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_at = time.monotonic()  # fell behind: don't burst to catch up
+    except KeyboardInterrupt:
+        print()
+
+
+# ---------------------------------------------------------------------------
+# Script mode
+# ---------------------------------------------------------------------------
+
+def parse_script(text: str) -> list:
+    """Parse a whole command file into actions.
+
+    Blank lines and ``#`` comments are skipped.  Every line is validated
+    before anything is sent; all problems are reported together.
+
+    Raises:
+        ValueError: One or more lines are invalid (one line per problem).
+    """
+    actions = []
+    errors = []
+    for n, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        try:
+            actions.append(build_action(parts[0].lower(), parts[1:], n))
+        except UsageError as e:
+            errors.append(f"line {n}: usage: {e}")
+        except (FT1000MPError, ValueError) as e:
+            errors.append(f"line {n}: {e}")
+    if errors:
+        raise ValueError("\n".join(errors))
+    return actions
+
+
+def run_script(radio: "FT1000MP", actions: list, as_json: bool = False) -> int:
+    """Run parsed actions; consecutive writes go out as one batch.
+
+    Returns:
+        Process exit status: 0 on success, 1 if a command failed.
+    """
+    import json
+
+    results = []
+    error = None
+    failing = ""
+    i = 0
+    try:
+        while i < len(actions):
+            j = i + 1
+            if actions[i].write:
+                while j < len(actions) and actions[j].write:
+                    j += 1
+            group = actions[i:j]
+            with radio.batch():
+                done = []
+                for action in group:
+                    failing = f"line {action.line}"
+                    done.append((action, action.run(radio)))
+                # A send that fails as the batch ends is blamed on all of it
+                if len(group) > 1:
+                    failing = f"lines {group[0].line}-{group[-1].line}"
+            for action, result in done:
+                results.append({"line": action.line, **result.data})
+                if not as_json:
+                    print("\n".join(result.lines))
+            i = j
+    except FT1000MPError as e:
+        error = f"{failing}: {e}"
+
+    if as_json:
+        print(json.dumps({"ok": error is None, "results": results, "error": error}, indent=2))
+    elif error:
+        print(f"Error: {error}", file=sys.stderr)
+    return 0 if error is None else 1
+
+
+def _script_error(error: str, status: int, as_json: bool) -> NoReturn:
+    """Report a script that could not run at all, then exit with ``status``."""
+    if as_json:
+        import json
+
+        print(json.dumps({"ok": False, "results": [], "error": error}, indent=2))
+    else:
+        print(f"Error: {error}", file=sys.stderr)
+    sys.exit(status)
+
+
+def _profiler(enabled: bool) -> "WireProfiler | None":
+    if not enabled:
+        return None
+    from ft1000mp.profiler import WireProfiler
+
+    return WireProfiler()
+
+
 def main():
     args = _parse_args()
+    rts = _resolve_bool(args.rts, "FT1000MP_RTS")
+    dtr = _resolve_bool(args.dtr, "FT1000MP_DTR")
     if args.port is not None:
         port = args.port
     elif args.detect:
-        port = detect_port()
+        from ft1000mp.probe import probe_ports
+
+        found = probe_ports()
+        if found:
+            port = found[0].port
+            print(f"Detected: {port} ({format_freq(found[0].frequency_hz)})")
+            # Line settings that worked, unless set by flag or env var
+            if rts is None:
+                rts = found[0].rts
+            if dtr is None:
+                dtr = found[0].dtr
+        else:
+            port = detect_port(probe=False)
     else:
         port = DEFAULT_PORT
-    rts = _resolve_bool(args.rts, "FT1000MP_RTS")
-    dtr = _resolve_bool(args.dtr, "FT1000MP_DTR")
+
+    from ft1000mp.transceiver import FT1000MP
+
+    if args.script is not None:
+        try:
+            if args.script == "-":
+                text = sys.stdin.read()
+            else:
+                with open(args.script, encoding="utf-8") as f:
+                    text = f.read()
+            actions = parse_script(text)
+        except (OSError, ValueError) as e:
+            _script_error(str(e), 2, args.json)
+        profiler = _profiler(args.profile)
+        try:
+            with FT1000MP(port=port, rts=rts, dtr=dtr, lock_timeout=args.wait) as radio:
+                radio.profiler = profiler
+                status = run_script(radio, actions, as_json=args.json)
+        except FT1000MPError as e:
+            _script_error(str(e), 1, args.json)
+        finally:
+            if profiler is not None:
+                print(profiler.report(), file=sys.stderr)  # stdout may be JSON
+        sys.exit(status)
 
     print(f"FT-1000MP CAT Control — connecting on {port}")
     if rts is not None or dtr is not None:
@@ -100,12 +628,14 @@ def main():
         if dtr is not None:
             parts.append(f"DTR={'on' if dtr else 'off'}")
         print(f"  Serial line overrides: {', '.join(parts)}")
+    profiler = _profiler(args.profile)
     try:
-        radio = FT1000MP(port=port, rts=rts, dtr=dtr)
+        radio = FT1000MP(port=port, rts=rts, dtr=dtr, lock_timeout=args.wait)
         radio.open()
     except FT1000MPError as e:
         print(f"Error: {e}")
         sys.exit(1)
+    radio.profiler = profiler
 
     print("Connected. Type 'help' for commands, 'quit' to exit.\n")
 
@@ -130,134 +660,25 @@ def main():
                 elif cmd == "help":
                     print_help()
 
-                elif cmd == "status":
-                    if args and args[0].lower() == "ab":
-                        vfo_a, vfo_b = radio.get_both_vfo_status()
-                        for label, st in [("VFO-A", vfo_a), ("VFO-B", vfo_b)]:
-                            print(f"  {label}:")
-                            print(f"    Frequency : {format_freq(st.frequency_hz)}")
-                            print(f"    Mode      : {st.mode_name}")
-                            print(f"    Clarifier : {st.clarifier_offset:+d} Hz")
-                            print(f"    RIT       : {'ON' if st.rit else 'OFF'}")
-                            print(f"    XIT       : {'ON' if st.xit else 'OFF'}")
-                    else:
-                        status = radio.get_vfo_status()
-                        print(f"  Current VFO:")
-                        print(f"    Frequency : {format_freq(status.frequency_hz)}")
-                        print(f"    Mode      : {status.mode_name}")
-                        print(f"    Clarifier : {status.clarifier_offset:+d} Hz")
-                        print(f"    RIT       : {'ON' if status.rit else 'OFF'}")
-                        print(f"    XIT       : {'ON' if status.xit else 'OFF'}")
-
-                elif cmd == "flags":
-                    flags = radio.read_flags()
-                    print(f"  Split       : {'ON' if flags.split else 'OFF'}")
-                    print(f"  Clarifier   : {'ON' if flags.clarifier else 'OFF'}")
-                    print(f"  VFO         : {'B' if flags.vfo_b_selected else 'A'}")
-                    print(f"  TX          : {'ON' if flags.transmitting else 'OFF'}")
-                    print(f"  Priority    : {'ON' if flags.priority else 'OFF'}")
-                    print(f"  Raw flags   : 0x{flags.raw:02X}")
-
-                elif cmd == "freq":
-                    if not args:
-                        status = radio.get_vfo_status()
-                        print(f"  VFO: {format_freq(status.frequency_hz)}")
-                    else:
-                        freq_mhz = float(args[0])
-                        freq_hz = int(freq_mhz * 1_000_000)
-                        radio.set_frequency_a(freq_hz)
-                        print(f"  VFO-A set to {format_freq(freq_hz)}")
-
-                elif cmd == "freqb":
-                    if not args:
-                        status = radio.get_vfo_status()
-                        print(f"  VFO: {format_freq(status.frequency_hz)}")
-                    else:
-                        freq_mhz = float(args[0])
-                        freq_hz = int(freq_mhz * 1_000_000)
-                        radio.set_frequency_b(freq_hz)
-                        print(f"  VFO-B set to {format_freq(freq_hz)}")
-
-                elif cmd == "mode":
-                    if not args:
-                        print(
-                            f"  Available: {', '.join(sorted(MODE_BY_NAME.keys()))}"
-                        )
-                    else:
-                        radio.set_mode(args[0])
-                        print(f"  Mode set to {args[0].upper()}")
-
-                elif cmd == "modeb":
-                    if not args:
-                        print(
-                            f"  Available: {', '.join(sorted(MODE_BY_NAME.keys()))}"
-                        )
-                    else:
-                        radio.set_mode(args[0], vfo_b=True)
-                        print(f"  VFO-B mode set to {args[0].upper()}")
-
-                elif cmd == "vfo":
-                    if not args:
-                        print("  Usage: vfo a|b")
-                    else:
-                        radio.select_vfo(args[0])
-                        print(f"  Selected VFO-{args[0].upper()}")
-
-                elif cmd == "ab":
-                    radio.copy_vfo_a_to_b()
-                    print("  Copied VFO-A to VFO-B")
+                elif cmd == "watch":
+                    watch(radio, float(args[0]) if args else 2.0)
 
-                elif cmd == "split":
-                    if not args:
-                        print("  Usage: split on|off")
-                    else:
-                        on = args[0].lower() == "on"
-                        radio.set_split(on)
-                        print(f"  Split {'ON' if on else 'OFF'}")
-
-                elif cmd == "clar":
-                    if not args:
-                        print("  Usage: clar on|off | clar <offset_hz>")
-                    elif args[0].lower() in ("on", "off"):
-                        on = args[0].lower() == "on"
-                        radio.set_clarifier(on)
-                        print(f"  Clarifier {'ON' if on else 'OFF'}")
+                elif cmd == "profile":
+                    if profiler is None:
+                        print("  Profiling is off; start the CLI with --profile.")
+                    elif args and args[0].lower() == "reset":
+                        profiler.reset()
                     else:
-                        offset = int(args[0])
-                        radio.set_clarifier_offset(offset)
-                        print(f"  Clarifier offset set to {offset:+d} Hz")
+                        print(profiler.report())
 
-                elif cmd == "ptt":
-                    if not args:
-                        print("  Usage: ptt on|off")
-                    else:
-                        on = args[0].lower() == "on"
-                        radio.set_ptt(on)
-                        print(f"  PTT {'ON' if on else 'OFF'}")
-
-                elif cmd == "mem":
-                    if not args:
-                        print("  Usage: mem <1-99>")
-                    else:
-                        channel = int(args[0])
-                        radio.recall_memory(channel)
-                        print(f"  Recalled memory channel {channel}")
+                elif cmd == "calibrate":
+                    from ft1000mp.profiler import opcode_name
 
-                elif cmd == "vfo2mem":
-                    if not args:
-                        print("  Usage: vfo2mem <1-99>")
-                    else:
-                        channel = int(args[0])
-                        radio.vfo_to_memory(channel)
-                        print(f"  VFO stored to memory channel {channel}")
-
-                elif cmd == "mem2vfo":
-                    if not args:
-                        print("  Usage: mem2vfo <1-99>")
-                    else:
-                        channel = int(args[0])
-                        radio.memory_to_vfo(channel)
-                        print(f"  Memory channel {channel} recalled to VFO")
+                    print("  Calibrating (harmless commands only)...")
+                    table = radio.calibrate_timing()
+                    for op, timing in sorted(table.per_opcode.items()):
+                        print(f"  {opcode_name(op):<16} settle {timing.settle * 1000:5.1f} ms")
+                    print("  Saved; applied automatically on this port from now on.")
 
                 elif cmd == "ports":
                     from serial.tools.list_ports import comports
@@ -270,7 +691,15 @@ def main():
                             print(f"  {p.device}  {p.description}{marker}")
 
                 else:
-                    print(f"  Unknown command: {cmd}. Type 'help' for commands.")
+                    try:
+                        action = build_action(cmd, args)
+                    except UsageError as e:
+                        print(f"  Usage: {e}")
+                        continue
+                    except UnknownCommandError:
+                        print(f"  Unknown command: {cmd}. Type 'help' for commands.")
+                        continue
+                    print("\n".join(action.run(radio).lines))
 
             except FT1000MPError as e:
                 print(f"  Error: {e}")
@@ -282,6 +711,8 @@ def main():
     finally:
         radio.close()
         print("Disconnected.")
+        if profiler is not None:
+            print(profiler.report())
 
 
 if __name__ == "__main__":
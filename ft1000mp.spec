@@ -1,6 +1,8 @@
 # -*- mode: python ; coding: utf-8 -*-
 """PyInstaller spec file for ft1000mp CLI."""
 
+from PyInstaller.utils.hooks import collect_submodules
+
 a = Analysis(
     ['cli.py'],
     pathex=[],
@@ -11,6 +13,8 @@ a = Analysis(
         'serial.tools.list_ports_windows',
         'serial.tools.list_ports_linux',
         'serial.tools.list_ports_posix',
+        # ft1000mp loads its submodules lazily (PEP 562 __getattr__)
+        *collect_submodules('ft1000mp'),
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,31 +1,205 @@
-"""Yaesu FT-1000MP CAT control package."""
-
-from .bcd import bcd_bytes_to_freq, bytes_to_freq, freq_to_bcd_bytes, freq_to_bytes
-from .exceptions import (
-    CommandTimeoutError,
-    FT1000MPError,
-    InvalidFrequencyError,
-    InvalidModeError,
-    SerialConnectionError,
-)
-from .protocol import Mode, Opcode, StatusFlag, SUB_MODE_NAMES, VFO
-from .serial_port import SerialPort
-from .transceiver import FT1000MP, RadioFlags, VFOStatus
+"""Yaesu FT-1000MP CAT control package.
+
+Public names are loaded lazily (PEP 562): ``import ft1000mp`` is nearly
+free, each submodule is imported on first attribute access, and pyserial
+is only imported when a port is actually opened.
+"""
+
+import importlib
+
+# Not ``from typing import TYPE_CHECKING``: importing typing alone costs
+# several milliseconds.  Type checkers treat this name the same way.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .archive import ArchiveReader, ArchiveRow, ArchiveWriter
+    from .bandplan import BandPlan, Segment
+    from .bcd import bcd_bytes_to_freq, bytes_to_freq, freq_to_bcd_bytes, freq_to_bytes
+    from .hopping import Hop, HopExecutor, HopTable
+    from .exceptions import (
+        ArchiveError,
+        CommandTimeoutError,
+        DeadlineExceeded,
+        FT1000MPError,
+        InterlockError,
+        InvalidFrequencyError,
+        InvalidModeError,
+        PoolError,
+        PortBusyError,
+        SerialConnectionError,
+    )
+    from .metering import MeterSampler
+    from .protocol import Mode, Opcode, StatusFlag, StatusTarget, SUB_MODE_NAMES, VFO
+    from .pool import RadioPool
+    from .portlock import LockHolder, lock_holder
+    from .profiler import WireProfiler
+    from .ptt import PTTController
+    from .reconnect import ReconnectingSerialPort, ReconnectPolicy
+    from .schedule import Landing, next_period
+    from .serial_port import SerialPort
+    from .spots import QSYEngine, Spot, SpotRule
+    from .state import StateCache, StatePoller
+    from .streaming import StatusSample, StatusStream
+    from .shared_state import FT1000MPStatePublisher, FT1000MPStateReader
+    from .timing import OpcodeTiming, TimingTable
+    from .tracking import VFOSnapshot
+    from .transceiver import (
+        FT1000MP,
+        MemoryDump,
+        RadioFlags,
+        RadioSnapshot,
+        SweepResult,
+        VFOStatus,
+    )
+    from .wsjtx import WSJTXListener
+    from .transport import (
+        LocalSerialTransport,
+        LoopbackTransport,
+        RFC2217Transport,
+        TCPTransport,
+        Transport,
+    )
+
+# public name → submodule that defines it
+_LAZY_ATTRS: dict[str, str] = {
+    "ArchiveReader": "archive",
+    "ArchiveRow": "archive",
+    "ArchiveWriter": "archive",
+    "BandPlan": "bandplan",
+    "Segment": "bandplan",
+    "bcd_bytes_to_freq": "bcd",
+    "bytes_to_freq": "bcd",
+    "freq_to_bcd_bytes": "bcd",
+    "freq_to_bytes": "bcd",
+    "Hop": "hopping",
+    "HopExecutor": "hopping",
+    "HopTable": "hopping",
+    "ArchiveError": "exceptions",
+    "CommandTimeoutError": "exceptions",
+    "DeadlineExceeded": "exceptions",
+    "FT1000MPError": "exceptions",
+    "InvalidFrequencyError": "exceptions",
+    "InvalidModeError": "exceptions",
+    "InterlockError": "exceptions",
+    "PoolError": "exceptions",
+    "PortBusyError": "exceptions",
+    "SerialConnectionError": "exceptions",
+    "MeterSampler": "metering",
+    "Mode": "protocol",
+    "Opcode": "protocol",
+    "StatusFlag": "protocol",
+    "StatusTarget": "protocol",
+    "SUB_MODE_NAMES": "protocol",
+    "VFO": "protocol",
+    "RadioPool": "pool",
+    "LockHolder": "portlock",
+    "lock_holder": "portlock",
+    "WireProfiler": "profiler",
+    "PTTController": "ptt",
+    "ReconnectingSerialPort": "reconnect",
+    "ReconnectPolicy": "reconnect",
+    "Landing": "schedule",
+    "next_period": "schedule",
+    "SerialPort": "serial_port",
+    "FT1000MPStatePublisher": "shared_state",
+    "FT1000MPStateReader": "shared_state",
+    "QSYEngine": "spots",
+    "Spot": "spots",
+    "SpotRule": "spots",
+    "StateCache": "state",
+    "StatePoller": "state",
+    "StatusSample": "streaming",
+    "StatusStream": "streaming",
+    "OpcodeTiming": "timing",
+    "TimingTable": "timing",
+    "VFOSnapshot": "tracking",
+    "FT1000MP": "transceiver",
+    "MemoryDump": "transceiver",
+    "RadioFlags": "transceiver",
+    "RadioSnapshot": "transceiver",
+    "SweepResult": "transceiver",
+    "VFOStatus": "transceiver",
+    "LocalSerialTransport": "transport",
+    "LoopbackTransport": "transport",
+    "RFC2217Transport": "transport",
+    "TCPTransport": "transport",
+    "Transport": "transport",
+    "WSJTXListener": "wsjtx",
+}
 
 __all__ = [
     "FT1000MP",
     "SerialPort",
+    "ReconnectingSerialPort",
+    "ReconnectPolicy",
+    "Transport",
+    "LocalSerialTransport",
+    "TCPTransport",
+    "RFC2217Transport",
+    "LoopbackTransport",
+    "RadioPool",
+    "PTTController",
+    "WireProfiler",
+    "TimingTable",
+    "OpcodeTiming",
+    "FT1000MPStatePublisher",
+    "FT1000MPStateReader",
     "VFOStatus",
     "RadioFlags",
+    "MemoryDump",
+    "SweepResult",
+    "RadioSnapshot",
+    "Landing",
+    "next_period",
+    "Hop",
+    "HopTable",
+    "HopExecutor",
+    "StatusSample",
+    "StatusStream",
+    "MeterSampler",
+    "VFOSnapshot",
+    "BandPlan",
+    "Segment",
+    "ArchiveWriter",
+    "QSYEngine",
+    "StateCache",
+    "StatePoller",
+    "WSJTXListener",
+    "SpotRule",
+    "Spot",
+    "ArchiveReader",
+    "ArchiveRow",
+    "LockHolder",
+    "lock_holder",
     "Mode",
     "Opcode",
     "StatusFlag",
+    "StatusTarget",
     "VFO",
     "FT1000MPError",
     "SerialConnectionError",
+    "PortBusyError",
     "CommandTimeoutError",
+    "DeadlineExceeded",
     "InvalidFrequencyError",
     "InvalidModeError",
+    "PoolError",
+    "InterlockError",
+    "ArchiveError",
     "freq_to_bcd_bytes",
     "bcd_bytes_to_freq",
 ]
+
+
+def __getattr__(name: str) -> "Any":
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,512 @@
+"""Compact on-disk history of VFO status and flags samples.
+
+JSON lines spend ~200 bytes on a sample that barely changes from the one
+before it.  An archive stores samples in chunks of columns instead:
+
+* timestamps (microseconds), frequencies and clarifier offsets as
+  zigzag varints of the delta from the previous row — a VFO parked on a
+  frequency costs one byte per sample;
+* mode, RIT/XIT/USER bits and the flags byte run-length encoded as
+  (value, run) varint pairs — usually one pair per chunk.
+
+File layout (little-endian)::
+
+    header   b"F1MA", version u16, reserved u16
+    chunk    b"CHNK", rows u32, first/last timestamp i64 (µs), payload u32,
+             then one column per COLUMNS entry: length u32 + bytes
+    ...
+    index    per chunk: offset u64, rows u32, first/last timestamp i64
+    trailer  index offset u64, chunk count u32, b"F1MI"
+
+The index lets ``ArchiveReader`` bisect to the first chunk of a time
+range without touching the ones before it.  A file whose writer died
+before ``close()`` has no index; the reader rebuilds it by walking the
+chunk headers, and ``ArchiveWriter`` appending to such a file drops the
+torn tail first.
+
+``ArchiveReader.rows()`` yields ``ArchiveRow`` objects in pure Python;
+``ArchiveReader.iter_arrays()`` decodes one chunk at a time into NumPy
+arrays (``pip install ft1000mp[archive]``) without building any rows.
+"""
+
+import os
+import struct
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional
+
+from .exceptions import ArchiveError
+from .protocol import MODE_NAMES, SUB_MODE_NAMES
+from .transceiver import RadioFlags, VFOStatus
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"F1MA"
+VERSION = 1
+DEFAULT_CHUNK_ROWS = 4096
+
+_HEADER = struct.Struct("<4sHH")
+_CHUNK = struct.Struct("<4sIqqI")
+_COLUMN = struct.Struct("<I")
+_ENTRY = struct.Struct("<QIqq")
+_TRAILER = struct.Struct("<QI4s")
+_CHUNK_MAGIC = b"CHNK"
+_INDEX_MAGIC = b"F1MI"
+
+# Column name → encoding.  Order is the on-disk order.
+DELTA, RLE = "delta", "rle"
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("time_us", DELTA),
+    ("freq_a", DELTA),
+    ("clar_a", DELTA),
+    ("mode_a", RLE),
+    ("bits_a", RLE),
+    ("freq_b", DELTA),
+    ("clar_b", DELTA),
+    ("mode_b", RLE),
+    ("bits_b", RLE),
+    ("flags", RLE),
+    ("present", RLE),
+)
+
+# bits_a / bits_b
+RIT, XIT, USER, SUB_MODE = 0x01, 0x02, 0x04, 0x08
+# present
+HAS_VFO_B, HAS_FLAGS = 0x01, 0x02
+
+
+@dataclass
+class ArchiveRow:
+    """One archived sample."""
+    timestamp: float
+    vfo_a: VFOStatus
+    vfo_b: Optional[VFOStatus] = None
+    flags: Optional[RadioFlags] = None
+
+
+@dataclass(frozen=True)
+class ChunkInfo:
+    """Index entry for one chunk."""
+    offset: int
+    rows: int
+    t_first_us: int
+    t_last_us: int
+
+
+# -- encoding ----------------------------------------------------------------
+
+def _put_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _varints(data: bytes) -> Iterator[int]:
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(u: int) -> int:
+    return u >> 1 if not u & 1 else -((u + 1) >> 1)
+
+
+def _encode_delta(values: list[int]) -> bytes:
+    out = bytearray()
+    prev = 0
+    for v in values:
+        _put_varint(out, _zigzag(v - prev))
+        prev = v
+    return bytes(out)
+
+
+def _decode_delta(data: bytes) -> list[int]:
+    values = []
+    acc = 0
+    for u in _varints(data):
+        acc += _unzigzag(u)
+        values.append(acc)
+    return values
+
+
+def _encode_rle(values: list[int]) -> bytes:
+    out = bytearray()
+    i, n = 0, len(values)
+    while i < n:
+        j = i + 1
+        while j < n and values[j] == values[i]:
+            j += 1
+        _put_varint(out, values[i])
+        _put_varint(out, j - i)
+        i = j
+    return bytes(out)
+
+
+def _decode_rle(data: bytes) -> list[int]:
+    values: list[int] = []
+    it = _varints(data)
+    for value in it:
+        values.extend([value] * next(it))
+    return values
+
+
+def _vfo_bits(vfo: VFOStatus) -> int:
+    bits = (RIT if vfo.rit else 0) | (XIT if vfo.xit else 0) | (USER if vfo.user_mode else 0)
+    if SUB_MODE_NAMES.get((vfo.mode, True)) == vfo.mode_name:
+        bits |= SUB_MODE
+    return bits
+
+
+def _vfo_from(freq: int, clar: int, mode: int, bits: int) -> VFOStatus:
+    """Rebuild a VFOStatus, naming the mode as ``_parse_vfo_block`` does."""
+    base = MODE_NAMES.get(mode, f"UNKNOWN(0x{mode:02X})")
+    if bits & USER:
+        name = f"{base}-USER"
+    else:
+        name = SUB_MODE_NAMES.get((mode, bool(bits & SUB_MODE)), base)
+    return VFOStatus(
+        frequency_hz=freq,
+        mode=mode,
+        mode_name=name,
+        clarifier_offset=clar,
+        rit=bool(bits & RIT),
+        xit=bool(bits & XIT),
+        user_mode=bool(bits & USER),
+    )
+
+
+# -- index -------------------------------------------------------------------
+
+def _scan_chunks(f: BinaryIO, size: int) -> tuple[list[ChunkInfo], int]:
+    """Walk chunk headers from the file header on.
+
+    Returns:
+        The complete chunks, and the offset where the last one ends.
+    """
+    chunks = []
+    offset = _HEADER.size
+    while offset + _CHUNK.size <= size:
+        f.seek(offset)
+        magic, rows, t_first, t_last, payload = _CHUNK.unpack(f.read(_CHUNK.size))
+        end = offset + _CHUNK.size + payload
+        if magic != _CHUNK_MAGIC or end > size:
+            break
+        chunks.append(ChunkInfo(offset, rows, t_first, t_last))
+        offset = end
+    return chunks, offset
+
+
+def _read_index(f: BinaryIO) -> tuple[list[ChunkInfo], int]:
+    """The chunk index and the offset where chunk data ends.
+
+    Raises:
+        ArchiveError: The file does not start with an archive header.
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ArchiveError("Not an archive: file too short")
+    magic, version, _ = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ArchiveError(f"Not an archive: bad magic {magic!r}")
+    if version != VERSION:
+        raise ArchiveError(f"Unsupported archive version {version}")
+
+    if size >= _HEADER.size + _TRAILER.size:
+        f.seek(size - _TRAILER.size)
+        index_offset, count, tail = _TRAILER.unpack(f.read(_TRAILER.size))
+        if tail == _INDEX_MAGIC and index_offset + count * _ENTRY.size + _TRAILER.size == size:
+            f.seek(index_offset)
+            raw = f.read(count * _ENTRY.size)
+            chunks = [ChunkInfo(*entry) for entry in _ENTRY.iter_unpack(raw)]
+            return chunks, index_offset
+    return _scan_chunks(f, size)
+
+
+# -- writer ------------------------------------------------------------------
+
+class ArchiveWriter:
+    """Append samples to an archive file.
+
+    Rows are buffered and written as a chunk every ``chunk_rows`` samples
+    (and on ``flush()``/``close()``).  An existing archive is appended
+    to; timestamps must not go backwards, across sessions too.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        Raises:
+            ArchiveError: ``path`` exists but is not an archive.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._columns: dict[str, list[int]] = {name: [] for name, _ in COLUMNS}
+        self._last_us: Optional[int] = None
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._f: BinaryIO = open(path, "r+b" if exists else "w+b")
+        if exists:
+            self._chunks, end = _read_index(self._f)
+            if self._chunks:
+                self._last_us = self._chunks[-1].t_last_us
+            self._f.seek(end)
+            self._f.truncate()          # drop the old index or a torn chunk
+        else:
+            self._chunks = []
+            self._f.write(_HEADER.pack(MAGIC, VERSION, 0))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def append(
+        self,
+        timestamp: float,
+        vfo_a: VFOStatus,
+        vfo_b: Optional[VFOStatus] = None,
+        flags: Optional[RadioFlags] = None,
+    ) -> None:
+        """Add one sample (``timestamp`` in ``time.time()`` seconds).
+
+        Raises:
+            ValueError: ``timestamp`` is earlier than the previous sample.
+        """
+        t_us = round(timestamp * 1_000_000)
+        if self._last_us is not None and t_us < self._last_us:
+            raise ValueError(
+                f"Timestamp {timestamp} is before the previous sample "
+                f"({self._last_us / 1_000_000})"
+            )
+        self._last_us = t_us
+        cols = self._columns
+        cols["time_us"].append(t_us)
+        cols["freq_a"].append(vfo_a.frequency_hz)
+        cols["clar_a"].append(vfo_a.clarifier_offset)
+        cols["mode_a"].append(vfo_a.mode)
+        cols["bits_a"].append(_vfo_bits(vfo_a))
+        if vfo_b is not None:
+            cols["freq_b"].append(vfo_b.frequency_hz)
+            cols["clar_b"].append(vfo_b.clarifier_offset)
+            cols["mode_b"].append(vfo_b.mode)
+            cols["bits_b"].append(_vfo_bits(vfo_b))
+        else:
+            # Repeat the previous row: free after delta and RLE.
+            for name in ("freq_b", "clar_b", "mode_b", "bits_b"):
+                cols[name].append(cols[name][-1] if cols[name] else 0)
+        cols["flags"].append(flags.raw if flags else cols["flags"][-1] if cols["flags"] else 0)
+        cols["present"].append((HAS_VFO_B if vfo_b else 0) | (HAS_FLAGS if flags else 0))
+        if len(cols["time_us"]) >= self.chunk_rows:
+            self._write_chunk()
+
+    def _write_chunk(self) -> None:
+        cols = self._columns
+        times = cols["time_us"]
+        if not times:
+            return
+        payload = bytearray()
+        for name, encoding in COLUMNS:
+            data = _encode_delta(cols[name]) if encoding == DELTA else _encode_rle(cols[name])
+            payload += _COLUMN.pack(len(data))
+            payload += data
+        offset = self._f.tell()
+        self._f.write(_CHUNK.pack(_CHUNK_MAGIC, len(times), times[0], times[-1], len(payload)))
+        self._f.write(payload)
+        self._chunks.append(ChunkInfo(offset, len(times), times[0], times[-1]))
+        for values in cols.values():
+            values.clear()
+
+    def flush(self) -> None:
+        """Write buffered rows as a (possibly short) chunk."""
+        self._write_chunk()
+        self._f.flush()
+
+    def close(self) -> None:
+        """Flush and write the index.  Safe to call twice."""
+        if self._f.closed:
+            return
+        try:
+            self._write_chunk()
+            index_offset = self._f.tell()
+            for c in self._chunks:
+                self._f.write(_ENTRY.pack(c.offset, c.rows, c.t_first_us, c.t_last_us))
+            self._f.write(_TRAILER.pack(index_offset, len(self._chunks), _INDEX_MAGIC))
+        finally:
+            self._f.close()
+
+
+# -- reader ------------------------------------------------------------------
+
+class ArchiveReader:
+    """Query an archive by time range."""
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            OSError: The file cannot be opened.
+            ArchiveError: It is not an archive.
+        """
+        self.path = path
+        self._f: BinaryIO = open(path, "rb")
+        try:
+            self.chunks, _ = _read_index(self._f)
+        except ArchiveError:
+            self._f.close()
+            raise
+        self._t_last = [c.t_last_us for c in self.chunks]
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __len__(self) -> int:
+        return sum(c.rows for c in self.chunks)
+
+    def _select(self, start: Optional[float], end: Optional[float]) -> Iterator[ChunkInfo]:
+        """Chunks overlapping [start, end], skipping earlier ones by bisection."""
+        first = 0 if start is None else bisect_left(self._t_last, round(start * 1_000_000))
+        end_us = None if end is None else round(end * 1_000_000)
+        for chunk in self.chunks[first:]:
+            if end_us is not None and chunk.t_first_us > end_us:
+                return
+            yield chunk
+
+    def _raw_columns(self, chunk: ChunkInfo) -> dict[str, bytes]:
+        self._f.seek(chunk.offset)
+        magic, rows, _, _, length = _CHUNK.unpack(self._f.read(_CHUNK.size))
+        payload = self._f.read(length)
+        if magic != _CHUNK_MAGIC or len(payload) != length:
+            raise ArchiveError(f"Corrupt chunk at offset {chunk.offset}")
+        columns = {}
+        pos = 0
+        for name, _ in COLUMNS:
+            (n,) = _COLUMN.unpack_from(payload, pos)
+            pos += _COLUMN.size
+            columns[name] = payload[pos:pos + n]
+            pos += n
+        return columns
+
+    def rows(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[ArchiveRow]:
+        """Yield the samples with ``start <= timestamp <= end``, in order.
+
+        Raises:
+            ArchiveError: A chunk is corrupt.
+        """
+        start_us = None if start is None else round(start * 1_000_000)
+        end_us = None if end is None else round(end * 1_000_000)
+        for chunk in self._select(start, end):
+            raw = self._raw_columns(chunk)
+            cols = {
+                name: _decode_delta(raw[name]) if encoding == DELTA else _decode_rle(raw[name])
+                for name, encoding in COLUMNS
+            }
+            for i, t_us in enumerate(cols["time_us"]):
+                if start_us is not None and t_us < start_us:
+                    continue
+                if end_us is not None and t_us > end_us:
+                    return
+                present = cols["present"][i]
+                yield ArchiveRow(
+                    timestamp=t_us / 1_000_000,
+                    vfo_a=_vfo_from(
+                        cols["freq_a"][i], cols["clar_a"][i], cols["mode_a"][i], cols["bits_a"][i],
+                    ),
+                    vfo_b=_vfo_from(
+                        cols["freq_b"][i], cols["clar_b"][i], cols["mode_b"][i], cols["bits_b"][i],
+                    ) if present & HAS_VFO_B else None,
+                    flags=RadioFlags.from_raw(cols["flags"][i]) if present & HAS_FLAGS else None,
+                )
+
+    def iter_arrays(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[dict[str, "np.ndarray"]]:
+        """Yield one dict of NumPy arrays per chunk in the time range.
+
+        Keys are the ``COLUMNS`` names plus ``"time"`` (float64 seconds);
+        every array in a dict has the same length.  Rows outside
+        [start, end] are trimmed from the edge chunks.  ``bits_*`` use the
+        ``RIT``/``XIT``/``USER``/``SUB_MODE`` masks and ``present`` the
+        ``HAS_VFO_B``/``HAS_FLAGS`` masks of this module.
+
+        Raises:
+            ImportError: NumPy is not installed.
+            ArchiveError: A chunk is corrupt.
+        """
+        import numpy as np  # optional dependency
+
+        start_us = None if start is None else round(start * 1_000_000)
+        end_us = None if end is None else round(end * 1_000_000)
+        for chunk in self._select(start, end):
+            raw = self._raw_columns(chunk)
+            arrays = {
+                name: _np_delta(raw[name]) if encoding == DELTA else _np_rle(raw[name])
+                for name, encoding in COLUMNS
+            }
+            t = arrays["time_us"]
+            lo = 0 if start_us is None else int(np.searchsorted(t, start_us, "left"))
+            hi = len(t) if end_us is None else int(np.searchsorted(t, end_us, "right"))
+            if lo >= hi:
+                continue
+            if lo or hi < len(t):
+                arrays = {name: a[lo:hi] for name, a in arrays.items()}
+            arrays["time"] = arrays["time_us"] / 1_000_000
+            yield arrays
+
+
+# -- vectorized decode -------------------------------------------------------
+
+def _np_varints(data: bytes) -> "np.ndarray":
+    """Decode a run of LEB128 varints without a Python-level loop."""
+    import numpy as np
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if buf.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    ends = np.flatnonzero(buf < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    position = np.arange(buf.size) - np.repeat(starts, ends - starts + 1)
+    parts = (buf & 0x7F).astype(np.uint64) << (7 * position).astype(np.uint64)
+    return np.add.reduceat(parts, starts)
+
+
+def _np_delta(data: bytes) -> "np.ndarray":
+    import numpy as np
+
+    u = _np_varints(data)
+    deltas = (u >> np.uint64(1)).astype(np.int64) ^ -(u & np.uint64(1)).astype(np.int64)
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+def _np_rle(data: bytes) -> "np.ndarray":
+    import numpy as np
+
+    pairs = _np_varints(data).reshape(-1, 2)
+    return np.repeat(pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64))
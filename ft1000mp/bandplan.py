@@ -0,0 +1,142 @@
+"""Band plans: classify a frequency into band and segment in O(log n).
+
+A ``BandPlan`` keeps its segments sorted by start frequency, so a lookup
+is one ``bisect`` over a list of ints — cheap enough to run on every
+status sample.  Segments are closed intervals; where two touch, the
+shared edge belongs to the upper one (14.070 MHz is digital, not CW).
+
+The built-in ``REGION_2`` plan covers the HF amateur bands the
+FT-1000MP tunes; other regions or club plans load from JSON::
+
+    {
+      "name": "IARU Region 1",
+      "segments": [
+        {"band": "20m", "start_hz": 14000000, "stop_hz": 14070000,
+         "kind": "CW", "mode": "CW"},
+        ...
+      ]
+    }
+"""
+
+import json
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+from .protocol import MODE_BY_NAME
+
+CW, DIGITAL, PHONE = "CW", "DIGITAL", "PHONE"
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One contiguous part of a band, with the mode to use there."""
+    band: str
+    start_hz: int
+    stop_hz: int
+    kind: str           # CW / DIGITAL / PHONE (or anything a plan file uses)
+    mode: str           # mode name for set_mode(), e.g. "CW", "USB"
+
+
+class BandPlan:
+    """Sorted, non-overlapping segments with bisect lookup."""
+
+    def __init__(self, segments: Iterable[Segment], name: str = ""):
+        """
+        Raises:
+            ValueError: A segment is empty, overlaps another, or names a
+                mode the radio does not have.
+        """
+        self.name = name
+        self.segments: tuple[Segment, ...] = tuple(sorted(segments, key=lambda s: s.start_hz))
+        for seg in self.segments:
+            if seg.stop_hz <= seg.start_hz:
+                raise ValueError(f"Empty segment {seg}")
+            if seg.mode.upper() not in MODE_BY_NAME:
+                raise ValueError(f"Unknown mode {seg.mode!r} in segment {seg}")
+        for lower, upper in zip(self.segments, self.segments[1:]):
+            if upper.start_hz < lower.stop_hz:
+                raise ValueError(f"Overlapping segments {lower} and {upper}")
+        self._starts = [seg.start_hz for seg in self.segments]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def classify(self, freq_hz: int) -> Optional[Segment]:
+        """The segment containing ``freq_hz``, or None outside the plan."""
+        i = bisect_right(self._starts, freq_hz) - 1
+        if i >= 0 and freq_hz <= self.segments[i].stop_hz:
+            return self.segments[i]
+        return None
+
+    def band(self, freq_hz: int) -> Optional[str]:
+        seg = self.classify(freq_hz)
+        return seg.band if seg is not None else None
+
+    def mode_for(self, freq_hz: int) -> Optional[str]:
+        seg = self.classify(freq_hz)
+        return seg.mode if seg is not None else None
+
+    # -- files -------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str) -> "BandPlan":
+        """Read a plan from a JSON file (format in the module docstring).
+
+        Raises:
+            OSError: The file cannot be read.
+            ValueError: The file is not a valid plan.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            segments = [
+                Segment(
+                    band=str(s["band"]),
+                    start_hz=int(s["start_hz"]),
+                    stop_hz=int(s["stop_hz"]),
+                    kind=str(s["kind"]).upper(),
+                    mode=str(s["mode"]).upper(),
+                )
+                for s in data["segments"]
+            ]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Bad band plan {path}: {exc}") from exc
+        return cls(segments, name=str(data.get("name", path)))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"name": self.name, "segments": [asdict(s) for s in self.segments]},
+                f, indent=2,
+            )
+
+
+def _band(
+    band: str, cw: tuple[int, int], digital: tuple[int, int], phone: Optional[tuple[int, int]],
+) -> list[Segment]:
+    """Segments of one band from kHz edges; phone is LSB below 10 MHz."""
+    segments = [
+        Segment(band, cw[0] * 1000, cw[1] * 1000, CW, "CW"),
+        Segment(band, digital[0] * 1000, digital[1] * 1000, DIGITAL, "USB"),
+    ]
+    if phone is not None:
+        sideband = "LSB" if phone[0] < 10_000 else "USB"
+        segments.append(Segment(band, phone[0] * 1000, phone[1] * 1000, PHONE, sideband))
+    return segments
+
+
+REGION_2 = BandPlan(
+    [
+        *_band("160m", (1800, 1840), (1840, 1850), (1850, 2000)),
+        *_band("80m", (3500, 3570), (3570, 3600), (3600, 4000)),
+        *_band("40m", (7000, 7040), (7040, 7125), (7125, 7300)),
+        *_band("30m", (10100, 10130), (10130, 10150), None),
+        *_band("20m", (14000, 14070), (14070, 14150), (14150, 14350)),
+        *_band("17m", (18068, 18100), (18100, 18110), (18110, 18168)),
+        *_band("15m", (21000, 21070), (21070, 21200), (21200, 21450)),
+        *_band("12m", (24890, 24915), (24915, 24930), (24930, 24990)),
+        *_band("10m", (28000, 28070), (28070, 28300), (28300, 29700)),
+    ],
+    name="IARU Region 2 (HF)",
+)
@@ -38,11 +38,12 @@ def freq_to_bytes(freq_hz: int) -> bytes:
 
 # -- GET direction: binary *10/16 scaling -----------------------------------
 
-def bytes_to_freq(data: bytes) -> int:
+def bytes_to_freq(data: "bytes | memoryview") -> int:
     """Decode 4 bytes from a status response into a frequency in Hz.
 
     Args:
-        data: 4 bytes, big-endian binary.
+        data: 4 bytes, big-endian binary (a slice of a larger
+            response's memoryview is decoded without copying it).
 
     Returns:
         Frequency in Hertz.
@@ -0,0 +1,70 @@
+"""Small on-disk JSON cache for data that is slow to read from the radio.
+
+Files live in ``$FT1000MP_CACHE_DIR`` if set, otherwise in the platform
+cache directory (``%LOCALAPPDATA%\\ft1000mp`` on Windows,
+``$XDG_CACHE_HOME/ft1000mp`` or ``~/.cache/ft1000mp`` elsewhere).
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir() -> Path:
+    """Return the cache directory (not created until something is saved)."""
+    override = os.environ.get("FT1000MP_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "ft1000mp"
+
+
+def cache_key(*parts: str) -> str:
+    """Build a filesystem-safe cache name, e.g. ('memories', 'COM3')."""
+    return "-".join(re.sub(r"[^A-Za-z0-9_.]+", "_", p).strip("_") for p in parts)
+
+
+def load(name: str) -> Optional[dict[str, Any]]:
+    """Load a cached JSON object, or None if missing or unreadable."""
+    path = cache_dir() / f"{name}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save(name: str, data: dict[str, Any]) -> None:
+    """Atomically write a JSON object to the cache.
+
+    Failures (read-only home, full disk) are ignored — the cache is an
+    optimisation, never a requirement.
+    """
+    directory = cache_dir()
+    path = directory / f"{name}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def remove(name: str) -> None:
+    """Delete a cache entry if it exists."""
+    try:
+        (cache_dir() / f"{name}.json").unlink()
+    except OSError:
+        pass
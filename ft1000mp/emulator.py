@@ -0,0 +1,217 @@
+"""In-memory FT-1000MP emulator for tests and offline development.
+
+``Emulator`` implements the subset of the pyserial ``Serial`` interface
+that ``SerialPort`` uses (``write``, ``read``, ``reset_input_buffer``,
+``timeout``, ``rts``/``dtr``...), decodes every 5-byte CAT frame written
+to it, updates a simple radio model, and queues the response bytes the
+real radio would send.  Reads never block: if fewer bytes are queued than
+requested, the short result behaves like a serial read timeout.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+from .bcd import bcd_bytes_to_freq
+from .protocol import (
+    ALL_DATA_HEADER_LENGTH,
+    MEMORY_CHANNELS,
+    SET_MODE_VALUES,
+    STATUS_BLOCK_LENGTH,
+    Mode,
+    Opcode,
+    StatusFlag,
+    StatusTarget,
+)
+
+# SET_MODE byte (without the VFO-B bit) → status-response mode value
+_MODE_BY_SET_VALUE = {v: k for k, v in SET_MODE_VALUES.items()}
+
+
+@dataclass
+class EmulatedVFO:
+    """State of one emulated VFO or memory channel."""
+    frequency_hz: int = 14_195_000
+    mode: int = Mode.USB
+    clarifier_offset: int = 0
+    rit: bool = False
+    xit: bool = False
+
+
+def encode_vfo_block(vfo: EmulatedVFO, flags: int = 0) -> bytes:
+    """Encode a 16-byte status block (inverse of ``_parse_vfo_block``)."""
+    block = bytearray(STATUS_BLOCK_LENGTH)
+    block[0] = flags
+    block[1:5] = (vfo.frequency_hz * 16 // 10).to_bytes(4, "big")
+    # Clarifier: 16-bit two's complement, *16/10 scaling
+    clar_raw = (vfo.clarifier_offset * 16 // 10) & 0xFFFF
+    block[5] = clar_raw >> 8
+    block[6] = clar_raw & 0xFF
+    block[7] = vfo.mode & 0x07
+    block[9] = (0x02 if vfo.rit else 0) | (0x01 if vfo.xit else 0)
+    return bytes(block)
+
+
+def _bcd_freq(frame: bytes) -> int:
+    """Decode the little-endian BCD frequency in a SET_FREQ frame."""
+    return bcd_bytes_to_freq(bytes(reversed(frame[:4])))
+
+
+def _decode_clarifier_offset(frame: bytes) -> int:
+    tens = (frame[0] >> 4) * 10 + (frame[0] & 0x0F)
+    khz = (frame[1] >> 4) * 10 + (frame[1] & 0x0F)
+    offset = khz * 1000 + tens * 10
+    return -offset if frame[2] == 0xFF else offset
+
+
+class Emulator:
+    """Pyserial-compatible stand-in for an FT-1000MP on a serial port.
+
+    Constructor keyword arguments mirror ``serial.Serial`` and are
+    accepted (and mostly ignored) so the emulator can replace it directly.
+    """
+
+    def __init__(self, port: Optional[str] = None, **serial_kwargs: Any):
+        self.port = port
+        self.timeout: Optional[float] = serial_kwargs.get("timeout")
+        self.rts = True
+        self.dtr = True
+        self.is_open = True
+
+        self.vfo_a = EmulatedVFO(14_195_000, Mode.USB)
+        self.vfo_b = EmulatedVFO(7_074_000, Mode.LSB)
+        self.memories: dict[int, EmulatedVFO] = {}
+        self.memory_channel = 1
+        self.vfo_b_selected = False
+        self.split = False
+        self.clarifier = False
+        self.ptt = False
+        # Meter readings (0-255) for the main and sub receivers
+        self.meter = 0
+        self.sub_meter = 0
+
+        # Every complete frame received, oldest first
+        self.frames: list[bytes] = []
+        self._rx = bytearray()
+        self._tx = bytearray()
+
+    # -- pyserial interface ------------------------------------------------
+
+    def write(self, data: bytes) -> int:
+        self._rx += data
+        while len(self._rx) >= 5:
+            frame = bytes(self._rx[:5])
+            del self._rx[:5]
+            self.frames.append(frame)
+            self._handle(frame)
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        data = bytes(self._tx[:size])
+        del self._tx[:size]
+        return data
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._tx)
+
+    def reset_input_buffer(self) -> None:
+        self._tx.clear()
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_open = False
+
+    # -- radio model -------------------------------------------------------
+
+    @property
+    def active_vfo(self) -> EmulatedVFO:
+        return self.vfo_b if self.vfo_b_selected else self.vfo_a
+
+    @property
+    def flags(self) -> int:
+        flags = 0
+        if self.split:
+            flags |= StatusFlag.SPLIT
+        if self.clarifier:
+            flags |= StatusFlag.CLARIFIER
+        if self.vfo_b_selected:
+            flags |= StatusFlag.VFO_B
+        if self.ptt:
+            flags |= StatusFlag.TRANSMITTING
+        return flags
+
+    def all_data(self) -> bytes:
+        """Build the 1636-byte all-data (STATUS_UPDATE 0x00) response."""
+        out = bytearray(ALL_DATA_HEADER_LENGTH)
+        out[0] = self.flags
+        out[1] = self.memory_channel
+        out += encode_vfo_block(self.vfo_a)
+        out += encode_vfo_block(self.vfo_b)
+        empty = EmulatedVFO(0, Mode.LSB)
+        for ch in range(1, MEMORY_CHANNELS + 1):
+            out += encode_vfo_block(self.memories.get(ch, empty))
+        # QMB block pads the dump to its documented length
+        out += bytes(STATUS_BLOCK_LENGTH)
+        return bytes(out)
+
+    def _handle(self, frame: bytes) -> None:
+        op = frame[4]
+        p4 = frame[3]
+        if op == Opcode.SET_FREQ_A:
+            self.vfo_a.frequency_hz = _bcd_freq(frame)
+        elif op == Opcode.SET_FREQ_B:
+            self.vfo_b.frequency_hz = _bcd_freq(frame)
+        elif op == Opcode.SET_MODE:
+            target = self.vfo_b if p4 & 0x80 else self.vfo_a
+            mode = _MODE_BY_SET_VALUE.get(p4 & 0x7F)
+            if mode is not None:
+                target.mode = mode
+        elif op == Opcode.SELECT_VFO:
+            self.vfo_b_selected = p4 == 0x01
+        elif op == Opcode.SPLIT:
+            self.split = p4 == 0x01
+        elif op == Opcode.CLARIFIER:
+            if p4 == 0xFF:
+                self.active_vfo.clarifier_offset = _decode_clarifier_offset(frame)
+            else:
+                self.clarifier = p4 == 0x01
+                self.active_vfo.rit = self.clarifier
+        elif op == Opcode.PTT:
+            self.ptt = p4 == 0x01
+        elif op == Opcode.COPY_VFO_A_TO_B:
+            self.vfo_b = replace(self.vfo_a)
+        elif op == Opcode.RECALL_MEMORY:
+            self.memory_channel = p4
+        elif op == Opcode.VFO_TO_MEMORY:
+            self.memories[p4] = replace(self.active_vfo)
+        elif op == Opcode.MEMORY_TO_VFO:
+            if p4 in self.memories:
+                vfo = replace(self.memories[p4])
+                if self.vfo_b_selected:
+                    self.vfo_b = vfo
+                else:
+                    self.vfo_a = vfo
+        elif op == Opcode.READ_FLAGS:
+            self._tx += bytes([self.flags, 0, 0, 0, 0])
+        elif op == Opcode.READ_METER:
+            value = self.sub_meter if p4 == 0x01 else self.meter
+            self._tx += bytes([value, value, value, value, Opcode.READ_METER])
+        elif op == Opcode.STATUS_UPDATE:
+            self._tx += self._status(p4)
+
+    def _status(self, target: int) -> bytes:
+        if target == StatusTarget.ALL_DATA:
+            return self.all_data()
+        if target == StatusTarget.MEMORY_CHANNEL:
+            return bytes([self.memory_channel])
+        if target == StatusTarget.OPERATING_DATA:
+            return encode_vfo_block(self.active_vfo, self.flags)
+        if target == StatusTarget.VFO_DATA:
+            inactive = self.vfo_a if self.vfo_b_selected else self.vfo_b
+            return encode_vfo_block(self.active_vfo) + encode_vfo_block(inactive)
+        return b""
@@ -9,13 +9,50 @@ class SerialConnectionError(FT1000MPError):
     """Failed to open or communicate over the serial port."""
 
 
+class PortBusyError(SerialConnectionError):
+    """Another process holds the port lock (see ``portlock``).
+
+    ``holder`` is its ``LockHolder`` (pid, program), or None if unknown.
+    """
+
+    def __init__(self, message: str, holder: object = None):
+        super().__init__(message)
+        self.holder = holder
+
+
 class CommandTimeoutError(FT1000MPError):
     """Radio did not respond within the expected time."""
 
 
+class DeadlineExceeded(FT1000MPError):
+    """A caller-supplied deadline passed before the command completed.
+
+    Deliberately not a ``CommandTimeoutError``: the radio may be fine,
+    the caller simply ran out of time.
+    """
+
+
 class InvalidFrequencyError(FT1000MPError):
     """Frequency is outside the valid range (100 kHz - 30 MHz)."""
 
 
 class InvalidModeError(FT1000MPError):
     """Unrecognized operating mode."""
+
+
+class PoolError(FT1000MPError):
+    """One or more radios in a RadioPool failed an operation."""
+
+    def __init__(self, errors: dict, results: dict):
+        self.errors = errors
+        self.results = results
+        detail = "; ".join(f"{name}: {exc}" for name, exc in errors.items())
+        super().__init__(f"{len(errors)} radio(s) failed: {detail}")
+
+
+class InterlockError(FT1000MPError):
+    """PTT refused because another radio is already transmitting."""
+
+
+class ArchiveError(FT1000MPError):
+    """A status archive file is missing its header or is corrupt."""
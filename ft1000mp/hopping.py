@@ -0,0 +1,197 @@
+"""Frequency hop tables, compiled once and played at a fixed cadence.
+
+``HopTable.compile()`` validates a list of ``Hop`` (frequency, mode,
+dwell) and encodes it with ``cmd_set_freq_a``/``cmd_set_mode`` into one
+contiguous buffer of 5-byte frames, with each hop's frames kept as
+ready-made slices of it.  ``HopExecutor`` then plays the table: hop
+``k`` of a cycle is due at the cycle start plus the dwells before it,
+and is written through ``FT1000MP.at()``'s scheduler so it lands on the
+radio at that instant.  Nothing is validated or encoded while playing.
+
+Each hop's landing error is accumulated per table entry (``HopStats``);
+a hop whose slot passed while the port was busy is counted as missed
+and skipped rather than played late.
+
+The five NCDXF/IARU beacon frequencies are in ``NCDXF_FREQUENCIES_HZ``;
+each beacon sends for 10 s per band, moving up a band every 10 s, so
+``ncdxf_table()`` started on a 3-minute boundary with ``cycle=180``
+follows one beacon (4U1UN, the first in the sequence) around the bands.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .exceptions import DeadlineExceeded
+from .protocol import MODE_BY_NAME, cmd_set_freq_a, cmd_set_mode
+from .serial_port import LOCK_AHEAD
+
+if TYPE_CHECKING:
+    from .schedule import Landing
+    from .transceiver import FT1000MP
+
+NCDXF_FREQUENCIES_HZ = (14_100_000, 18_110_000, 21_150_000, 24_930_000, 28_200_000)
+NCDXF_SLOT_S = 10.0
+NCDXF_CYCLE_S = 180.0
+FRAME_LEN = 5
+MAX_LATE = 0.2               # a hop later than this is skipped
+
+
+@dataclass(frozen=True)
+class Hop:
+    """One step: tune VFO-A (and optionally set its mode), then stay ``dwell`` s."""
+    freq_hz: int
+    mode: Optional[str] = None
+    dwell: float = NCDXF_SLOT_S
+
+
+@dataclass
+class HopStats:
+    """Landing errors for one table entry, in seconds."""
+    freq_hz: int
+    played: int = 0
+    missed: int = 0
+    mean_error: float = 0.0
+    worst_error: float = 0.0     # largest by magnitude, with its sign
+
+
+class HopTable:
+    """A compiled hop list; build with ``compile()``."""
+
+    def __init__(self, hops: tuple[Hop, ...], buffer: bytes, spans: tuple[tuple[int, int], ...]):
+        self.hops = hops
+        self.buffer = buffer          # every frame of every hop, back to back
+        self.spans = spans            # (first byte, end) of each hop in ``buffer``
+        view = memoryview(buffer)
+        self.frames = tuple(
+            tuple(bytes(view[i:i + FRAME_LEN]) for i in range(start, end, FRAME_LEN))
+            for start, end in spans
+        )
+        self.offsets = tuple(sum(h.dwell for h in hops[:k]) for k in range(len(hops)))
+        self.period = sum(h.dwell for h in hops)
+
+    @classmethod
+    def compile(cls, hops: Iterable[Hop]) -> "HopTable":
+        """Validate and encode ``hops``.
+
+        Raises:
+            InvalidFrequencyError, InvalidModeError: A hop is out of range.
+            ValueError: No hops, or a dwell is not positive.
+        """
+        from .transceiver import FT1000MP
+
+        hops = tuple(hops)
+        if not hops:
+            raise ValueError("A hop table needs at least one hop")
+        buffer = bytearray()
+        spans = []
+        for hop in hops:
+            FT1000MP._validate_freq(hop.freq_hz)
+            if hop.dwell <= 0:
+                raise ValueError(f"Dwell must be positive, got {hop.dwell}")
+            start = len(buffer)
+            buffer += cmd_set_freq_a(hop.freq_hz)
+            if hop.mode is not None:
+                FT1000MP._validate_mode(hop.mode)
+                buffer += cmd_set_mode(MODE_BY_NAME[hop.mode.upper()], vfo_b=False)
+            spans.append((start, len(buffer)))
+        return cls(hops, bytes(buffer), tuple(spans))
+
+    def __len__(self) -> int:
+        return len(self.hops)
+
+
+def ncdxf_table(mode: Optional[str] = "CW", dwell: float = NCDXF_SLOT_S) -> HopTable:
+    """The five NCDXF beacon frequencies, lowest first."""
+    return HopTable.compile(Hop(freq, mode, dwell) for freq in NCDXF_FREQUENCIES_HZ)
+
+
+class HopExecutor:
+    """Play a ``HopTable`` on a radio; see the module docstring.
+
+    Example::
+
+        executor = HopExecutor(radio, ncdxf_table())
+        executor.run(cycles=10, start=next_period(NCDXF_CYCLE_S), cycle=NCDXF_CYCLE_S)
+        for entry in executor.stats():
+            print(entry.freq_hz, f"{entry.mean_error * 1000:+.2f} ms", entry.missed)
+    """
+
+    def __init__(self, radio: "FT1000MP", table: HopTable, max_late: float = MAX_LATE):
+        self.radio = radio
+        self.table = table
+        self.max_late = max_late
+        self.hops_played = 0
+        n = len(table)
+        self._played = [0] * n
+        self._missed = [0] * n
+        self._error_sum = [0.0] * n
+        self._worst = [0.0] * n
+        self._stop = threading.Event()
+        self.last: "Optional[Landing]" = None
+
+    def stop(self) -> None:
+        """Make ``run()`` return before its next hop (callable from any thread)."""
+        self._stop.set()
+
+    def run(
+        self,
+        cycles: Optional[int] = 1,
+        start: Optional[float] = None,
+        cycle: Optional[float] = None,
+    ) -> None:
+        """Play the table ``cycles`` times (None = until ``stop()``).
+
+        Args:
+            start: Wall-clock time (``time.time()``) the first hop lands;
+                by default one second from now.
+            cycle: Seconds from one cycle's start to the next (default:
+                the table's total dwell).
+
+        Raises:
+            ValueError: ``cycle`` is shorter than the table's total dwell,
+                so cycles would overlap.
+        """
+        table, radio, scheduler = self.table, self.radio, self.radio.scheduler
+        cycle = table.period if cycle is None else cycle
+        if cycle < table.period:
+            raise ValueError(f"Cycle must be at least the table's {table.period} s, got {cycle}")
+        t0 = time.time() + 1.0 if start is None else start
+        self._stop.clear()
+        n = 0
+        while cycles is None or n < cycles:
+            base = t0 + n * cycle
+            for k, frames in enumerate(table.frames):
+                when = base + table.offsets[k]
+                if self._stop.wait(max(0.0, when - time.time() - LOCK_AHEAD - scheduler.lead(frames))):
+                    return
+                try:
+                    landing = scheduler.at(when, frames, self.max_late)
+                except DeadlineExceeded:
+                    self._missed[k] += 1
+                    continue
+                self._record(k, landing)
+            n += 1
+
+    def _record(self, k: int, landing: "Landing") -> None:
+        self.last = landing
+        self.hops_played += 1
+        self._played[k] += 1
+        self._error_sum[k] += landing.error
+        if abs(landing.error) > abs(self._worst[k]):
+            self._worst[k] = landing.error
+        self.radio._note_tuned("A", self.table.hops[k].freq_hz)
+
+    def stats(self) -> list[HopStats]:
+        """Per-entry landing statistics so far."""
+        return [
+            HopStats(
+                freq_hz=hop.freq_hz,
+                played=self._played[k],
+                missed=self._missed[k],
+                mean_error=self._error_sum[k] / self._played[k] if self._played[k] else 0.0,
+                worst_error=self._worst[k],
+            )
+            for k, hop in enumerate(self.table.hops)
+        ]
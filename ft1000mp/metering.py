@@ -0,0 +1,200 @@
+"""Continuous meter sampling into a preallocated NumPy ring buffer.
+
+``MeterSampler`` reads the meter (``READ_METER``, 5 bytes each way) back
+to back on a background thread, so the rate is whatever the link and
+the port's pacing allow: at 4800 baud the 10 bytes alone take 23 ms, so
+a calibrated port (``calibrate_timing()``) tops out near 40 reads/s.
+
+Every ``decimation`` reads are reduced to one stored sample: the time
+of the last read and the min, max and mean of the group.  Samples go
+into fixed arrays of ``capacity`` entries, overwriting the oldest, so a
+long run never allocates; ``arrays()`` returns copies, oldest first.
+
+A failed read is counted in ``errors`` and the thread waits
+``ERROR_BACKOFF`` before trying again; if the port is closed or lost
+(``SerialConnectionError``) it stops, leaving the error in ``error``.
+
+NumPy is an optional dependency (``pip install ft1000mp[meter]``).
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from .exceptions import FT1000MPError, SerialConnectionError
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .transceiver import FT1000MP
+
+DEFAULT_CAPACITY = 65536
+ERROR_BACKOFF = 0.1           # seconds between reads after a failed one
+
+
+class MeterSampler:
+    """Background meter reader; see the module docstring.
+
+    Example::
+
+        with radio.meter_sampler(decimation=4) as sampler:
+            time.sleep(10)
+        data = sampler.arrays()
+        print(data["max"].max(), sampler.rate)
+    """
+
+    def __init__(
+        self,
+        radio: "FT1000MP",
+        capacity: int = DEFAULT_CAPACITY,
+        decimation: int = 1,
+        sub: bool = False,
+    ):
+        """
+        Args:
+            radio: An open FT1000MP.
+            capacity: Samples kept (after decimation).
+            decimation: Reads reduced to each stored sample.
+            sub: Read the sub receiver's S-meter.
+
+        Raises:
+            ValueError: ``capacity`` or ``decimation`` is less than 1.
+        """
+        import numpy as np  # optional dependency
+
+        if capacity < 1 or decimation < 1:
+            raise ValueError(
+                f"capacity and decimation must be at least 1, got {capacity}, {decimation}"
+            )
+        self.radio = radio
+        self.capacity = capacity
+        self.decimation = decimation
+        self.sub = sub
+        self._time = np.zeros(capacity, np.float64)
+        self._min = np.zeros(capacity, np.uint8)
+        self._max = np.zeros(capacity, np.uint8)
+        self._mean = np.zeros(capacity, np.float32)
+        self.samples = 0            # stored so far, including overwritten ones
+        self.reads = 0
+        self.errors = 0
+        self.error: Optional[Exception] = None    # why the thread stopped
+        self._group = 0
+        self._group_min = 255
+        self._group_max = 0
+        self._group_sum = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def __enter__(self) -> "MeterSampler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        return min(self.samples, self.capacity)
+
+    # -- sampling ------------------------------------------------------------
+
+    def add(self, value: int, timestamp: float) -> None:
+        """Feed one reading (the thread does this after every read)."""
+        with self._lock:
+            self.reads += 1
+            self._group += 1
+            self._group_sum += value
+            if value < self._group_min:
+                self._group_min = value
+            if value > self._group_max:
+                self._group_max = value
+            if self._group < self.decimation:
+                return
+            i = self.samples % self.capacity
+            self._time[i] = timestamp
+            self._min[i] = self._group_min
+            self._max[i] = self._group_max
+            self._mean[i] = self._group_sum / self._group
+            self.samples += 1
+            self._group = self._group_sum = self._group_max = 0
+            self._group_min = 255
+
+    def sample(self) -> int:
+        """Read the meter once and feed the reading."""
+        value = self.radio.read_meter(self.sub)
+        self.add(value, time.time())
+        return value
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.error = None
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="ft1000mp-meter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._elapsed += time.monotonic() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except SerialConnectionError as exc:
+                self._failed(exc)
+                return
+            except FT1000MPError:
+                self._failed()
+                self._stop.wait(ERROR_BACKOFF)
+            except Exception as exc:    # a bug or an unwrapped I/O error
+                self._failed(exc)
+                return
+
+    def _failed(self, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self.errors += 1
+            if error is not None:
+                self.error = error
+
+    @property
+    def rate(self) -> float:
+        """Reads per second while running."""
+        elapsed = self._elapsed
+        if self._thread is not None:
+            elapsed += time.monotonic() - self._started
+        return self.reads / elapsed if elapsed else 0.0
+
+    # -- results -------------------------------------------------------------
+
+    def arrays(self, last: Optional[int] = None) -> "dict[str, np.ndarray[Any, Any]]":
+        """Copies of the stored samples, oldest first.
+
+        Returns:
+            ``"time"`` (``time.time()`` of each sample's last read),
+            ``"min"``, ``"max"`` and ``"mean"``, of equal length.
+        """
+        import numpy as np
+
+        with self._lock:
+            n = len(self) if last is None else min(last, len(self))
+            end = self.samples % self.capacity
+            index = np.arange(end - n, end) % self.capacity
+            return {
+                "time": self._time[index],
+                "min": self._min[index],
+                "max": self._max[index],
+                "mean": self._mean[index],
+            }
@@ -0,0 +1,208 @@
+"""Concurrent control of several FT-1000MPs (SO2R, multi-op).
+
+Each radio gets its own single-thread worker, so commands to one radio
+stay strictly ordered while different radios run in parallel.  Serial
+I/O and the pacing sleeps release the GIL, so a fan-out operation takes
+about as long as the slowest radio rather than the sum of all of them.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Mapping, Optional, TypeVar
+
+from .exceptions import InterlockError, PoolError
+from .transceiver import FT1000MP, RadioFlags, VFOStatus
+
+T = TypeVar("T")
+
+
+class RadioPool:
+    """A named set of FT1000MP instances driven in parallel.
+
+    Example::
+
+        with RadioPool.from_ports({"run": "/dev/ttyUSB0", "mult": "/dev/ttyUSB1"}) as pool:
+            pool.tune_all(14_025_000, "CW")
+            pool.key("run")
+    """
+
+    def __init__(self, radios: Mapping[str, FT1000MP]):
+        if not radios:
+            raise ValueError("RadioPool needs at least one radio")
+        self.radios = dict(radios)
+        self._workers = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ft1000mp-{name}")
+            for name in self.radios
+        }
+        self._ptt_lock = threading.Lock()
+        self.transmitting: Optional[str] = None
+
+    @classmethod
+    def from_ports(
+        cls,
+        ports: Mapping[str, str],
+        rts: "bool | None" = None,
+        dtr: "bool | None" = None,
+    ) -> "RadioPool":
+        """Build a pool from a name → serial port mapping."""
+        return cls({name: FT1000MP(port=port, rts=rts, dtr=dtr) for name, port in ports.items()})
+
+    # -- context manager ---------------------------------------------------
+
+    def __enter__(self) -> "RadioPool":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open every radio in parallel.
+
+        If any radio fails to open, the ones that did are closed and the
+        workers stopped before the ``PoolError`` propagates, so a failed
+        ``with RadioPool(...)`` leaks neither ports nor threads.
+        """
+        try:
+            self.run_all(lambda radio: radio.open())
+        except PoolError as exc:
+            try:
+                if exc.results:
+                    self.run_all(lambda radio: radio.close(), names=exc.results)
+            except PoolError:
+                pass    # report the open failure, not the cleanup one
+            finally:
+                for worker in self._workers.values():
+                    worker.shutdown(wait=True)
+            raise
+
+    def close(self) -> None:
+        """Close every radio and stop the workers.
+
+        Any radio still keyed through ``key()`` is unkeyed first.
+        """
+        try:
+            if self.transmitting is not None:
+                self.unkey_all()
+        finally:
+            try:
+                self.run_all(lambda radio: radio.close())
+            finally:
+                for worker in self._workers.values():
+                    worker.shutdown(wait=True)
+
+    # -- dispatch ----------------------------------------------------------
+
+    def submit(self, name: str, fn: Callable[[FT1000MP], T]) -> "Future[T]":
+        """Queue ``fn(radio)`` on the named radio's worker."""
+        return self._workers[name].submit(fn, self.radios[name])
+
+    def run_all(
+        self,
+        fn: Callable[[FT1000MP], T],
+        names: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, T]:
+        """Run ``fn(radio)`` on every radio (or ``names``) in parallel.
+
+        Waits for all of them, even if some fail.
+
+        Returns:
+            Results keyed by radio name.
+
+        Raises:
+            PoolError: One or more radios raised; ``errors`` holds the
+                exceptions and ``results`` what succeeded.
+        """
+        futures = {name: self.submit(name, fn) for name in (names or self.radios)}
+        results: dict[str, T] = {}
+        errors: dict[str, BaseException] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=timeout)
+            except Exception as exc:
+                errors[name] = exc
+        if errors:
+            raise PoolError(errors, results)
+        return results
+
+    # -- fan-out operations -----------------------------------------------
+
+    def tune_all(self, freq_hz: int, mode: Optional[str] = None) -> None:
+        """Set VFO-A (and optionally the mode) on every radio."""
+        FT1000MP._validate_freq(freq_hz)
+        if mode is not None:
+            FT1000MP._validate_mode(mode)
+
+        def tune(radio: FT1000MP) -> None:
+            with radio.batch():
+                radio.set_frequency_a(freq_hz)
+                if mode is not None:
+                    radio.set_mode(mode)
+
+        self.run_all(tune)
+
+    def snapshot_all(self) -> dict[str, tuple[VFOStatus, VFOStatus, RadioFlags]]:
+        """Read (active VFO, inactive VFO, flags) from every radio."""
+        def snapshot(radio: FT1000MP) -> tuple[VFOStatus, VFOStatus, RadioFlags]:
+            active, inactive = radio.get_both_vfo_status()
+            return active, inactive, radio.read_flags()
+
+        return self.run_all(snapshot)
+
+    # -- PTT interlock -----------------------------------------------------
+
+    def key(self, name: str, preempt: bool = False) -> None:
+        """Key the named radio, never letting two radios transmit at once.
+
+        PTT is sent from the calling thread on the urgent path rather than
+        queued behind the radio's worker, so keying never waits for a
+        fan-out operation already in flight.
+
+        Args:
+            name: Radio to key.
+            preempt: If another radio is keyed, unkey it first instead of
+                refusing.
+
+        Raises:
+            InterlockError: Another radio is transmitting and ``preempt``
+                is False.
+        """
+        with self._ptt_lock:
+            if self.transmitting == name:
+                return
+            if self.transmitting is not None:
+                if not preempt:
+                    raise InterlockError(
+                        f"Cannot key {name}: {self.transmitting} is transmitting"
+                    )
+                self.radios[self.transmitting].set_ptt(False)
+                self.transmitting = None
+            self.radios[name].set_ptt(True)
+            self.transmitting = name
+
+    def unkey_all(self) -> None:
+        """Unkey every radio, whatever the interlock thinks.
+
+        Like ``key()``, this bypasses the workers: each unkey goes out on
+        the urgent path, and every radio is tried even if some fail.
+        """
+        with self._ptt_lock:
+            results: dict[str, None] = {}
+            errors: dict[str, BaseException] = {}
+            try:
+                for name, radio in self.radios.items():
+                    try:
+                        radio.set_ptt(False)
+                        results[name] = None
+                    except Exception as exc:
+                        errors[name] = exc
+            finally:
+                self.transmitting = None
+            if errors:
+                raise PoolError(errors, results)
@@ -0,0 +1,277 @@
+"""Advisory cross-process lock on a serial device, with cooperative handoff.
+
+WSJT-X, fldigi and scripts built on this package all want the same COM
+port.  ``SerialPort.open()`` takes a ``PortLock`` — ``flock`` on a lock
+file named after the device's real path, so ``/dev/ttyUSB0`` and its
+``/dev/serial/by-id`` link share one lock — and releases it on
+``close()``.  The lock file holds who has the port (``LockHolder``), so
+a failed open can say which program to close, and ``lock_holder()``
+answers the question without opening anything.
+
+Handoff: a process that has to wait writes its own ``LockHolder`` to a
+``.want`` file next to the lock and blocks in ``flock``.  The holder, if
+it passed ``on_request``, notices the request within
+``REQUEST_POLL_INTERVAL`` and may close its port; the kernel then wakes
+the waiter straight away, so the port changes hands in milliseconds.
+
+Only programs using this package take the lock.  On Windows, where COM
+ports are exclusive anyway, locking is a no-op.  The lock directory is
+shared by every user (mode 1777, files 0666); if it cannot be used the
+port is opened unlocked, with a warning.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from .exceptions import PortBusyError
+
+try:
+    import fcntl
+except ImportError:         # Windows
+    fcntl = None  # type: ignore[assignment]
+
+REQUEST_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class LockHolder:
+    """A process holding, or asking for, a port."""
+    pid: int
+    program: str
+    port: str
+    since: float            # time.time()
+
+    @classmethod
+    def current(cls, port: str) -> "LockHolder":
+        program = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+        return cls(os.getpid(), program, port, time.time())
+
+    def __str__(self) -> str:
+        return f"{self.program} (pid {self.pid})"
+
+
+def lock_dir() -> str:
+    """``$FT1000MP_LOCK_DIR``, or a directory under the system temp dir."""
+    return os.environ.get("FT1000MP_LOCK_DIR") or os.path.join(
+        tempfile.gettempdir(), "ft1000mp-locks"
+    )
+
+
+def _lock_name(port: str) -> str:
+    from .cache import cache_key
+
+    return cache_key("port", os.path.realpath(port))
+
+
+def _make_dir(path: str) -> None:
+    try:
+        os.makedirs(path)
+    except FileExistsError:
+        return
+    os.chmod(path, 0o1777)      # every user's locks; sticky, so only owners delete
+
+
+def _open_shared(path: str, flags: int) -> int:
+    """Open a file in the lock directory, creating it writable by everyone."""
+    try:
+        # No O_CREAT here: fs.protected_regular refuses it on other users'
+        # files in a sticky directory, even when they are world-writable.
+        return os.open(path, flags)
+    except FileNotFoundError:
+        pass
+    try:
+        fd = os.open(path, flags | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return os.open(path, flags)
+    os.fchmod(fd, 0o666)        # not narrowed by the umask
+    return fd
+
+
+def _read_holder(path: str) -> Optional[LockHolder]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return LockHolder(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True             # another user's process
+    return True
+
+
+class PortLock:
+    """The lock for one device; see the module docstring."""
+
+    def __init__(self, port: str):
+        self.port = port
+        base = os.path.join(lock_dir(), _lock_name(port))
+        self.path = base + ".lock"
+        self.want_path = base + ".want"
+        self._fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def _open(self) -> int:
+        _make_dir(os.path.dirname(self.path))
+        return _open_shared(self.path, os.O_RDWR)
+
+    def acquire(
+        self,
+        timeout: Optional[float] = 0.0,
+        on_request: Optional[Callable[[LockHolder], None]] = None,
+    ) -> None:
+        """Take the lock.
+
+        Args:
+            timeout: Seconds to wait for the holder to let go (0 = fail at
+                once, None = wait forever).  While waiting, a handoff is
+                requested.
+            on_request: Called from a watcher thread with the requester's
+                ``LockHolder`` when another process asks for the port.
+
+        Raises:
+            PortBusyError: Another process still holds the lock.
+        """
+        if fcntl is None or self._fd is not None:
+            return
+        try:
+            fd = self._open()
+        except OSError as exc:
+            warnings.warn(f"Cannot lock {self.port} ({exc}); opening it unlocked", stacklevel=2)
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if timeout == 0:
+                os.close(fd)
+            if timeout == 0 or not self._wait(fd, timeout):
+                holder = self.holder()
+                raise PortBusyError(
+                    f"{self.port} is in use by {holder or 'another process'}", holder,
+                ) from None
+        self._fd = fd
+        me = LockHolder.current(self.port)
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, json.dumps(asdict(me)).encode(), 0)
+        if on_request is not None:
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(on_request, self._request_stamp()),
+                name="ft1000mp-portlock", daemon=True,
+            )
+            self._watcher.start()
+
+    def _wait(self, fd: int, timeout: Optional[float]) -> bool:
+        """Ask for a handoff and block in flock.
+
+        On timeout returns False; the blocked thread closes ``fd`` if it
+        ever gets the lock, so an abandoned wait never keeps the port.
+        """
+        assert fcntl is not None
+        got = threading.Event()
+        guard = threading.Lock()
+        abandoned = False
+
+        def block() -> None:
+            assert fcntl is not None
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with guard:
+                if abandoned:
+                    os.close(fd)        # too late; let the next waiter have it
+                else:
+                    got.set()
+
+        me = LockHolder.current(self.port)
+        try:
+            want = _open_shared(self.want_path, os.O_WRONLY | os.O_TRUNC)
+            try:
+                os.write(want, json.dumps(asdict(me)).encode())
+            finally:
+                os.close(want)
+        except OSError:
+            pass                        # no handoff request; still wait for the lock
+        threading.Thread(target=block, name="ft1000mp-portlock-wait", daemon=True).start()
+        try:
+            if got.wait(timeout):
+                return True
+            with guard:
+                if got.is_set():
+                    return True
+                abandoned = True
+            return False
+        finally:
+            self._withdraw(me.pid)
+
+    def _withdraw(self, pid: int) -> None:
+        """Remove our handoff request, unless someone else's replaced it."""
+        request = _read_holder(self.want_path)
+        if request is not None and request.pid == pid:
+            try:
+                os.remove(self.want_path)
+            except OSError:
+                pass
+
+    def _watch(self, on_request: Callable[[LockHolder], None], seen: Optional[int]) -> None:
+        while not self._stop.wait(REQUEST_POLL_INTERVAL):
+            stamp = self._request_stamp()
+            if stamp is None or stamp == seen:
+                continue
+            seen = stamp
+            request = _read_holder(self.want_path)
+            if request is not None:
+                on_request(request)
+
+    def _request_stamp(self) -> Optional[int]:
+        try:
+            return os.stat(self.want_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def release(self) -> None:
+        """Let go of the lock (no-op if not held)."""
+        self._stop.set()
+        watcher = self._watcher
+        if watcher is not None and watcher is not threading.current_thread():
+            watcher.join()
+        self._watcher = None
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.ftruncate(fd, 0)
+            os.close(fd)            # closing drops the flock
+
+    def holder(self) -> Optional[LockHolder]:
+        """Who holds the lock now (possibly this process), or None.
+
+        Read from the lock file rather than probed with ``flock``, which
+        would make a concurrent ``acquire()`` see the port as busy.  The
+        file is emptied on release; a holder that died without releasing
+        is recognised by its pid.
+        """
+        if fcntl is None:
+            return None
+        holder = _read_holder(self.path)
+        if holder is None or not _alive(holder.pid):
+            return None
+        return holder
+
+
+def lock_holder(port: str) -> Optional[LockHolder]:
+    """Who has ``port`` open through this package, or None."""
+    return PortLock(port).holder()
@@ -0,0 +1,154 @@
+"""Non-interactive discovery of FT-1000MPs on the available serial ports.
+
+Every candidate from ``comports()`` is probed in parallel: open it, send
+READ_FLAGS and a STATUS_UPDATE with a short read timeout, and check that
+the answers have the right length and a plausible frequency and mode.
+Each port is tried with a few RTS/DTR combinations, because some
+adapters (Digirig / CP210x) block CAT writes unless RTS is deasserted.
+
+Working settings are cached by USB serial number, so the next probe
+tries the known-good combination first.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from . import cache
+from .exceptions import FT1000MPError
+from .protocol import MODE_NAMES, StatusTarget, cmd_read_flags, cmd_status_update
+from .serial_port import DEFAULT_BAUDRATE, SerialPort
+from .transceiver import FREQ_MAX_HZ, FREQ_MIN_HZ, _parse_vfo_block
+
+PROBE_TIMEOUT = 0.1              # read timeout per probe command
+PROBE_CACHE = "probe"
+
+# (rts, dtr) combinations to try, in order; None = driver default
+LINE_SETTINGS: tuple[tuple[Optional[bool], Optional[bool]], ...] = (
+    (None, None),
+    (False, None),
+    (False, False),
+)
+
+
+@dataclass
+class ProbeResult:
+    """A port with an FT-1000MP behind it."""
+    port: str
+    rts: Optional[bool]
+    dtr: Optional[bool]
+    frequency_hz: int
+    serial_number: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def _answers(sp: SerialPort) -> Optional[int]:
+    """Return the operating frequency if the radio answers sensibly."""
+    try:
+        flags = sp.send_command(cmd_read_flags(), 5)
+        data = sp.send_command(cmd_status_update(StatusTarget.OPERATING_DATA), 16)
+    except FT1000MPError:
+        return None
+    if flags is None or data is None:
+        return None
+    status = _parse_vfo_block(data)
+    if not (FREQ_MIN_HZ <= status.frequency_hz <= FREQ_MAX_HZ):
+        return None
+    if status.mode not in MODE_NAMES:
+        return None
+    return status.frequency_hz
+
+
+def _probe_port(
+    device: str,
+    serial_number: Optional[str],
+    settings: Sequence[tuple[Optional[bool], Optional[bool]]],
+    timeout: float,
+    baudrate: int,
+) -> Optional[ProbeResult]:
+    start = time.monotonic()
+    for rts, dtr in settings:
+        sp = SerialPort(
+            port=device, baudrate=baudrate, timeout=timeout, retries=1, rts=rts, dtr=dtr,
+        )
+        try:
+            sp.open()
+        except FT1000MPError:
+            return None  # busy or not a serial device — no point in other settings
+        try:
+            freq = _answers(sp)
+        finally:
+            sp.close()
+        if freq is not None:
+            return ProbeResult(
+                device, rts, dtr, freq, serial_number, time.monotonic() - start,
+            )
+    return None
+
+
+def probe_ports(
+    candidates: Optional[Sequence[str]] = None,
+    timeout: float = PROBE_TIMEOUT,
+    baudrate: int = DEFAULT_BAUDRATE,
+    use_cache: bool = True,
+) -> list[ProbeResult]:
+    """Find every port with a responding FT-1000MP, probing all in parallel.
+
+    Args:
+        candidates: Devices to probe (default: everything ``comports()``
+            reports).
+        timeout: Read timeout for each probe command.
+        baudrate: CAT baud rate.
+        use_cache: Try (and update) the RTS/DTR settings remembered for
+            each USB serial number.
+
+    Returns:
+        One ``ProbeResult`` per radio found, sorted by port name.
+    """
+    from serial.tools.list_ports import comports
+
+    serial_numbers: dict[str, Optional[str]] = {}
+    for info in comports():
+        serial_numbers[info.device] = info.serial_number
+    devices = list(candidates) if candidates is not None else sorted(serial_numbers)
+    if not devices:
+        return []
+
+    known = (cache.load(PROBE_CACHE) or {}) if use_cache else {}
+
+    def settings_for(device: str) -> list[tuple[Optional[bool], Optional[bool]]]:
+        order = list(LINE_SETTINGS)
+        entry = known.get(serial_numbers.get(device) or "")
+        if isinstance(entry, dict):
+            preferred = (entry.get("rts"), entry.get("dtr"))
+            if preferred in order:
+                order.remove(preferred)
+            order.insert(0, preferred)
+        return order
+
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        futures = [
+            executor.submit(
+                _probe_port, device, serial_numbers.get(device),
+                settings_for(device), timeout, baudrate,
+            )
+            for device in devices
+        ]
+        found = [r for r in (f.result() for f in futures) if r is not None]
+
+    if use_cache:
+        changed = False
+        for result in found:
+            if result.serial_number:
+                known[result.serial_number] = {
+                    "port": result.port,
+                    "rts": result.rts,
+                    "dtr": result.dtr,
+                    "timestamp": time.time(),
+                }
+                changed = True
+        if changed:
+            cache.save(PROBE_CACHE, known)
+
+    return sorted(found, key=lambda r: r.port)
@@ -0,0 +1,120 @@
+"""Wire-time accounting for CAT commands.
+
+Attach a ``WireProfiler`` to a ``SerialPort`` (or ``FT1000MP.profiler``)
+and every command is split into:
+
+pacing
+    Time actually spent in the inter-byte / post-command sleeps.
+wire
+    Theoretical time on the wire for the command and its response
+    (11 bits per byte at 8N2, at the port's baud rate).
+first byte
+    From the end of the write until the first response byte arrived:
+    the command's own wire time, the radio's processing time and the USB
+    adapter's latency timer.
+read
+    From the first response byte until the last.
+
+Whatever is left of the total (writes, retry back-off, lock waits) is
+reported as "other".  Samples are aggregated per opcode and response
+length, since e.g. STATUS_UPDATE ranges from 16 to 1636 bytes.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from .protocol import Opcode
+
+
+@dataclass
+class CommandTiming:
+    """The breakdown of one command, in seconds."""
+    opcode: int
+    response_length: int
+    pacing_s: float
+    wire_s: float
+    first_byte_s: float
+    read_s: float
+    total_s: float
+    attempts: int = 1
+    ok: bool = True
+
+
+@dataclass
+class OpcodeStats:
+    """Running totals for one (opcode, response length)."""
+    count: int = 0
+    pacing_s: float = 0.0
+    wire_s: float = 0.0
+    first_byte_s: float = 0.0
+    read_s: float = 0.0
+    total_s: float = 0.0
+    max_total_s: float = 0.0
+    retries: int = 0
+    failures: int = 0
+
+    def add(self, timing: CommandTiming) -> None:
+        self.count += 1
+        self.pacing_s += timing.pacing_s
+        self.wire_s += timing.wire_s
+        self.first_byte_s += timing.first_byte_s
+        self.read_s += timing.read_s
+        self.total_s += timing.total_s
+        self.max_total_s = max(self.max_total_s, timing.total_s)
+        self.retries += timing.attempts - 1
+        self.failures += not timing.ok
+
+
+def opcode_name(opcode: int) -> str:
+    try:
+        return Opcode(opcode).name
+    except ValueError:
+        return f"0x{opcode:02X}"
+
+
+class WireProfiler:
+    """Collects ``CommandTiming`` samples from one or more ports."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stats: dict[tuple[int, int], OpcodeStats] = {}
+        self.last: Optional[CommandTiming] = None
+
+    def record(self, timing: CommandTiming) -> None:
+        with self._lock:
+            key = (timing.opcode, timing.response_length)
+            self.stats.setdefault(key, OpcodeStats()).add(timing)
+            self.last = timing
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.last = None
+
+    def report(self) -> str:
+        """Per-opcode averages in milliseconds, slowest total first."""
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda kv: -kv[1].total_s)
+        if not rows:
+            return "No commands profiled."
+        header = (
+            f"{'opcode':<16}{'resp':>6}{'calls':>7}{'total':>9}{'pacing':>9}"
+            f"{'wire':>8}{'1st byte':>10}{'read':>8}{'other':>8}{'max':>9}{'retries':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for (opcode, response_length), st in rows:
+            n = st.count
+
+            def ms(total: float) -> str:
+                return f"{total / n * 1000:.1f}"
+
+            other = st.total_s - st.pacing_s - st.first_byte_s - st.read_s
+            lines.append(
+                f"{opcode_name(opcode):<16}{response_length:>6}{n:>7}{ms(st.total_s):>9}"
+                f"{ms(st.pacing_s):>9}{ms(st.wire_s):>8}{ms(st.first_byte_s):>10}"
+                f"{ms(st.read_s):>8}{ms(other):>8}{st.max_total_s * 1000:>9.1f}"
+                f"{st.retries:>9}"
+            )
+        lines.append("(milliseconds per call; wire = theoretical 8N2 time at the baud rate)")
+        return "\n".join(lines)
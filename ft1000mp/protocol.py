@@ -30,6 +30,7 @@ class Opcode(IntEnum):
     STATUS_UPDATE = 0x10
     COPY_VFO_A_TO_B = 0x85
     SET_FREQ_B = 0x8A
+    READ_METER = 0xF7
     READ_FLAGS = 0xFA
 
 
@@ -62,6 +63,36 @@ class StatusFlag:
     PRIORITY = 0x80
 
 
+# ---------------------------------------------------------------------------
+# STATUS_UPDATE targets (P4) and their response lengths
+# ---------------------------------------------------------------------------
+
+class StatusTarget(IntEnum):
+    ALL_DATA = 0x00
+    MEMORY_CHANNEL = 0x01
+    OPERATING_DATA = 0x02
+    VFO_DATA = 0x03
+    MEMORY_DATA = 0x04
+
+
+STATUS_RESPONSE_LENGTHS: dict[int, int] = {
+    StatusTarget.ALL_DATA: 1636,
+    StatusTarget.MEMORY_CHANNEL: 1,
+    StatusTarget.OPERATING_DATA: 16,
+    StatusTarget.VFO_DATA: 32,
+    StatusTarget.MEMORY_DATA: 16,
+}
+
+METER_RESPONSE_LENGTH = 5
+
+# Layout of the all-data (0x00) response: a short header followed by
+# 16-byte blocks in the order VFO-A, VFO-B, memory channels 1-99, QMB.
+STATUS_BLOCK_LENGTH = 16
+ALL_DATA_HEADER_LENGTH = 4
+ALL_DATA_FIRST_MEMORY_BLOCK = 2
+MEMORY_CHANNELS = 99
+
+
 # ---------------------------------------------------------------------------
 # Mode lookup tables
 # ---------------------------------------------------------------------------
@@ -180,7 +211,11 @@ def cmd_ptt(on: bool) -> bytes:
 
 
 def cmd_status_update(target: int = 0x02) -> bytes:
-    """Request status update. target: 0x02=current, 0x03=VFO-A+B (32 bytes)."""
+    """Request status update.
+
+    target: 0x00=all data (1636 bytes), 0x02=current (16 bytes),
+    0x03=VFO-A+B (32 bytes).  See ``STATUS_RESPONSE_LENGTHS``.
+    """
     return _cmd(p4=target, opcode=Opcode.STATUS_UPDATE)
 
 
@@ -188,6 +223,16 @@ def cmd_read_flags() -> bytes:
     return _cmd(opcode=Opcode.READ_FLAGS)
 
 
+def cmd_read_meter(sub: bool = False) -> bytes:
+    """Read the meter: the S-meter on receive, the selected TX meter on
+    transmit.  P4 picks the main (0x00) or sub (0x01) receiver.
+
+    The 5-byte response carries the reading (0-255) in byte 0; see
+    ``METER_RESPONSE_LENGTH``.
+    """
+    return _cmd(p4=0x01 if sub else 0x00, opcode=Opcode.READ_METER)
+
+
 def cmd_recall_memory(channel: int) -> bytes:
     """Recall memory channel. Channel goes in P4 (byte 3) per Hamlib."""
     return _cmd(p4=channel, opcode=Opcode.RECALL_MEMORY)
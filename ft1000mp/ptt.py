@@ -0,0 +1,200 @@
+"""PTT control with latency tracking and a transmit watchdog.
+
+``PTTController`` keys the radio through ``FT1000MP.set_ptt`` (the urgent
+serial path) and records how long each key-down / key-up took to reach
+the wire.  A watchdog thread forces PTT off when a transmission runs past
+``max_transmit_s``, or when the controlling client stops calling
+``heartbeat()`` for ``heartbeat_timeout_s`` — e.g. a remote client whose
+connection dropped mid-over.
+
+The watchdog never gives up on a trip: if the unkey command fails (any
+error, including a raw ``OSError`` from the port), it is logged, kept in
+``PTTController.error`` and retried every ``interval`` until it goes
+through.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from .transceiver import FT1000MP
+
+DEFAULT_MAX_TRANSMIT_S = 180.0
+WATCHDOG_INTERVAL = 0.05         # how often the watchdog checks, seconds
+LATENCY_HISTORY = 1000           # samples kept per direction
+
+TRIP_TIME_LIMIT = "time limit"
+TRIP_HEARTBEAT = "heartbeat lost"
+
+log = logging.getLogger(__name__)
+
+
+class PTTController:
+    """Keys one radio and unkeys it if the transmission gets out of hand.
+
+    Example::
+
+        with PTTController(radio, max_transmit_s=120, heartbeat_timeout_s=2) as ptt:
+            ptt.key_down()
+            while sending:
+                ptt.heartbeat()
+            ptt.key_up()
+    """
+
+    def __init__(
+        self,
+        radio: FT1000MP,
+        max_transmit_s: Optional[float] = DEFAULT_MAX_TRANSMIT_S,
+        heartbeat_timeout_s: Optional[float] = None,
+        on_trip: Optional[Callable[[str], None]] = None,
+        interval: float = WATCHDOG_INTERVAL,
+    ):
+        """
+        Args:
+            radio: An open FT1000MP.
+            max_transmit_s: Longest allowed transmission (None = no limit).
+            heartbeat_timeout_s: Unkey if ``heartbeat()`` (or ``key_down()``)
+                has not been called for this long while keyed (None = off).
+            on_trip: Called from the watchdog thread with the trip reason
+                after PTT has been forced off.  An exception it raises is
+                logged and kept in ``error``.
+            interval: Watchdog check period.
+        """
+        self.radio = radio
+        self.max_transmit_s = max_transmit_s
+        self.heartbeat_timeout_s = heartbeat_timeout_s
+        self.on_trip = on_trip
+        self.interval = interval
+        self.key_down_latency: deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self.key_up_latency: deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self.trips: list[str] = []
+        self.error: Optional[Exception] = None   # last watchdog failure
+        self._lock = threading.Lock()
+        self._keyed_at: Optional[float] = None
+        self._last_heartbeat = 0.0
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="ft1000mp-ptt-watchdog", daemon=True,
+        )
+        self._watchdog.start()
+
+    # -- context manager ---------------------------------------------------
+
+    def __enter__(self) -> "PTTController":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unkey if keyed and stop the watchdog."""
+        try:
+            if self.transmitting:
+                self.key_up()
+        finally:
+            self._stop.set()
+            self._watchdog.join()
+
+    # -- keying ------------------------------------------------------------
+
+    @property
+    def transmitting(self) -> bool:
+        return self._keyed_at is not None
+
+    def key_down(self) -> float:
+        """Key the transmitter.
+
+        Returns:
+            Seconds from the call until the frame was written.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            self.radio.set_ptt(True)
+            latency = time.perf_counter() - start
+            now = time.monotonic()
+            if self._keyed_at is None:
+                self._keyed_at = now
+            self._last_heartbeat = now
+        self.key_down_latency.append(latency)
+        return latency
+
+    def key_up(self) -> float:
+        """Unkey the transmitter.
+
+        Returns:
+            Seconds from the call until the frame was written.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            self.radio.set_ptt(False)
+            latency = time.perf_counter() - start
+            self._keyed_at = None
+        self.key_up_latency.append(latency)
+        return latency
+
+    def heartbeat(self) -> None:
+        """Tell the watchdog the controlling client is still alive."""
+        self._last_heartbeat = time.monotonic()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Latency summary per direction: count, min, avg and max in seconds."""
+        result = {}
+        for name, samples in (("key_down", self.key_down_latency), ("key_up", self.key_up_latency)):
+            values = list(samples)
+            result[name] = {
+                "count": len(values),
+                "min": min(values, default=0.0),
+                "avg": sum(values) / len(values) if values else 0.0,
+                "max": max(values, default=0.0),
+            }
+        return result
+
+    # -- watchdog ----------------------------------------------------------
+
+    def _expired(self, now: float) -> Optional[str]:
+        keyed_at = self._keyed_at
+        if keyed_at is None:
+            return None
+        if self.max_transmit_s is not None and now - keyed_at >= self.max_transmit_s:
+            return TRIP_TIME_LIMIT
+        if (
+            self.heartbeat_timeout_s is not None
+            and now - self._last_heartbeat >= self.heartbeat_timeout_s
+        ):
+            return TRIP_HEARTBEAT
+        return None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self._expired(time.monotonic()) is None:
+                continue
+            with self._lock:
+                # Re-check: the client may have unkeyed meanwhile.
+                reason = self._expired(time.monotonic())
+                if reason is None:
+                    continue
+                try:
+                    self.radio.set_ptt(False)
+                except Exception as exc:    # still keyed; try again next tick
+                    if self.error is None:
+                        log.error("PTT watchdog (%s) could not unkey: %s; retrying", reason, exc)
+                    self.error = exc
+                    continue
+                if self.error is not None:
+                    log.warning("PTT watchdog (%s) unkeyed after retrying", reason)
+                self.error = None
+                self._keyed_at = None
+                self.trips.append(reason)
+            if self.on_trip is not None:
+                try:
+                    self.on_trip(reason)
+                except Exception as exc:
+                    log.exception("PTT watchdog on_trip callback failed")
+                    self.error = exc
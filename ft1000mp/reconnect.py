@@ -0,0 +1,251 @@
+"""Automatic reconnect after USB-serial dropouts.
+
+``ReconnectingSerialPort`` is a drop-in ``SerialPort`` that treats an
+I/O error as an outage instead of a fatal error: it closes the dead
+handle, reopens the device with exponential backoff, restores the RTS/DTR
+lines, and then replays or fails the interrupted command according to
+its ``ReconnectPolicy``.
+
+USB adapters often come back under a different tty name
+(``/dev/ttyUSB0`` → ``/dev/ttyUSB1``).  When the port was opened through,
+or can be matched to, a ``/dev/serial/by-id`` link, reconnects follow that
+link to wherever the adapter reappeared.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, TypeVar
+
+from .exceptions import DeadlineExceeded, SerialConnectionError
+from .protocol import cmd_ptt
+from .serial_port import DEFAULT_PORT, SerialPort
+
+T = TypeVar("T")
+
+BY_ID_DIR = "/dev/serial/by-id"
+
+REPLAY = "replay"    # resend the interrupted command after reconnecting
+FAIL = "fail"        # raise SerialConnectionError; the next call reconnects
+
+
+@dataclass
+class ReconnectPolicy:
+    """How hard to try, and what to do with the interrupted command."""
+    initial_delay: float = 0.1
+    max_delay: float = 5.0
+    multiplier: float = 2.0
+    give_up_after: Optional[float] = 60.0   # None = keep trying forever
+    on_outage: str = REPLAY
+    max_replays: int = 3                    # per command
+
+
+@dataclass
+class Outage:
+    """One dropout, from the first I/O error until the port was back."""
+    started: float          # time.time() of the first error
+    duration: float         # seconds; until giving up if not recovered
+    attempts: int           # reopen attempts
+    error: str              # the I/O error that started it
+    recovered: bool = True
+
+
+def _by_id_link(port: str, by_id_dir: str = BY_ID_DIR) -> Optional[str]:
+    """Return the persistent by-id link for ``port``, if there is one."""
+    if os.path.dirname(port) == by_id_dir:
+        return port
+    try:
+        names = os.listdir(by_id_dir)
+    except OSError:
+        return None  # not Linux, or no USB serial devices
+    target = os.path.realpath(port)
+    for name in sorted(names):
+        link = os.path.join(by_id_dir, name)
+        if os.path.realpath(link) == target:
+            return link
+    return None
+
+
+class ReconnectingSerialPort(SerialPort):
+    """SerialPort that survives the adapter disappearing and coming back.
+
+    ``outages`` records every dropout; ``connected`` is False while one
+    is in progress.  After giving up the port stays closed until
+    ``open()`` is called again.
+    """
+
+    def __init__(
+        self,
+        port: str = DEFAULT_PORT,
+        policy: Optional[ReconnectPolicy] = None,
+        **kwargs: object,
+    ):
+        super().__init__(port=port, **kwargs)  # type: ignore[arg-type]
+        self.policy = policy or ReconnectPolicy()
+        self.outages: list[Outage] = []
+        self._by_id: Optional[str] = None
+        self._reconnect_lock = threading.Lock()
+        self._generation = 0            # bumped on every successful reopen
+        self._down_since: Optional[float] = None
+        self._outage_wall = 0.0
+        self._down_error = ""
+        self._down_attempts = 0
+        self._lines: tuple[Optional[bool], Optional[bool]] = (self._rts, self._dtr)
+
+    @property
+    def connected(self) -> bool:
+        return self._down_since is None and self.is_open
+
+    @property
+    def total_downtime(self) -> float:
+        return sum(outage.duration for outage in self.outages)
+
+    def open(self) -> None:
+        super().open()
+        self._by_id = self._by_id or _by_id_link(self.port)
+
+    # -- supervised I/O ----------------------------------------------------
+
+    def send_command(
+        self, cmd: bytes, response_length: int = 0, deadline: Optional[float] = None
+    ) -> Optional[bytes]:
+        return self._supervised(
+            cmd, deadline, lambda: super(ReconnectingSerialPort, self).send_command(
+                cmd, response_length, deadline,
+            ),
+        )
+
+    def send_commands(self, cmds: Sequence[bytes], deadline: Optional[float] = None) -> None:
+        # Every CAT setter is absolute (no toggles), so replaying a whole
+        # partly-sent batch is safe.
+        self._supervised(
+            None, deadline,
+            lambda: super(ReconnectingSerialPort, self).send_commands(cmds, deadline),
+        )
+
+    def send_urgent(self, cmd: bytes, deadline: Optional[float] = None) -> None:
+        self._supervised(
+            cmd, deadline,
+            lambda: super(ReconnectingSerialPort, self).send_urgent(cmd, deadline),
+        )
+
+    def send_commands_at(
+        self, cmds: Sequence[bytes], start: float, deadline: Optional[float] = None
+    ) -> tuple[float, float]:
+        return self._supervised(
+            None, deadline,
+            lambda: super(ReconnectingSerialPort, self).send_commands_at(cmds, start, deadline),
+        )
+
+    def _supervised(
+        self, cmd: Optional[bytes], deadline: Optional[float], send: Callable[[], T]
+    ) -> T:
+        replays = 0
+        while True:
+            if self._down_since is not None:
+                self._reconnect(deadline)
+            generation = self._generation
+            try:
+                return send()
+            except OSError as exc:   # includes serial.SerialException
+                self._mark_down(exc, generation)
+                # Keying the transmitter seconds late is worse than failing.
+                if (
+                    self.policy.on_outage != REPLAY
+                    or cmd == cmd_ptt(True)
+                    or replays >= self.policy.max_replays
+                ):
+                    raise SerialConnectionError(f"Lost {self.port}: {exc}") from exc
+                replays += 1
+
+    def _mark_down(self, exc: OSError, generation: int) -> None:
+        with self._reconnect_lock:
+            if generation != self._generation or self._down_since is not None:
+                return  # another thread already handled this outage
+            ser = self._ser
+            if ser is not None:
+                self._lines = (getattr(ser, "rts", self._rts), getattr(ser, "dtr", self._dtr))
+            self._close_quietly()
+            self._down_since = time.monotonic()
+            self._down_error = str(exc)
+            self._down_attempts = 0
+            self._outage_wall = time.time()
+
+    def _close_quietly(self) -> None:
+        # Keep the port lock: nobody else should grab the radio mid-outage.
+        try:
+            self._close_handle()
+        except OSError:
+            self._ser = None
+
+    # -- reconnect ---------------------------------------------------------
+
+    def _reconnect(self, deadline: Optional[float]) -> None:
+        """Reopen the device with backoff until it is back.
+
+        Raises:
+            SerialConnectionError: ``give_up_after`` elapsed.
+            DeadlineExceeded: The caller's deadline passed first; the
+                outage continues and the next call resumes reconnecting.
+        """
+        policy = self.policy
+        # Waiting behind another thread's reconnect counts against the deadline
+        wait = -1.0 if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self._reconnect_lock.acquire(timeout=wait):
+            raise DeadlineExceeded(f"Deadline passed while reconnecting {self.port}")
+        try:
+            if self._down_since is None:
+                return  # another thread got there first
+            delay = policy.initial_delay
+            last_error = ""
+            while True:
+                if self._by_id is not None and os.path.exists(self._by_id):
+                    self.port = os.path.realpath(self._by_id)
+                self._down_attempts += 1
+                try:
+                    super().open()
+                except SerialConnectionError as exc:
+                    last_error = str(exc)
+                else:
+                    self._restore_lines()
+                    self._end_outage(recovered=True)
+                    return
+
+                now = time.monotonic()
+                if policy.give_up_after is not None and now - self._down_since >= policy.give_up_after:
+                    self._end_outage(recovered=False)
+                    self.close()
+                    raise SerialConnectionError(
+                        f"{self.port} did not come back after "
+                        f"{policy.give_up_after:g} s: {last_error}"
+                    )
+                if deadline is not None and now + delay >= deadline:
+                    raise DeadlineExceeded(f"Deadline passed while reconnecting {self.port}")
+                time.sleep(delay)
+                delay = min(delay * policy.multiplier, policy.max_delay)
+        finally:
+            self._reconnect_lock.release()
+
+    def _restore_lines(self) -> None:
+        rts, dtr = self._lines
+        ser = self._ser
+        if ser is None:
+            return
+        if rts is not None:
+            ser.rts = rts
+        if dtr is not None:
+            ser.dtr = dtr
+
+    def _end_outage(self, recovered: bool) -> None:
+        assert self._down_since is not None
+        self.outages.append(Outage(
+            started=self._outage_wall,
+            duration=time.monotonic() - self._down_since,
+            attempts=self._down_attempts,
+            error=self._down_error,
+            recovered=recovered,
+        ))
+        self._down_since = None
+        if recovered:
+            self._generation += 1
@@ -0,0 +1,101 @@
+"""Commands timed to a wall-clock instant, e.g. band hops between FT8 periods.
+
+``FT1000MP.at(when, commands)`` encodes the frames up front, works out
+how long they take to write (``SerialPort.write_duration``: pacing plus
+the last byte's wire time), and starts writing that much before
+``when``, so the final byte reaches the radio at ``when``.  The last
+couple of milliseconds are busy-waited rather than slept.
+
+Every run is measured.  The gap between the planned and the measured
+write time (sleep overshoot, driver latency) is learned as an
+exponential average and added to the next lead, and each run's
+``Landing`` says how far from its target it came.
+"""
+
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+from .exceptions import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from .serial_port import SerialPort
+
+DEFAULT_MAX_LATE = 0.5       # give up if the port is not free this long after the target
+CORRECTION_GAIN = 0.3        # weight of the newest run in the learned correction
+HISTORY = 100
+
+
+@dataclass(frozen=True)
+class Landing:
+    """One timed execution, in ``time.time()`` seconds."""
+    target: float
+    landed: float            # when the last byte reached the radio (estimated)
+    lead: float              # how long before ``target`` writing started
+    frames: int
+
+    @property
+    def error(self) -> float:
+        """Seconds late (negative: early)."""
+        return self.landed - self.target
+
+
+def next_period(period: float = 15.0, offset: float = 0.0, now: "float | None" = None) -> float:
+    """The next wall-clock time that is ``offset`` past a multiple of ``period``.
+
+    ``next_period(15, -0.5)`` is half a second before the next FT8 period.
+    """
+    now = time.time() if now is None else now
+    base = (now - offset) // period * period + offset
+    return base + period if base <= now else base
+
+
+class CommandScheduler:
+    """Runs frame lists at absolute times on one port; see the module docstring."""
+
+    def __init__(self, serial: "SerialPort"):
+        self.serial = serial
+        self.correction = 0.0        # measured minus planned write time
+        self.landings: deque[Landing] = deque(maxlen=HISTORY)
+
+    def lead(self, frames: Sequence[bytes]) -> float:
+        """Seconds before the target that writing ``frames`` will start."""
+        return self.serial.write_duration(frames) + self.correction
+
+    def at(self, when: float, frames: Sequence[bytes], max_late: float = DEFAULT_MAX_LATE) -> Landing:
+        """Write ``frames`` so the last byte lands at ``when`` (``time.time()``).
+
+        Blocks until done.
+
+        Raises:
+            ValueError: ``frames`` is empty.
+            DeadlineExceeded: The target is more than ``max_late`` in the
+                past, or the port stayed busy until then.
+        """
+        if not frames:
+            raise ValueError("Nothing to schedule")
+        planned = self.serial.write_duration(frames)
+        lead = planned + self.correction
+        wall, perf, mono = time.time(), time.perf_counter(), time.monotonic()
+        until = when - wall
+        if until + max_late < 0:
+            raise DeadlineExceeded(f"Target time passed {-until:.3f} s ago")
+        target = perf + until
+        started, landed = self.serial.send_commands_at(frames, target - lead, mono + until + max_late)
+        self.correction += CORRECTION_GAIN * ((landed - started - planned) - self.correction)
+        landing = Landing(when, when + landed - target, lead, len(frames))
+        self.landings.append(landing)
+        return landing
+
+    @property
+    def mean_error(self) -> float:
+        return statistics.fmean(landing.error for landing in self.landings) if self.landings else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """Standard deviation of the landing error over recent runs."""
+        if len(self.landings) < 2:
+            return 0.0
+        return statistics.pstdev(landing.error for landing in self.landings)
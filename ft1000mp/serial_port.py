@@ -1,17 +1,27 @@
 """Serial transport layer for the FT-1000MP CAT protocol.
 
-Handles opening the serial port, writing commands byte-by-byte with
-inter-byte delays, reading responses, and retry logic.
+Handles opening the port (through a ``transport.Transport``), writing
+commands byte-by-byte with inter-byte delays, reading responses, and
+retry logic.  Access is
+serialised by a lock on which urgent commands (PTT) jump the queue.
 """
 
 import os
 import sys
+import threading
 import time
-from typing import Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Sequence
 
-import serial
+from .exceptions import CommandTimeoutError, DeadlineExceeded, SerialConnectionError
+from .timing import OpcodeTiming, TimingTable
 
-from .exceptions import CommandTimeoutError, SerialConnectionError
+if TYPE_CHECKING:
+    import serial
+
+    from .portlock import LockHolder, PortLock
+    from .profiler import WireProfiler
+    from .transport import Transport
 
 # Default serial parameters for the FT-1000MP
 if sys.platform.startswith("win"):
@@ -24,13 +34,36 @@ DEFAULT_BAUDRATE = 4800
 DEFAULT_TIMEOUT = 0.4            # 400ms read timeout
 DEFAULT_RETRIES = 6
 INTER_BYTE_DELAY = 0.005         # 5ms between bytes
-POST_COMMAND_DELAY = 0.005       # 5ms after full command
+POST_COMMAND_DELAY = 0.005       # 5ms after full command (default settle)
+BITS_PER_BYTE = 11               # 8N2 framing: start + 8 data + 2 stop
+LOCK_AHEAD = 0.25                # timed writes take the port this early
+# Busy-wait the last stretch before a timed write; Windows sleeps overshoot more
+SPIN_MARGIN = 0.02 if sys.platform.startswith("win") else 0.002
+
 
+def detect_port(probe: bool = True) -> str:
+    """Auto-detect the radio's serial port.
 
-def detect_port() -> str:
-    """Auto-detect a serial port by asking the user to unplug and replug the cable."""
+    First probes every port in parallel for a responding FT-1000MP (see
+    ``probe.probe_ports``).  Only if none answers, and only on an
+    interactive terminal, falls back to asking the user to unplug and
+    replug the cable.
+    """
     from serial.tools.list_ports import comports
 
+    if probe:
+        from .probe import probe_ports
+
+        found = probe_ports()
+        if found:
+            if len(found) > 1:
+                print(f"Multiple radios detected: {[r.port for r in found]}")
+            print(f"Detected: {found[0].port}")
+            return found[0].port
+        if not sys.stdin.isatty():
+            print(f"No radio answered. Falling back to {DEFAULT_PORT}")
+            return DEFAULT_PORT
+
     input("Unplug the USB-to-serial cable and press Enter...")
     before = {p.device for p in comports()}
 
@@ -52,6 +85,101 @@ def detect_port() -> str:
         return DEFAULT_PORT
 
 
+def _wait_until(when: float, spin: bool = True) -> None:
+    """Wait until ``time.perf_counter()`` reaches ``when``, busy-waiting
+    the last ``SPIN_MARGIN`` unless ``spin`` is False."""
+    left = when - time.perf_counter() - (SPIN_MARGIN if spin else 0.0)
+    if left > 0:
+        time.sleep(left)
+    while spin and time.perf_counter() < when:
+        pass
+
+
+def default_timing() -> TimingTable:
+    """The global delays for every opcode."""
+    return TimingTable(OpcodeTiming(INTER_BYTE_DELAY, POST_COMMAND_DELAY))
+
+
+def _remaining(deadline: Optional[float], cmd: bytes) -> Optional[float]:
+    """Seconds left until ``deadline`` (a ``time.monotonic()`` value).
+
+    Raises:
+        DeadlineExceeded: The deadline has already passed.
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded(f"Deadline passed (cmd=0x{cmd[-1]:02X})")
+    return left
+
+
+class _PriorityLock:
+    """Mutex on which urgent holders go ahead of every normal waiter.
+
+    Long normal operations call ``yield_to_urgent()`` at safe points
+    (between frames, between retries) so an urgent command never waits
+    for more than one frame.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._held = False
+        self._urgent_waiting = 0
+        self._yielded = False    # a holder stepped aside for urgent waiters
+
+    @contextmanager
+    def hold(self, urgent: bool = False, deadline: Optional[float] = None) -> Iterator[None]:
+        self._acquire(urgent, deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _wait(self, deadline: Optional[float]) -> None:
+        if deadline is None:
+            self._cond.wait()
+        elif not self._cond.wait(deadline - time.monotonic()):
+            raise DeadlineExceeded("Deadline passed waiting for the serial port")
+
+    def _acquire(self, urgent: bool, deadline: Optional[float] = None) -> None:
+        with self._cond:
+            if urgent:
+                self._urgent_waiting += 1
+                try:
+                    while self._held:
+                        self._wait(deadline)
+                finally:
+                    self._urgent_waiting -= 1
+                    if not self._urgent_waiting:
+                        self._cond.notify_all()
+            else:
+                while self._held or self._urgent_waiting or self._yielded:
+                    self._wait(deadline)
+            self._held = True
+
+    def _release(self) -> None:
+        with self._cond:
+            self._held = False
+            self._cond.notify_all()
+
+    def yield_to_urgent(self) -> None:
+        """Let waiting urgent holders run, then take the lock back ahead
+        of any normal waiter."""
+        with self._cond:
+            if not self._urgent_waiting:
+                return
+            self._held = False
+            self._yielded = True
+            self._cond.notify_all()
+            try:
+                while self._held or self._urgent_waiting:
+                    self._cond.wait()
+            finally:
+                self._yielded = False
+            self._held = True
+
+
 class SerialPort:
     """Low-level serial transport for FT-1000MP CAT commands."""
 
@@ -63,14 +191,46 @@ class SerialPort:
         retries: int = DEFAULT_RETRIES,
         rts: Optional[bool] = None,
         dtr: Optional[bool] = None,
+        transport: Optional["Transport"] = None,
+        timing: Optional[TimingTable] = None,
+        lock: bool = True,
+        lock_timeout: Optional[float] = 0.0,
+        on_lock_request: Optional[Callable[["LockHolder"], bool]] = None,
     ):
+        """
+        Args:
+            port: Local device, or ``tcp://``, ``rfc2217://`` or ``loop://``
+                URL (see ``transport``).
+            transport: How to reach ``port`` (default: chosen from the port
+                string by ``transport.transport_for``).
+            timing: Per-opcode pacing (see ``timing``).  By default the
+                profile saved for ``port`` is applied on ``open()``, or
+                the global delays if there is none.
+            lock: Take the cross-process lock on a local device while open
+                (see ``portlock``).  URLs are never locked.
+            lock_timeout: Seconds ``open()`` waits for another process to
+                hand the port over (0 = fail at once, None = forever).
+            on_lock_request: Called with the requester's ``LockHolder``
+                when another process wants the port; return True to close
+                the port and let it have it.
+        """
         self.port = port
+        self.transport = transport
+        self.timing = timing or default_timing()
+        self._auto_timing = timing is None
         self.baudrate = baudrate
         self.timeout = timeout
         self.retries = retries
         self._rts = rts
         self._dtr = dtr
-        self._ser: Optional[serial.Serial] = None
+        self._ser: Optional["serial.Serial"] = None
+        self._paced = True      # write byte-by-byte (local UARTs)
+        self.profiler: Optional["WireProfiler"] = None
+        self._lock = _PriorityLock()
+        self._use_port_lock = lock and "://" not in port
+        self.lock_timeout = lock_timeout
+        self.on_lock_request = on_lock_request
+        self._port_lock: Optional["PortLock"] = None
 
     # -- context manager ---------------------------------------------------
 
@@ -89,78 +249,338 @@ class SerialPort:
     # -- open / close ------------------------------------------------------
 
     def open(self) -> None:
+        """Open the port.
+
+        Raises:
+            PortBusyError: Another process holds the port lock and did not
+                let go within ``lock_timeout``.
+            SerialConnectionError: The device could not be opened.
+        """
         if self._ser and self._ser.is_open:
             return
+        if self.transport is None:
+            from .transport import transport_for  # deferred, like pyserial
+
+            self.transport = transport_for(self.port)
+        locked_here = self._take_port_lock()
         try:
-            self._ser = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_TWO,
-                timeout=self.timeout,
-            )
-            if self._rts is not None:
-                self._ser.rts = self._rts
-            if self._dtr is not None:
-                self._ser.dtr = self._dtr
-        except serial.SerialException as exc:
-            raise SerialConnectionError(
-                f"Cannot open {self.port}: {exc}"
-            ) from exc
+            try:
+                self._ser = self.transport.open(self.port, self.baudrate, self.timeout)
+                if self._rts is not None:
+                    self._ser.rts = self._rts
+                if self._dtr is not None:
+                    self._ser.dtr = self._dtr
+            except OSError as exc:      # pyserial's SerialException is an OSError
+                raise SerialConnectionError(f"Cannot open {self.port}: {exc}") from exc
+        except BaseException:
+            self._close_handle()
+            if locked_here:
+                self._release_port_lock()
+            raise
+        self._paced = self.transport.paced
+        if self._auto_timing:
+            from .timing import load_profile
+
+            self.timing = load_profile(self.port) or self.timing
 
     def close(self) -> None:
+        self._close_handle()
+        self._release_port_lock()
+
+    def _close_handle(self) -> None:
+        """Close the device but keep the port lock."""
         if self._ser and self._ser.is_open:
             self._ser.close()
         self._ser = None
 
+    def lock_holder(self) -> Optional["LockHolder"]:
+        """The process holding this port's lock (maybe this one), or None."""
+        from .portlock import PortLock
+
+        return (self._port_lock or PortLock(self.port)).holder()
+
+    def _take_port_lock(self) -> bool:
+        """Acquire the port lock; True if this call took it."""
+        if not self._use_port_lock or (self._port_lock is not None and self._port_lock.held):
+            return False
+        from .portlock import PortLock
+
+        self._port_lock = PortLock(self.port)
+        on_request = self._handoff if self.on_lock_request is not None else None
+        self._port_lock.acquire(self.lock_timeout, on_request)
+        return True
+
+    def _release_port_lock(self) -> None:
+        if self._port_lock is not None:
+            self._port_lock.release()
+
+    def _handoff(self, request: "LockHolder") -> None:
+        """Watcher-thread callback: close the port if the owner agrees."""
+        assert self.on_lock_request is not None
+        if self.on_lock_request(request):
+            with self._lock.hold():         # never mid-command
+                self.close()
+
     @property
     def is_open(self) -> bool:
         return self._ser is not None and self._ser.is_open
 
     # -- send / receive ----------------------------------------------------
 
+    def _write_frame(self, ser: "serial.Serial", cmd: bytes) -> float:
+        """Write one frame with pacing; return the seconds spent sleeping."""
+        pacing = self.timing[cmd[-1]]
+        start = time.perf_counter()
+        written = 0.0
+        if self._paced:
+            # Write byte-by-byte with inter-byte delay
+            for b in cmd:
+                t = time.perf_counter()
+                ser.write(bytes([b]))
+                written += time.perf_counter() - t
+                time.sleep(pacing.inter_byte)
+        else:
+            t = time.perf_counter()
+            ser.write(cmd)   # remote/emulated: the far end clocks the bytes
+            written = time.perf_counter() - t
+        if pacing.settle:
+            time.sleep(pacing.settle)
+        return time.perf_counter() - start - written
+
+    def write_duration(self, cmds: Sequence[bytes]) -> float:
+        """Planned seconds from the first byte of ``cmds`` being written to
+        the last one arriving at the radio (pacing plus the final wire time)."""
+        total = 0.0
+        for i, cmd in enumerate(cmds):
+            pacing = self.timing[cmd[-1]]
+            last = i == len(cmds) - 1
+            if self._paced:
+                # no inter-byte delay after the final byte
+                total += (len(cmd) - 1 if last else len(cmd)) * pacing.inter_byte
+            if not last:
+                total += pacing.settle
+        tail = 1 if self._paced else len(cmds[-1])
+        return total + tail * BITS_PER_BYTE / self.baudrate
+
+    @staticmethod
+    def _timed_read(ser: "serial.Serial", size: int, timeout: float) -> tuple[bytes, float, float]:
+        """``ser.read(size)`` within ``timeout``, timing the wait for the
+        first byte separately.  ``ser.timeout`` is ``timeout`` on entry and exit.
+        """
+        t0 = time.perf_counter()
+        first = ser.read(1)
+        t1 = time.perf_counter()
+        left = timeout - (t1 - t0)
+        if not first or size == 1 or left <= 0:
+            return first, t1 - t0, 0.0
+        ser.timeout = left
+        try:
+            rest = ser.read(size - 1)
+        finally:
+            ser.timeout = timeout
+        return first + rest, t1 - t0, time.perf_counter() - t1
+
+    def _profile(
+        self,
+        cmd: bytes,
+        response_length: int,
+        start: float,
+        pacing: float,
+        first_byte: float = 0.0,
+        reading: float = 0.0,
+        attempts: int = 1,
+        ok: bool = True,
+    ) -> None:
+        from .profiler import CommandTiming
+
+        assert self.profiler is not None
+        self.profiler.record(CommandTiming(
+            opcode=cmd[-1],
+            response_length=response_length,
+            pacing_s=pacing,
+            wire_s=(len(cmd) + response_length) * BITS_PER_BYTE / self.baudrate,
+            first_byte_s=first_byte,
+            read_s=reading,
+            total_s=time.perf_counter() - start,
+            attempts=attempts,
+            ok=ok,
+        ))
+
     def send_command(
-        self, cmd: bytes, response_length: int = 0
+        self, cmd: bytes, response_length: int = 0, deadline: Optional[float] = None
     ) -> Optional[bytes]:
         """Send a 5-byte CAT command and optionally read a response.
 
         Args:
             cmd: Exactly 5 bytes to send.
             response_length: Number of bytes to read back (0 = no response).
+            deadline: ``time.monotonic()`` value by which the call must
+                finish.  Waiting for the port, every retry, each read and
+                each back-off sleep are cut short to fit (None = bounded
+                only by ``timeout`` and ``retries``).
 
         Returns:
             Response bytes, or None if response_length is 0.
 
         Raises:
             CommandTimeoutError: If the radio does not respond after retries.
+            DeadlineExceeded: If ``deadline`` passes first.
             SerialConnectionError: If the serial port is not open.
         """
         if not self.is_open or self._ser is None:
             raise SerialConnectionError("Serial port is not open")
 
         ser = self._ser
-        for attempt in range(1, self.retries + 1):
+        # Long responses (e.g. the 1636-byte all-data dump) take longer on
+        # the wire than the normal read timeout allows.
+        wire_time = response_length * BITS_PER_BYTE / self.baudrate
+        read_timeout = self.timeout + wire_time if wire_time > self.timeout else self.timeout
+        profiling = self.profiler is not None
+        start = time.perf_counter()
+        pacing = first_byte = reading = 0.0
+        attempt, ok = 0, False
+        with self._lock.hold(deadline=deadline):
+            current = self.timeout
+            try:
+                for attempt in range(1, self.retries + 1):
+                    _remaining(deadline, cmd)
+                    ser.reset_input_buffer()
+                    ser.reset_output_buffer()
+
+                    pacing += self._write_frame(ser, cmd)
+
+                    if response_length == 0:
+                        ok = True
+                        return None
+
+                    left = _remaining(deadline, cmd)
+                    wanted = read_timeout if left is None else min(read_timeout, left)
+                    if wanted != current:
+                        ser.timeout = current = wanted
+                    if profiling:
+                        data, waited, read = self._timed_read(ser, response_length, current)
+                        first_byte += waited
+                        reading += read
+                    else:
+                        data = ser.read(response_length)
+                    if len(data) == response_length:
+                        ok = True
+                        return data
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise DeadlineExceeded(
+                            f"Deadline passed with {len(data)} of {response_length} "
+                            f"bytes read (cmd=0x{cmd[-1]:02X})"
+                        )
+
+                    # Retry — wait a bit longer before next attempt
+                    if attempt < self.retries:
+                        left = _remaining(deadline, cmd)
+                        time.sleep(self.timeout if left is None else min(self.timeout, left))
+                        self._lock.yield_to_urgent()
+            finally:
+                if current != self.timeout:
+                    ser.timeout = self.timeout
+                if profiling:
+                    self._profile(
+                        cmd, response_length, start, pacing, first_byte, reading,
+                        max(attempt, 1), ok,
+                    )
+
+        raise CommandTimeoutError(
+            f"No response after {self.retries} attempts "
+            f"(cmd=0x{cmd[-1]:02X}, expected {response_length} bytes)"
+        )
+
+    def send_commands(self, cmds: Sequence[bytes], deadline: Optional[float] = None) -> None:
+        """Send several write-only 5-byte commands back to back.
+
+        The buffers are reset once and the frames are written as one paced
+        stream, rather than paying a full ``send_command`` round per frame.
+        With a ``deadline``, frames not started before it are not sent.
+
+        Raises:
+            DeadlineExceeded: If ``deadline`` passes before every frame
+                was sent.
+            SerialConnectionError: If the serial port is not open.
+        """
+        if not self.is_open or self._ser is None:
+            raise SerialConnectionError("Serial port is not open")
+
+        ser = self._ser
+        with self._lock.hold(deadline=deadline):
             ser.reset_input_buffer()
             ser.reset_output_buffer()
+            for cmd in cmds:
+                _remaining(deadline, cmd)
+                start = time.perf_counter()
+                pacing = self._write_frame(ser, cmd)
+                if self.profiler is not None:
+                    self._profile(cmd, 0, start, pacing)
+                self._lock.yield_to_urgent()
+
+    def send_commands_at(
+        self, cmds: Sequence[bytes], start: float, deadline: Optional[float] = None
+    ) -> tuple[float, float]:
+        """Write ``cmds`` back to back, beginning at ``start`` (a
+        ``time.perf_counter()`` value).
+
+        The port is taken ``LOCK_AHEAD`` seconds early, ahead of other
+        waiters.  Each byte (each frame, unpaced) is then written at its
+        planned instant from ``write_duration``'s schedule, the last
+        ``SPIN_MARGIN`` before it busy-waited, so sleep overshoot does not
+        add up along the batch.
 
-            # Write byte-by-byte with inter-byte delay
-            for b in cmd:
-                ser.write(bytes([b]))
-                time.sleep(INTER_BYTE_DELAY)
-            time.sleep(POST_COMMAND_DELAY)
+        Returns:
+            ``perf_counter()`` values for when the first byte was written
+            and when the last byte is expected at the radio.
 
-            if response_length == 0:
-                return None
+        Raises:
+            DeadlineExceeded: The port could not be had before ``deadline``.
+            SerialConnectionError: If the serial port is not open.
+        """
+        if not self.is_open or self._ser is None:
+            raise SerialConnectionError("Serial port is not open")
 
-            data = ser.read(response_length)
-            if len(data) == response_length:
-                return data
+        _wait_until(start - LOCK_AHEAD, spin=False)
+        ser = self._ser
+        with self._lock.hold(urgent=True, deadline=deadline):
+            ser.reset_input_buffer()
+            ser.reset_output_buffer()
+            due = start
+            began = done = 0.0
+            for cmd in cmds:
+                pacing = self.timing[cmd[-1]]
+                pieces = [cmd[i:i + 1] for i in range(len(cmd))] if self._paced else [cmd]
+                for piece in pieces:
+                    _wait_until(due)
+                    began = began or time.perf_counter()
+                    ser.write(piece)
+                    done = time.perf_counter()
+                    if self._paced:
+                        due += pacing.inter_byte
+                due += pacing.settle
+            _wait_until(due, spin=False)
+        tail = 1 if self._paced else len(cmds[-1])
+        return began, done + tail * BITS_PER_BYTE / self.baudrate
+
+    def send_urgent(self, cmd: bytes, deadline: Optional[float] = None) -> None:
+        """Send a write-only command ahead of all queued work (PTT).
+
+        Jumps the queue of threads waiting for the port, and writes the
+        whole frame in one call with no inter-byte pacing and no buffer
+        resets.
 
-            # Retry — wait a bit longer before next attempt
-            time.sleep(self.timeout)
+        Raises:
+            DeadlineExceeded: If the port is not free before ``deadline``.
+            SerialConnectionError: If the serial port is not open.
+        """
+        if not self.is_open or self._ser is None:
+            raise SerialConnectionError("Serial port is not open")
 
-        raise CommandTimeoutError(
-            f"No response after {self.retries} attempts "
-            f"(cmd=0x{cmd[-1]:02X}, expected {response_length} bytes)"
-        )
+        ser = self._ser
+        start = time.perf_counter()
+        with self._lock.hold(urgent=True, deadline=deadline):
+            ser.write(cmd)
+            ser.flush()
+        if self.profiler is not None:
+            self._profile(cmd, 0, start, 0.0)
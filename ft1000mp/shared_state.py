@@ -0,0 +1,307 @@
+"""Publish radio state to other processes through shared memory.
+
+Only one process can own the COM port.  That owner publishes the latest
+parsed VFO-A/B status and flags into a fixed-layout
+``multiprocessing.shared_memory`` block; loggers, band maps and
+audio-routing processes attach with ``FT1000MPStateReader`` and read it
+without locks or system calls.
+
+Consistency comes from a seqlock: the writer makes the sequence number
+odd, writes the payload, then makes it even again.  A reader copies the
+payload and retries if the sequence was odd or changed meanwhile.
+
+Block layout (little-endian)::
+
+    offset  size  field
+    0       4     magic  b"F1MP"
+    4       2     layout version
+    6       2     reserved
+    8       8     sequence number (even = stable)
+    16      4     owner PID
+    20      4     reserved
+    24      8     timestamp (time.time() of the sample, float64)
+    32      32    VFO-A: freq u32, clarifier i32, mode u8, bits u8,
+                  reserved u16, mode name 20 bytes ASCII
+    64      32    VFO-B: same as VFO-A
+    96      1     raw status flags byte
+    97      1     valid bits: 0x01 = VFO data, 0x02 = flags,
+                  0x04 = VFO labels and selection confident
+    98      1     selected VFO: 0 = unknown, 1 = A, 2 = B
+
+``update_from()`` labels the VFOs with ``FT1000MP.get_vfos()``, so
+VFO-A is VFO-A whichever one is selected.
+
+A block left behind by an owner that died is taken over by the next
+publisher; one whose owner is still running is not.
+"""
+
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Optional
+
+from .exceptions import FT1000MPError
+from .portlock import _alive
+from .transceiver import FT1000MP, RadioFlags, VFOStatus
+
+if TYPE_CHECKING:
+    from .tracking import VFOSnapshot
+
+DEFAULT_BLOCK_NAME = "ft1000mp_state"
+LAYOUT_VERSION = 3
+
+_MAGIC = b"F1MP"
+_HEADER = struct.Struct("<4sHHQI4x")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_VFO = "IiBBH20s"
+_PAYLOAD = struct.Struct("<d" + _VFO + _VFO + "BBB")
+_PAYLOAD_OFFSET = _HEADER.size
+BLOCK_SIZE = _PAYLOAD_OFFSET + _PAYLOAD.size
+
+_RIT, _XIT, _USER = 0x01, 0x02, 0x04
+_HAS_VFO, _HAS_FLAGS, _CONFIDENT = 0x01, 0x02, 0x04
+_SELECTED = {None: 0, "A": 1, "B": 2}
+_SELECTED_NAMES = {v: k for k, v in _SELECTED.items()}
+
+READ_RETRIES = 10_000   # bound on seqlock spins before giving up
+
+
+@dataclass
+class SharedState:
+    """One consistent sample read from the shared block."""
+    sequence: int
+    timestamp: float
+    vfo_a: Optional[VFOStatus]
+    vfo_b: Optional[VFOStatus]
+    flags: Optional[RadioFlags]
+    selected: Optional[str] = None     # "A", "B", or None if not known
+    confident: bool = False            # see ``VFOSnapshot.confident``
+
+
+def _pack_vfo(vfo: Optional[VFOStatus]) -> tuple:
+    if vfo is None:
+        return (0, 0, 0, 0, 0, b"")
+    bits = (_RIT if vfo.rit else 0) | (_XIT if vfo.xit else 0) | (_USER if vfo.user_mode else 0)
+    return (vfo.frequency_hz, vfo.clarifier_offset, vfo.mode, bits, 0,
+            vfo.mode_name.encode("ascii", "replace"))
+
+
+def _unpack_vfo(freq: int, clar: int, mode: int, bits: int, name: bytes) -> VFOStatus:
+    return VFOStatus(
+        frequency_hz=freq,
+        mode=mode,
+        mode_name=name.rstrip(b"\0").decode("ascii"),
+        clarifier_offset=clar,
+        rit=bool(bits & _RIT),
+        xit=bool(bits & _XIT),
+        user_mode=bool(bits & _USER),
+    )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    shm = shared_memory.SharedMemory(name=name)
+    if sys.platform != "win32":
+        # Before 3.13 every attaching process registers the block with its
+        # resource tracker, which would unlink it when the reader exits.
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _check_abandoned(name: str, shm: shared_memory.SharedMemory) -> None:
+    """Raise unless the existing block ``shm`` can be taken over."""
+    if shm.size < BLOCK_SIZE:
+        raise FT1000MPError(f"Shared block {name!r} is too small")
+    assert shm.buf is not None
+    magic, version, _, _, owner = _HEADER.unpack_from(shm.buf, 0)
+    if magic != _MAGIC or version != LAYOUT_VERSION:
+        raise FT1000MPError(f"Shared block {name!r} has an unknown layout")
+    # A Windows block only outlives its owner while readers keep it open,
+    # and the owner's PID cannot be probed without signalling it.
+    if owner and (sys.platform == "win32" or _alive(owner)):
+        raise FT1000MPError(f"Shared block {name!r} is owned by running process {owner}")
+
+
+class FT1000MPStatePublisher:
+    """Owner side: writes samples into the shared block."""
+
+    def __init__(self, name: str = DEFAULT_BLOCK_NAME):
+        """
+        Raises:
+            FT1000MPError: Another running process publishes to ``name``,
+                or the existing block cannot be taken over.
+        """
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=BLOCK_SIZE)
+        except FileExistsError:
+            # Left over from an owner that died; take it over.
+            self._shm = _attach(name)
+            try:
+                _check_abandoned(name, self._shm)
+            except FT1000MPError:
+                self._shm.close()
+                raise
+        self.name = name
+        buf = self._shm.buf
+        assert buf is not None
+        self._buf: memoryview = buf
+        # Continue a taken-over block's sequence so it never goes backwards
+        self._seq = (int(_SEQ.unpack_from(buf, _SEQ_OFFSET)[0]) + 1) & ~1
+        _HEADER.pack_into(buf, 0, _MAGIC, LAYOUT_VERSION, 0, self._seq, os.getpid())
+        self._vfo_a: Optional[VFOStatus] = None
+        self._vfo_b: Optional[VFOStatus] = None
+        self._flags: Optional[RadioFlags] = None
+        self._selected: Optional[str] = None
+        self._confident = False
+
+    def __enter__(self) -> "FT1000MPStatePublisher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def publish(
+        self,
+        vfo_a: Optional[VFOStatus] = None,
+        vfo_b: Optional[VFOStatus] = None,
+        flags: Optional[RadioFlags] = None,
+        timestamp: Optional[float] = None,
+        vfos: "Optional[VFOSnapshot]" = None,
+    ) -> int:
+        """Publish a sample; fields left as None keep their last value.
+
+        ``vfos`` (from ``get_vfos()``) sets both VFOs, the selected VFO
+        and whether the labels are confident in one go.
+
+        Returns:
+            The new (even) sequence number.
+        """
+        if vfos is not None:
+            vfo_a, vfo_b = vfos.a, vfos.b
+            self._selected, self._confident = vfos.selected, vfos.confident
+        if vfo_a is not None:
+            self._vfo_a = vfo_a
+        if vfo_b is not None:
+            self._vfo_b = vfo_b
+        if flags is not None:
+            self._flags = flags
+        valid = (
+            (_HAS_VFO if self._vfo_a is not None else 0)
+            | (_HAS_FLAGS if self._flags is not None else 0)
+            | (_CONFIDENT if self._confident else 0)
+        )
+        payload = _PAYLOAD.pack(
+            time.time() if timestamp is None else timestamp,
+            *_pack_vfo(self._vfo_a),
+            *_pack_vfo(self._vfo_b),
+            self._flags.raw if self._flags is not None else 0,
+            valid,
+            _SELECTED[self._selected],
+        )
+        buf = self._buf
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq + 1)   # odd: write in progress
+        buf[_PAYLOAD_OFFSET:_PAYLOAD_OFFSET + _PAYLOAD.size] = payload
+        self._seq += 2
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)       # even: stable
+        return self._seq
+
+    def update_from(self, radio: FT1000MP) -> int:
+        """Read both VFOs (labelled, see ``get_vfos()``) and the flags
+        from the radio and publish them."""
+        vfos = radio.get_vfos()
+        flags = radio.read_flags()
+        return self.publish(flags=flags, vfos=vfos)
+
+    def close(self, unlink: bool = True) -> None:
+        """Detach, and by default remove the block."""
+        self._buf = None  # type: ignore[assignment]
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FT1000MPStateReader:
+    """Reader side: lock-free, consistent snapshots of the shared block."""
+
+    def __init__(self, name: str = DEFAULT_BLOCK_NAME):
+        try:
+            self._shm = _attach(name)
+        except FileNotFoundError as exc:
+            raise FT1000MPError(f"No state block named {name!r} (is the owner running?)") from exc
+        buf = self._shm.buf
+        assert buf is not None
+        self._buf: memoryview = buf
+        magic, version, _, _, _ = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != LAYOUT_VERSION:
+            self._shm.close()
+            raise FT1000MPError(f"State block {name!r} has an unknown layout")
+        self.name = name
+
+    def __enter__(self) -> "FT1000MPStateReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number — cheap change detection between reads."""
+        return int(_SEQ.unpack_from(self._buf, _SEQ_OFFSET)[0])
+
+    def read(self) -> SharedState:
+        """Return the latest complete sample.
+
+        Raises:
+            FT1000MPError: The writer stayed mid-update for too long
+                (e.g. it died while writing).
+        """
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            before = _SEQ.unpack_from(buf, _SEQ_OFFSET)[0]
+            if before & 1:
+                continue
+            payload = bytes(buf[_PAYLOAD_OFFSET:_PAYLOAD_OFFSET + _PAYLOAD.size])
+            if _SEQ.unpack_from(buf, _SEQ_OFFSET)[0] == before:
+                break
+        else:
+            raise FT1000MPError(f"State block {self.name!r} is stuck mid-update")
+
+        fields = _PAYLOAD.unpack(payload)
+        timestamp = fields[0]
+        a, b = fields[1:7], fields[7:13]
+        flags_raw, valid, selected = fields[13], fields[14], fields[15]
+        has_vfo = bool(valid & _HAS_VFO)
+        return SharedState(
+            sequence=int(before),
+            timestamp=timestamp,
+            vfo_a=_unpack_vfo(a[0], a[1], a[2], a[3], a[5]) if has_vfo else None,
+            vfo_b=_unpack_vfo(b[0], b[1], b[2], b[3], b[5]) if has_vfo else None,
+            flags=RadioFlags.from_raw(flags_raw) if valid & _HAS_FLAGS else None,
+            selected=_SELECTED_NAMES.get(selected),
+            confident=bool(valid & _CONFIDENT),
+        )
+
+    def close(self) -> None:
+        self._buf = None  # type: ignore[assignment]
+        self._shm.close()
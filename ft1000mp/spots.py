@@ -0,0 +1,442 @@
+"""Follow DX-cluster and skimmer spots with the radio.
+
+``QSYEngine`` takes spots from a tailed cluster/skimmer log file, a local
+UDP feed (one or more cluster lines per datagram) or ``feed()``, filters
+them with ``SpotRule``s and tunes VFO-A to the best one.
+
+During a contest a skimmer can produce dozens of spots a second, far more
+than the radio can follow at 4800 baud with per-command pacing.  Spots
+therefore wait in a priority queue keyed by DX call rather than going
+straight to the port:
+
+* a new spot of a call replaces the queued one (superseded);
+* spots older than ``max_age`` when they reach the front are dropped
+  (stale);
+* a spot for the frequency and mode the radio was last tuned to is
+  skipped (duplicate);
+* the radio is retuned at most once per ``min_interval``, with frequency
+  and mode sent as one batch;
+* at most ``max_queued`` calls wait; past that the lowest-priority,
+  oldest spots are dropped.
+
+``stats()`` reports the counts, the tune rate and the spot-to-tune
+latency.
+"""
+
+import heapq
+import itertools
+import os
+import re
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Iterator, Optional, Sequence, Union
+
+from .transceiver import FT1000MP
+
+DEFAULT_MAX_AGE = 60.0           # seconds a spot stays worth tuning to
+DEFAULT_MIN_INTERVAL = 1.0       # seconds between retunes
+DEFAULT_MAX_QUEUED = 1000        # calls waiting to be tuned to
+TAIL_POLL_INTERVAL = 0.2
+UDP_POLL_INTERVAL = 0.2
+LATENCY_HISTORY = 1000
+
+# "DX de W3LPL-#:   14025.0  K1ABC   CW 23 dB 25 WPM CQ   1759Z"
+_SPOT_LINE = re.compile(
+    r"^DX de\s+(?P<spotter>[^:\s]+):?\s+(?P<khz>\d+(?:\.\d+)?)\s+(?P<call>\S+)"
+    r"\s*(?P<comment>.*?)\s*(?:\d{4}Z.*)?$",
+    re.IGNORECASE,
+)
+_SNR = re.compile(r"(-?\d+)\s*dB\b", re.IGNORECASE)
+
+# Comment keyword → radio mode; "SSB" picks the sideband by frequency.
+_COMMENT_MODES = {
+    "CW": "CW", "RTTY": "RTTY", "FT8": "USB", "FT4": "USB", "PSK31": "USB",
+    "PSK": "USB", "USB": "USB", "LSB": "LSB", "SSB": "SSB", "AM": "AM", "FM": "FM",
+}
+
+
+@dataclass
+class Spot:
+    """One spot, as parsed from a cluster line."""
+    frequency_hz: int
+    dx_call: str
+    spotter: str = ""
+    mode: Optional[str] = None      # radio mode name; None = let the band plan decide
+    snr_db: Optional[int] = None
+    comment: str = ""
+    received: float = field(default_factory=time.monotonic)
+
+
+def parse_spot(line: str, received: Optional[float] = None) -> Optional[Spot]:
+    """Parse a ``DX de ...`` cluster/skimmer line, or return None."""
+    match = _SPOT_LINE.match(line.strip())
+    if match is None:
+        return None
+    freq_hz = round(float(match["khz"]) * 1000)
+    comment = match["comment"]
+    mode = None
+    for word in comment.upper().split():
+        if word in _COMMENT_MODES:
+            mode = _COMMENT_MODES[word]
+            break
+    if mode == "SSB":
+        mode = "LSB" if freq_hz < 10_000_000 else "USB"
+    snr = _SNR.search(comment)
+    return Spot(
+        frequency_hz=freq_hz,
+        dx_call=match["call"].upper(),
+        spotter=match["spotter"].rstrip(":").upper(),
+        mode=mode,
+        snr_db=int(snr.group(1)) if snr else None,
+        comment=comment,
+        received=time.monotonic() if received is None else received,
+    )
+
+
+@dataclass
+class SpotRule:
+    """Which spots to follow, and how urgently.
+
+    Every given criterion must match.  ``bands`` are band-plan names
+    (``"20m"``), ``modes`` radio mode names and ``calls`` a regular
+    expression searched in the DX call.  A matching ``exclude`` rule
+    drops the spot.
+    """
+    priority: int = 0
+    bands: Optional[Collection[str]] = None
+    modes: Optional[Collection[str]] = None
+    calls: Optional[str] = None
+    min_snr_db: Optional[int] = None
+    exclude: bool = False
+
+    def matches(self, spot: Spot, band: Optional[str]) -> bool:
+        if self.bands is not None and band not in self.bands:
+            return False
+        if self.modes is not None and spot.mode not in self.modes:
+            return False
+        if self.calls is not None and not re.search(self.calls, spot.dx_call, re.IGNORECASE):
+            return False
+        if self.min_snr_db is not None and (spot.snr_db is None or spot.snr_db < self.min_snr_db):
+            return False
+        return True
+
+
+@dataclass
+class QSYStats:
+    """Counters since the engine started."""
+    received: int = 0
+    rejected: int = 0        # no rule matched, or an exclude rule did
+    superseded: int = 0      # replaced in the queue by a newer spot of the call
+    stale: int = 0
+    duplicate: int = 0       # already on that frequency and mode
+    tuned: int = 0
+    failed: int = 0
+    dropped: int = 0         # pushed out of a full queue
+    elapsed_s: float = 0.0
+    latency_min_s: float = 0.0
+    latency_avg_s: float = 0.0
+    latency_max_s: float = 0.0
+
+    @property
+    def tunes_per_s(self) -> float:
+        return self.tuned / self.elapsed_s if self.elapsed_s else 0.0
+
+
+# -- sources -----------------------------------------------------------------
+
+def tail_lines(
+    path: str, stop: threading.Event, interval: float = TAIL_POLL_INTERVAL
+) -> Iterator[str]:
+    """Yield lines appended to ``path`` until ``stop`` is set.
+
+    Starts at the current end of the file.  A truncated or replaced
+    (rotated) file is followed from its start.
+    """
+    f = None
+    inode = None
+    st: Optional[os.stat_result]
+    pending = ""
+    try:
+        while not stop.is_set():
+            if f is None:
+                try:
+                    f = open(path, encoding="utf-8", errors="replace")
+                except FileNotFoundError:
+                    stop.wait(interval)
+                    continue
+                st = os.fstat(f.fileno())
+                if inode is None:
+                    f.seek(0, os.SEEK_END)   # first open: only new spots
+                inode = st.st_ino
+            data = f.read()
+            if data:
+                pending += data
+                *lines, pending = pending.split("\n")
+                yield from lines
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if st is None or st.st_ino != inode or st.st_size < f.tell():
+                f.close()
+                f, pending = None, ""
+                if st is not None and st.st_ino == inode:
+                    inode = -1               # truncated in place: reopen from 0
+                continue
+            stop.wait(interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def udp_lines(
+    sock: socket.socket, stop: threading.Event, interval: float = UDP_POLL_INTERVAL
+) -> Iterator[str]:
+    """Yield the lines of each datagram received on ``sock`` until ``stop``."""
+    sock.settimeout(interval)
+    while not stop.is_set():
+        try:
+            data = sock.recv(65535)
+        except socket.timeout:
+            continue
+        except OSError:
+            if stop.is_set():
+                return               # socket closed by close()
+            raise
+        yield from data.decode("utf-8", errors="replace").splitlines()
+
+
+# -- engine ------------------------------------------------------------------
+
+class QSYEngine:
+    """Tune one radio to the best recent spot.
+
+    Example::
+
+        rules = [SpotRule(exclude=True, calls=r"/B$"),
+                 SpotRule(priority=10, bands={"20m", "15m"}, modes={"CW"})]
+        with QSYEngine(radio, rules) as engine:
+            engine.follow_file("/var/log/skimmer/spots.txt")
+            ...
+            print(engine.stats())
+    """
+
+    def __init__(
+        self,
+        radio: FT1000MP,
+        rules: Sequence[SpotRule] = (),
+        max_age: float = DEFAULT_MAX_AGE,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ):
+        """
+        Args:
+            radio: An open FT1000MP.
+            rules: Checked in order; the first match decides.  With no
+                rules every spot is followed at priority 0.
+            max_age: Drop spots older than this (seconds) instead of tuning.
+            min_interval: Shortest time between two retunes (seconds).
+            max_queued: Most calls kept waiting; see the module docstring.
+        """
+        if max_queued < 1:
+            raise ValueError(f"max_queued must be at least 1, got {max_queued}")
+        self.radio = radio
+        self.rules = list(rules)
+        self.max_age = max_age
+        self.min_interval = min_interval
+        self.max_queued = max_queued
+        self.latency: deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self.last_spot: Optional[Spot] = None
+        self.error: Optional[Exception] = None      # last tune or source failure
+        self._stats = QSYStats()
+        self._started = time.monotonic()
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, str]] = []
+        self._pending: dict[str, tuple[int, Spot]] = {}   # call → (seq, spot)
+        self._seq = itertools.count()
+        self._tuned_to: Optional[tuple[int, Optional[str]]] = None
+        self._next_tune = 0.0
+        self._stop = threading.Event()
+        self._sockets: list[socket.socket] = []
+        self._threads: list[threading.Thread] = []
+        self._worker = threading.Thread(target=self._run, name="ft1000mp-qsy", daemon=True)
+        self._worker.start()
+
+    # -- context manager ---------------------------------------------------
+
+    def __enter__(self) -> "QSYEngine":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the sources and the tuning thread; queued spots are dropped."""
+        self._stop.set()
+        for sock in self._sockets:
+            sock.close()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in (*self._threads, self._worker):
+            thread.join()
+
+    # -- input -------------------------------------------------------------
+
+    def priority(self, spot: Spot) -> Optional[int]:
+        """The priority ``spot`` is queued at, or None to reject it."""
+        if not self.rules:
+            return 0
+        band = self.radio.band_plan.band(spot.frequency_hz)
+        for rule in self.rules:
+            if rule.matches(spot, band):
+                return None if rule.exclude else rule.priority
+        return None
+
+    def feed(self, spot: Union[Spot, str]) -> bool:
+        """Offer a spot (or a cluster line) to the queue; thread-safe.
+
+        Returns:
+            True if it was queued.
+        """
+        if isinstance(spot, str):
+            parsed = parse_spot(spot)
+            if parsed is None:
+                return False
+            spot = parsed
+        priority = self.priority(spot)
+        with self._cond:
+            self._stats.received += 1
+            if priority is None:
+                self._stats.rejected += 1
+                return False
+            seq = next(self._seq)
+            if spot.dx_call in self._pending:
+                self._stats.superseded += 1
+            self._pending[spot.dx_call] = (seq, spot)
+            # Highest priority first, newest first within a priority.
+            heapq.heappush(self._heap, (-priority, -seq, spot.dx_call))
+            if len(self._heap) > 2 * self.max_queued:
+                self._compact()
+            self._cond.notify()
+        return True
+
+    def _compact(self) -> None:
+        """Drop superseded heap entries, then all but the best ``max_queued``."""
+        live = [
+            entry for entry in self._heap
+            if self._pending.get(entry[2], (None,))[0] == -entry[1]
+        ]
+        if len(live) > self.max_queued:
+            live.sort()
+            for _, _, call in live[self.max_queued:]:
+                del self._pending[call]
+            self._stats.dropped += len(live) - self.max_queued
+            del live[self.max_queued:]
+        heapq.heapify(live)
+        self._heap = live
+
+    def follow_file(self, path: str) -> None:
+        """Tail a cluster/skimmer log file in a background thread."""
+        self._start_source(lambda: tail_lines(path, self._stop), f"ft1000mp-spots-{path}")
+
+    def listen_udp(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """Receive cluster lines over UDP in a background thread.
+
+        Returns:
+            The bound address (useful with ``port=0``).
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        self._sockets.append(sock)
+        self._start_source(lambda: udp_lines(sock, self._stop), f"ft1000mp-spots-udp-{port}")
+        address: tuple[str, int] = sock.getsockname()
+        return address
+
+    def _start_source(self, lines: Callable[[], Iterator[str]], name: str) -> None:
+        def pump() -> None:
+            try:
+                for line in lines():
+                    self.feed(line)
+            except Exception as exc:     # unreadable file, socket error...
+                with self._cond:
+                    self.error = exc
+
+        thread = threading.Thread(target=pump, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    # -- tuning ------------------------------------------------------------
+
+    def _pop(self) -> Optional[Spot]:
+        """Wait for the next spot worth tuning to (None once stopped)."""
+        with self._cond:
+            while not self._stop.is_set():
+                wait = self._next_tune - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)        # let bursts coalesce meanwhile
+                    continue
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                _, neg_seq, call = heapq.heappop(self._heap)
+                seq, spot = self._pending.get(call, (None, None))
+                if seq != -neg_seq or spot is None:
+                    continue                     # superseded; already counted
+                del self._pending[call]
+                if time.monotonic() - spot.received > self.max_age:
+                    self._stats.stale += 1
+                    continue
+                if self._tuned_to == (spot.frequency_hz, spot.mode):
+                    self._stats.duplicate += 1
+                    continue
+                return spot
+        return None
+
+    def _tune(self, spot: Spot) -> None:
+        if spot.mode is None:
+            self.radio.set_frequency_a(spot.frequency_hz, auto_mode=True)
+        else:
+            with self.radio.batch():
+                self.radio.set_frequency_a(spot.frequency_hz)
+                self.radio.set_mode(spot.mode)
+
+    def _run(self) -> None:
+        while True:
+            spot = self._pop()
+            if spot is None:
+                return
+            try:
+                self._tune(spot)
+            except Exception as exc:     # keep following spots
+                with self._cond:
+                    self._stats.failed += 1
+                    self.error = exc
+                continue
+            now = time.monotonic()
+            self.latency.append(now - spot.received)
+            with self._cond:
+                self._stats.tuned += 1
+                self._tuned_to = (spot.frequency_hz, spot.mode)
+                self._next_tune = now + self.min_interval
+                self.last_spot = spot
+
+    def stats(self) -> QSYStats:
+        """A snapshot of the counters and spot-to-tune latency."""
+        with self._cond:
+            values = list(self.latency)
+            stats = QSYStats(**vars(self._stats))
+        stats.elapsed_s = time.monotonic() - self._started
+        if values:
+            stats.latency_min_s = min(values)
+            stats.latency_avg_s = sum(values) / len(values)
+            stats.latency_max_s = max(values)
+        return stats
@@ -0,0 +1,209 @@
+"""Last known radio state, fed by CAT reads and by other programs.
+
+Every status read through ``FT1000MP`` lands in ``radio.state``, a
+``StateCache`` of named fields, each stamped with when and from which
+source it was observed.  Other sources (e.g. ``wsjtx.WSJTXListener``)
+write the same fields, so a reader can use whichever is freshest.
+
+``StatePoller`` keeps the cache fresh by polling the radio.  While
+another source has updated the cache recently it polls only every
+``verify_interval`` instead of every ``interval``, and counts the
+verifications where the radio disagreed with that source.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .exceptions import FT1000MPError
+
+CAT = "cat"                      # read from the radio over the serial port
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_VERIFY_INTERVAL = 15.0
+DEFAULT_EXTERNAL_TIMEOUT = 30.0  # an outside source is "active" for this long
+FREQUENCY_TOLERANCE_HZ = 10
+
+
+@dataclass(frozen=True)
+class Observation:
+    """One field value, with when (``time.monotonic()``) and where it came from."""
+    value: Any
+    timestamp: float
+    source: str
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.timestamp
+
+
+class StateCache:
+    """Thread-safe map of field name → latest ``Observation``.
+
+    Fields written by ``FT1000MP``:
+
+    ``frequency_hz``, ``mode_name``
+        The active VFO.
+    ``active_vfo``, ``inactive_vfo``
+        ``VFOStatus`` objects from status reads.
+    ``vfo_a``, ``vfo_b``, ``selected_vfo``
+        From ``get_vfos()``.
+    ``flags``, ``transmitting``, ``split``
+        From ``read_flags()``.
+    ``meter``, ``sub_meter``
+        From ``read_meter()``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fields: dict[str, Observation] = {}
+        self._sources: dict[str, float] = {}
+
+    def update(self, source: str, timestamp: Optional[float] = None, **values: Any) -> None:
+        """Record ``values`` as observed from ``source`` (now, by default)."""
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            for name, value in values.items():
+                self._fields[name] = Observation(value, now, source)
+            self._sources[source] = max(now, self._sources.get(source, now))
+
+    def observation(self, name: str) -> Optional[Observation]:
+        with self._lock:
+            return self._fields.get(name)
+
+    def get(self, name: str, max_age: Optional[float] = None, default: Any = None) -> Any:
+        """The latest value of ``name``, or ``default`` if unknown or too old."""
+        obs = self.observation(name)
+        if obs is None or (max_age is not None and obs.age > max_age):
+            return default
+        return obs.value
+
+    def last_update(self, source: str) -> Optional[float]:
+        """When ``source`` last wrote anything (``time.monotonic()``), or None."""
+        with self._lock:
+            return self._sources.get(source)
+
+    def external_age(self) -> Optional[float]:
+        """Seconds since any source other than CAT wrote, or None if never."""
+        with self._lock:
+            times = [t for source, t in self._sources.items() if source != CAT]
+        return time.monotonic() - max(times) if times else None
+
+    def discard(self, *names: str) -> None:
+        """Forget fields that are known to be out of date."""
+        with self._lock:
+            for name in names:
+                self._fields.pop(name, None)
+
+    def forget_source(self, source: str) -> None:
+        """Stop counting ``source`` as active (e.g. the program exited)."""
+        with self._lock:
+            self._sources.pop(source, None)
+
+    def snapshot(self) -> dict[str, Observation]:
+        with self._lock:
+            return dict(self._fields)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fields.clear()
+            self._sources.clear()
+
+
+class StatePoller:
+    """Poll a radio into ``radio.state``, backing off while another source is active.
+
+    Example::
+
+        with WSJTXListener(radio.state), StatePoller(radio) as poller:
+            ...
+            print(radio.state.get("frequency_hz"), poller.mismatches)
+    """
+
+    def __init__(
+        self,
+        radio: Any,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        verify_interval: float = DEFAULT_VERIFY_INTERVAL,
+        external_timeout: float = DEFAULT_EXTERNAL_TIMEOUT,
+        on_mismatch: Optional[Callable[[Observation, int], None]] = None,
+    ):
+        """
+        Args:
+            radio: An open FT1000MP.
+            interval: Poll period while nothing else feeds the cache.
+            verify_interval: Poll period while another source is active.
+            external_timeout: A source counts as active until it has been
+                silent this long.
+            on_mismatch: Called from the poller thread with the outside
+                observation of ``frequency_hz`` and the frequency the radio
+                reported, when they differ.
+        """
+        self.radio = radio
+        self.interval = interval
+        self.verify_interval = verify_interval
+        self.external_timeout = external_timeout
+        self.on_mismatch = on_mismatch
+        self.polls = 0
+        self.verifications = 0
+        self.mismatches = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ft1000mp-poller", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "StatePoller":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def external_active(self) -> bool:
+        age = self.radio.state.external_age()
+        return age is not None and age < self.external_timeout
+
+    @property
+    def current_interval(self) -> float:
+        return self.verify_interval if self.external_active else self.interval
+
+    def poll(self) -> None:
+        """Read flags and the active VFO once, checking any outside frequency."""
+        outside = self.radio.state.observation("frequency_hz")
+        if outside is not None and outside.source == CAT:
+            outside = None
+        verifying = self.external_active
+        self.radio.read_flags()
+        status = self.radio.get_vfo_status()
+        self.polls += 1
+        if verifying:
+            self.verifications += 1
+        if outside is not None and abs(outside.value - status.frequency_hz) > FREQUENCY_TOLERANCE_HZ:
+            self.mismatches += 1
+            if self.on_mismatch is not None:
+                self.on_mismatch(outside, status.frequency_hz)
+
+    def _run(self) -> None:
+        last = float("-inf")
+        while not self._stop.is_set():
+            due = last + self.current_interval
+            now = time.monotonic()
+            if now < due:
+                # Wake at least every second: a source going quiet shortens the period.
+                self._stop.wait(min(due - now, 1.0))
+                continue
+            last = now
+            try:
+                self.poll()
+            except FT1000MPError:
+                self.errors += 1
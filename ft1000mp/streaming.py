@@ -0,0 +1,129 @@
+"""Periodic status samples, for ``for`` and ``async for`` loops.
+
+``FT1000MP.stream()`` returns a ``StatusStream``.  Only the requested
+fields are read, with the cheapest command that covers them:
+
+=========  ==========================  =====================
+Field      Command                     Response
+=========  ==========================  =====================
+``flags``  READ_FLAGS                  5 bytes
+``vfo``    STATUS_UPDATE (operating)   16 bytes, active VFO
+``vfos``   STATUS_UPDATE (VFO data)    32 bytes, A and B
+=========  ==========================  =====================
+
+(``vfo`` and ``vfos`` together cost one 32-byte read.)
+
+The stream is pull-based: the radio is read only when the consumer asks
+for the next sample, at the next free slot of the ``interval`` grid.  A
+consumer that falls behind skips the slots it missed — visible as gaps
+in ``StatusSample.seq`` and in ``StatusStream.skipped`` — instead of
+samples piling up in a queue.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, Optional
+
+from .transceiver import _deadline, _left
+
+if TYPE_CHECKING:
+    from .tracking import VFOSnapshot
+    from .transceiver import FT1000MP, RadioFlags, VFOStatus
+
+FLAGS, VFO, VFOS = "flags", "vfo", "vfos"
+FIELDS = (FLAGS, VFO, VFOS)
+
+
+@dataclass
+class StatusSample:
+    """One reading of the requested fields."""
+    seq: int                    # slot number on the interval grid
+    timestamp: float            # time.time() when the reads finished
+    flags: "Optional[RadioFlags]" = None
+    vfo: "Optional[VFOStatus]" = None          # the active VFO
+    vfos: "Optional[VFOSnapshot]" = None       # labelled; see get_vfos(probe=False)
+
+
+class StatusStream:
+    """Iterable and async-iterable sample stream; see the module docstring."""
+
+    def __init__(
+        self,
+        radio: "FT1000MP",
+        interval: float,
+        fields: Iterable[str] = (VFO,),
+        count: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            radio: An open FT1000MP.
+            interval: Seconds between sample slots.
+            fields: Any of ``"flags"``, ``"vfo"``, ``"vfos"``.
+            count: Stop after this many samples (None = never).
+            timeout: Per-sample bound on the reads (see ``Deadlines``).
+
+        Raises:
+            ValueError: Unknown field, no fields, or a non-positive interval.
+        """
+        self.fields = frozenset(fields)
+        unknown = self.fields - set(FIELDS)
+        if unknown or not self.fields:
+            raise ValueError(f"fields must be a non-empty subset of {FIELDS}, got {sorted(fields)}")
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.radio = radio
+        self.interval = interval
+        self.count = count
+        self.timeout = timeout
+        self.samples = 0
+        self.skipped = 0
+        self._slot = 0
+        self._t0: Optional[float] = None
+
+    def _wait(self) -> float:
+        """Seconds until the next slot, skipping any already missed."""
+        now = time.monotonic()
+        if self._t0 is None:
+            self._t0 = now
+        due = self._t0 + self._slot * self.interval
+        if now > due + self.interval:
+            missed = int((now - due) / self.interval)
+            self._slot += missed
+            self.skipped += missed
+            due += missed * self.interval
+        return max(0.0, due - now)
+
+    def _read(self) -> StatusSample:
+        radio = self.radio
+        deadline = _deadline(self.timeout)      # one bound for all of the sample's reads
+        sample = StatusSample(seq=self._slot, timestamp=0.0)
+        if FLAGS in self.fields:
+            sample.flags = radio.read_flags(_left(deadline))
+        if VFOS in self.fields:
+            sample.vfos = radio.get_vfos(probe=False, timeout=_left(deadline))
+            if VFO in self.fields:
+                sample.vfo = sample.vfos.active
+        elif VFO in self.fields:
+            sample.vfo = radio.get_vfo_status(timeout=_left(deadline))
+        sample.timestamp = time.time()
+        self._slot += 1
+        self.samples += 1
+        return sample
+
+    def _done(self) -> bool:
+        return self.count is not None and self.samples >= self.count
+
+    def __iter__(self) -> Iterator[StatusSample]:
+        while not self._done():
+            time.sleep(self._wait())
+            yield self._read()
+
+    async def _agen(self) -> AsyncIterator[StatusSample]:
+        while not self._done():
+            await asyncio.sleep(self._wait())
+            yield await asyncio.to_thread(self._read)
+
+    def __aiter__(self) -> AsyncIterator[StatusSample]:
+        return self._agen()
@@ -0,0 +1,247 @@
+"""Per-opcode pacing: how long to wait between bytes and after each command.
+
+The FT-1000MP needs very different settle times depending on the command:
+almost none after READ_FLAGS or a STATUS_UPDATE (reading the reply is the
+wait), much more after SET_FREQ_A or RECALL_MEMORY.  A ``TimingTable``
+holds an ``OpcodeTiming`` per opcode, falling back to a default for the
+rest; ``SerialPort`` looks each frame's opcode up in it.
+
+``calibrate()`` measures the table against the radio: for each opcode it
+walks a ladder of settle times downwards, and at each step sends the
+command followed immediately by a READ_FLAGS that must be answered on the
+first try.  The shortest settle that passes every trial, times
+``SAFETY_FACTOR``, goes into the table.
+
+Profiles are kept in the disk cache per port (``save_profile``) and
+applied automatically by ``SerialPort.open()``, or can be written to and
+read from any file with ``TimingTable.save``/``load``.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .serial_port import SerialPort
+
+SETTLE_CANDIDATES = (0.1, 0.05, 0.03, 0.02, 0.01, 0.005, 0.002, 0.0)
+SAFETY_FACTOR = 1.5
+RECOVERY_TIME = 0.3          # pause after a failed trial so the radio catches up
+PROFILE_CACHE = "timing"
+
+
+@dataclass(frozen=True)
+class OpcodeTiming:
+    """Pacing for one opcode, in seconds."""
+    inter_byte: float
+    settle: float            # after the frame, before anything else is sent
+
+
+class TimingTable:
+    """Opcode → ``OpcodeTiming``, with a default for unlisted opcodes."""
+
+    def __init__(
+        self,
+        default: OpcodeTiming,
+        per_opcode: Optional[Mapping[int, OpcodeTiming]] = None,
+    ):
+        self.default = default
+        self.per_opcode: dict[int, OpcodeTiming] = dict(per_opcode or {})
+
+    def __getitem__(self, opcode: int) -> OpcodeTiming:
+        return self.per_opcode.get(opcode, self.default)
+
+    def __setitem__(self, opcode: int, timing: OpcodeTiming) -> None:
+        self.per_opcode[opcode] = timing
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, TimingTable)
+            and self.default == other.default
+            and self.per_opcode == other.per_opcode
+        )
+
+    def copy(self) -> "TimingTable":
+        return TimingTable(self.default, self.per_opcode)
+
+    # -- persistence -------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        from .profiler import opcode_name
+
+        return {
+            "default": vars(self.default).copy(),
+            "opcodes": {
+                f"0x{op:02X}": {"name": opcode_name(op), **vars(t)}
+                for op, t in sorted(self.per_opcode.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "TimingTable":
+        """Build a table from ``to_dict()`` output.
+
+        Raises:
+            ValueError: The data is malformed.
+        """
+        try:
+            default = OpcodeTiming(
+                float(data["default"]["inter_byte"]), float(data["default"]["settle"]),
+            )
+            per_opcode = {
+                int(op, 16): OpcodeTiming(float(t["inter_byte"]), float(t["settle"]))
+                for op, t in data.get("opcodes", {}).items()
+            }
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Bad timing profile: {exc}") from exc
+        return cls(default, per_opcode)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "TimingTable":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def save_profile(port: str, table: TimingTable) -> None:
+    """Remember ``table`` for ``port``; ``SerialPort.open()`` applies it."""
+    from . import cache
+
+    cache.save(cache.cache_key(PROFILE_CACHE, port), table.to_dict())
+
+
+def load_profile(port: str) -> Optional[TimingTable]:
+    """The saved table for ``port``, or None if there is none (or it is bad)."""
+    from . import cache
+
+    data = cache.load(cache.cache_key(PROFILE_CACHE, port))
+    if data is None:
+        return None
+    try:
+        return TimingTable.from_dict(data)
+    except ValueError:
+        return None
+
+
+# -- calibration -----------------------------------------------------------
+
+def calibration_frames(sp: "SerialPort") -> dict[int, tuple[bytes, int]]:
+    """Harmless frames to calibrate with: queries, and setters that write
+    back the radio's current state.
+
+    VFO-A and VFO-B are taken from the all-data dump, the one response
+    where their order does not depend on which VFO is selected.
+
+    Returns:
+        opcode → (frame, response length).
+    """
+    from .protocol import (
+        ALL_DATA_HEADER_LENGTH,
+        METER_RESPONSE_LENGTH,
+        MODE_NAMES,
+        STATUS_BLOCK_LENGTH,
+        STATUS_RESPONSE_LENGTHS,
+        Opcode,
+        StatusFlag,
+        StatusTarget,
+        cmd_read_flags,
+        cmd_read_meter,
+        cmd_set_freq_a,
+        cmd_set_freq_b,
+        cmd_set_mode,
+        cmd_split,
+        cmd_status_update,
+    )
+    from .transceiver import _parse_vfo_block
+
+    dump = sp.send_command(
+        cmd_status_update(StatusTarget.ALL_DATA),
+        STATUS_RESPONSE_LENGTHS[StatusTarget.ALL_DATA],
+    )
+    flags = sp.send_command(cmd_read_flags(), 5)
+    assert dump is not None and flags is not None
+    a_start = ALL_DATA_HEADER_LENGTH
+    b_start = a_start + STATUS_BLOCK_LENGTH
+    vfo_a = _parse_vfo_block(dump[a_start:b_start])
+    vfo_b = _parse_vfo_block(dump[b_start:b_start + STATUS_BLOCK_LENGTH])
+
+    frames: dict[int, tuple[bytes, int]] = {
+        Opcode.READ_FLAGS: (cmd_read_flags(), 5),
+        Opcode.READ_METER: (cmd_read_meter(), METER_RESPONSE_LENGTH),
+        Opcode.STATUS_UPDATE: (
+            cmd_status_update(StatusTarget.VFO_DATA),
+            STATUS_RESPONSE_LENGTHS[StatusTarget.VFO_DATA],
+        ),
+        Opcode.SPLIT: (cmd_split(bool(flags[0] & StatusFlag.SPLIT)), 0),
+    }
+    if vfo_a.frequency_hz:
+        frames[Opcode.SET_FREQ_A] = (cmd_set_freq_a(vfo_a.frequency_hz), 0)
+        # Only if writing the mode back reproduces it exactly: SET_MODE
+        # cannot express sub-modes (CW-R, SAM, ...) or USER modes.
+        if vfo_a.mode_name == MODE_NAMES.get(vfo_a.mode):
+            frames[Opcode.SET_MODE] = (cmd_set_mode(vfo_a.mode), 0)
+    if vfo_b.frequency_hz:
+        frames[Opcode.SET_FREQ_B] = (cmd_set_freq_b(vfo_b.frequency_hz), 0)
+    return frames
+
+
+def _trial(sp: "SerialPort", frame: bytes, response_length: int, check: bytes) -> bool:
+    from .exceptions import CommandTimeoutError
+
+    try:
+        sp.send_command(frame, response_length)
+        return sp.send_command(check, 5) is not None
+    except CommandTimeoutError:
+        time.sleep(RECOVERY_TIME)
+        return False
+
+
+def calibrate(
+    sp: "SerialPort",
+    frames: Optional[Mapping[int, tuple[bytes, int]]] = None,
+    trials: int = 5,
+    candidates: Sequence[float] = SETTLE_CANDIDATES,
+) -> TimingTable:
+    """Measure the shortest safe settle time per opcode.
+
+    Args:
+        sp: An open port with the radio behind it.
+        frames: opcode → (frame, response length) to test with
+            (default: ``calibration_frames(sp)``).
+        trials: Consecutive successes needed at each settle time.
+        candidates: Settle times to try, longest first.
+
+    Returns:
+        A copy of ``sp.timing`` with the calibrated opcodes filled in.
+        Opcodes that fail even at the longest candidate keep their
+        current timing.  ``sp`` itself is left unchanged.
+    """
+    from .protocol import cmd_read_flags
+
+    if frames is None:
+        frames = calibration_frames(sp)
+    check = cmd_read_flags()
+    original, retries = sp.timing, sp.retries
+    result = original.copy()
+    try:
+        sp.retries = 1
+        for opcode, (frame, response_length) in frames.items():
+            inter_byte = original[opcode].inter_byte
+            best: Optional[float] = None
+            for settle in sorted(candidates, reverse=True):
+                trial_table = original.copy()
+                trial_table[opcode] = OpcodeTiming(inter_byte, settle)
+                sp.timing = trial_table
+                if all(_trial(sp, frame, response_length, check) for _ in range(trials)):
+                    best = settle
+                else:
+                    break
+            if best is not None:
+                result[opcode] = OpcodeTiming(inter_byte, best * SAFETY_FACTOR)
+    finally:
+        sp.timing, sp.retries = original, retries
+    return result
@@ -0,0 +1,121 @@
+"""Which VFO is selected, without asking the radio every time.
+
+The 32-byte VFO_DATA response is ordered (active, inactive), and the
+VFO-B bit of the flags byte cannot be trusted, so labelling the two
+blocks as A and B normally takes extra reads.  ``VFOTracker`` instead
+keeps what this program already knows:
+
+* the VFO last chosen with ``select_vfo``;
+* the frequency last written to, or read back from, each VFO.
+
+Each (active, inactive) sample is scored against both hypotheses ("A is
+selected" / "B is selected").  The inactive VFO's frequency is the
+strong evidence: nothing but our own commands moves it, whereas the
+active one follows the tuning knob.  A hypothesis that matches clearly
+better than the other, or the tracked selection when the frequencies
+cannot tell, is taken with confidence; otherwise the sample is
+ambiguous and ``FT1000MP.get_vfos()`` probes with the all-data dump,
+whose VFO-A/VFO-B order is fixed.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .transceiver import VFOStatus
+
+INACTIVE_WEIGHT = 2      # inactive VFO matches / contradicts its known frequency
+ACTIVE_WEIGHT = 1        # active VFO matches its known frequency (no penalty: the knob)
+PRIOR_WEIGHT = 1         # the selection we tracked from select_vfo()
+
+
+@dataclass
+class VFOSnapshot:
+    """Both VFOs, labelled, from one status read."""
+    a: "VFOStatus"
+    b: "VFOStatus"
+    selected: Optional[str]     # "A", "B", or None if it could not be told
+    confident: bool             # False: labels are a best guess (``selected`` may be None)
+    probed: bool = False        # True: the all-data dump was read to decide
+
+    @property
+    def active(self) -> "VFOStatus":
+        return self.b if self.selected == "B" else self.a
+
+
+def _other(vfo: str) -> str:
+    return "B" if vfo == "A" else "A"
+
+
+class VFOTracker:
+    """Selected VFO and last known frequency of each, updated as commands go out."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.selected: Optional[str] = None
+        self.frequency: dict[str, Optional[int]] = {"A": None, "B": None}
+
+    # -- what this program did ---------------------------------------------
+
+    def selected_vfo(self, vfo: str) -> None:
+        with self._lock:
+            self.selected = vfo
+
+    def tuned(self, vfo: str, freq_hz: Optional[int]) -> None:
+        with self._lock:
+            self.frequency[vfo] = freq_hz
+
+    def copied_a_to_b(self) -> None:
+        with self._lock:
+            self.frequency["B"] = self.frequency["A"]
+
+    def active_unknown(self) -> None:
+        """The active VFO was overwritten (e.g. memory → VFO)."""
+        with self._lock:
+            if self.selected is None:
+                self.frequency = {"A": None, "B": None}
+            else:
+                self.frequency[self.selected] = None
+
+    def forget(self) -> None:
+        with self._lock:
+            self.selected = None
+            self.frequency = {"A": None, "B": None}
+
+    # -- what the radio said -----------------------------------------------
+
+    def _score(self, vfo: str, active_hz: int, inactive_hz: int) -> int:
+        score = PRIOR_WEIGHT if self.selected == vfo else 0
+        known_active = self.frequency[vfo]
+        known_inactive = self.frequency[_other(vfo)]
+        if known_inactive is not None:
+            score += INACTIVE_WEIGHT if known_inactive == inactive_hz else -INACTIVE_WEIGHT
+        if known_active is not None and known_active == active_hz:
+            score += ACTIVE_WEIGHT
+        return score
+
+    def resolve(self, active: "VFOStatus", inactive: "VFOStatus") -> Optional[str]:
+        """The selected VFO for this sample, or None if it is ambiguous.
+
+        On success the tracked state is updated from the sample.
+        """
+        with self._lock:
+            score_a = self._score("A", active.frequency_hz, inactive.frequency_hz)
+            score_b = self._score("B", active.frequency_hz, inactive.frequency_hz)
+            if score_a == score_b:
+                return None
+            selected = "A" if score_a > score_b else "B"
+            self._learn(selected, active, inactive)
+            return selected
+
+    def confirm(self, selected: Optional[str], a: "VFOStatus", b: "VFOStatus") -> None:
+        """Record a probed result."""
+        with self._lock:
+            self.selected = selected
+            self.frequency = {"A": a.frequency_hz, "B": b.frequency_hz}
+
+    def _learn(self, selected: str, active: "VFOStatus", inactive: "VFOStatus") -> None:
+        self.selected = selected
+        self.frequency[selected] = active.frequency_hz
+        self.frequency[_other(selected)] = inactive.frequency_hz
@@ -13,21 +13,35 @@ Status-update response layout (16 bytes per VFO, from Hamlib):
   Bytes 10-15 : additional data
 """
 
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from . import cache
 from .bcd import bytes_to_freq
 from .exceptions import InvalidFrequencyError, InvalidModeError
 from .protocol import (
+    ALL_DATA_FIRST_MEMORY_BLOCK,
+    ALL_DATA_HEADER_LENGTH,
+    MEMORY_CHANNELS,
+    METER_RESPONSE_LENGTH,
     MODE_BY_NAME,
     MODE_NAMES,
+    STATUS_BLOCK_LENGTH,
+    STATUS_RESPONSE_LENGTHS,
     SUB_MODE_NAMES,
     Mode,
     StatusFlag,
+    StatusTarget,
     VFO,
     cmd_clarifier,
     cmd_clarifier_offset,
     cmd_memory_to_vfo,
     cmd_ptt,
     cmd_read_flags,
+    cmd_read_meter,
     cmd_recall_memory,
     cmd_select_vfo,
     cmd_set_freq_a,
@@ -39,10 +53,30 @@ from .protocol import (
     cmd_vfo_to_memory,
 )
 from .serial_port import DEFAULT_PORT, SerialPort
+from .state import CAT, StateCache
+from .tracking import VFOSnapshot, VFOTracker
+
+if TYPE_CHECKING:
+    from .bandplan import BandPlan
+    from .metering import MeterSampler
+    from .portlock import LockHolder
+    from .schedule import CommandScheduler, Landing
+    from .profiler import WireProfiler
+    from .streaming import StatusStream
+    from .reconnect import Outage, ReconnectPolicy
+    from .timing import TimingTable
+    from .transport import Transport
 
 # Frequency limits for the FT-1000MP
 FREQ_MIN_HZ = 100_000       # 100 kHz
 FREQ_MAX_HZ = 30_000_000    # 30 MHz — original FT-1000MP and Mark V
+FREQ_STEP_HZ = 10           # resolution of the SET frequency commands
+CLARIFIER_MAX_HZ = 9_999
+
+# restore() trusts cached state this young (seconds).  The cache only sees
+# changes made through this driver, so it must stay short enough that a
+# knob turned meanwhile is unlikely.
+RESTORE_MAX_AGE = 1.0
 
 
 @dataclass
@@ -67,8 +101,63 @@ class RadioFlags:
     priority: bool
     raw: int
 
+    @classmethod
+    def from_raw(cls, raw: int) -> "RadioFlags":
+        """Decode the first byte of a READ_FLAGS response."""
+        return cls(
+            split=bool(raw & StatusFlag.SPLIT),
+            clarifier=bool(raw & StatusFlag.CLARIFIER),
+            vfo_b_selected=bool(raw & StatusFlag.VFO_B),
+            transmitting=bool(raw & StatusFlag.TRANSMITTING),
+            priority=bool(raw & StatusFlag.PRIORITY),
+            raw=raw,
+        )
+
+
+@dataclass
+class MemoryDump:
+    """All memory channels read in one all-data transaction."""
+    channels: dict[int, VFOStatus]
+    timestamp: float
+    from_cache: bool = False
+
+
+@dataclass
+class SweepResult:
+    """What a ``glide()`` or ``sweep_clarifier()`` actually did."""
+    steps_sent: int
+    steps_dropped: int      # intermediate steps skipped to keep to the rate
+    elapsed: float
+    achieved_rate: float    # updates per second
+
+    @property
+    def steps_total(self) -> int:
+        return self.steps_sent + self.steps_dropped
+
 
-def _parse_vfo_block(data: bytes) -> VFOStatus:
+@dataclass
+class RadioSnapshot:
+    """What ``restore()`` puts back: both VFOs, split and the clarifier."""
+    vfo_a: VFOStatus
+    vfo_b: VFOStatus
+    split: bool
+    selected: "str | None"      # VFO whose clarifier settings are restored
+    timestamp: float            # time.time() when taken
+
+
+def _parse_memory_channels(data: bytes) -> dict[int, VFOStatus]:
+    """Parse memory channels 1-99 out of a 1636-byte all-data response."""
+    view = memoryview(data)
+    channels = {}
+    for ch in range(1, MEMORY_CHANNELS + 1):
+        start = ALL_DATA_HEADER_LENGTH + STATUS_BLOCK_LENGTH * (
+            ALL_DATA_FIRST_MEMORY_BLOCK + ch - 1
+        )
+        channels[ch] = _parse_vfo_block(view[start:start + STATUS_BLOCK_LENGTH])
+    return channels
+
+
+def _parse_vfo_block(data: "bytes | memoryview") -> VFOStatus:
     """Parse a single 16-byte VFO status block."""
     # Frequency: bytes 1-4, big-endian binary, *10/16 scaling
     freq_hz = bytes_to_freq(data[1:5])
@@ -108,21 +197,113 @@ def _parse_vfo_block(data: bytes) -> VFOStatus:
     )
 
 
+def _deadline(timeout: "float | None") -> "float | None":
+    """Turn a per-call timeout in seconds into a monotonic deadline."""
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def _left(deadline: "float | None") -> "float | None":
+    """The timeout left until ``deadline``, for the next call in a sequence."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+# Cache fields a setter may have made wrong; dropped on every write.
+_WRITE_INVALIDATES = (
+    "active_vfo", "inactive_vfo", "vfo_a", "vfo_b", "frequency_hz", "mode_name",
+    "split", "flags",
+)
+
+
+_MISSING = object()
+
+
+def _restore_frames(target: RadioSnapshot, current: "RadioSnapshot | None") -> list[bytes]:
+    """Frames that turn ``current`` into ``target`` (all of them if None)."""
+    frames = []
+    for vfo_b, want, have in (
+        (False, target.vfo_a, None if current is None else current.vfo_a),
+        (True, target.vfo_b, None if current is None else current.vfo_b),
+    ):
+        if have is None or have.frequency_hz != want.frequency_hz:
+            frames.append((cmd_set_freq_b if vfo_b else cmd_set_freq_a)(want.frequency_hz))
+        # SET_MODE sets base modes only; sub-modes (CW-R, SAM...) and USER
+        # modes cannot be put back and are left as they are.
+        reproducible = want.mode_name == MODE_NAMES.get(want.mode)
+        if reproducible and (have is None or have.mode_name != want.mode_name):
+            frames.append(cmd_set_mode(want.mode, vfo_b=vfo_b))
+    if current is None or current.split != target.split:
+        frames.append(cmd_split(target.split))
+    if target.selected is not None and (current is None or current.selected == target.selected):
+        want = target.vfo_b if target.selected == "B" else target.vfo_a
+        have = None
+        if current is not None:
+            have = current.vfo_b if current.selected == "B" else current.vfo_a
+        if have is None or abs(have.clarifier_offset - want.clarifier_offset) >= FREQ_STEP_HZ:
+            frames.append(cmd_clarifier_offset(want.clarifier_offset))
+        if have is None or have.rit != want.rit:
+            frames.append(cmd_clarifier(want.rit))
+    return frames
+
+
 class FT1000MP:
-    """High-level interface to the Yaesu FT-1000MP transceiver."""
+    """High-level interface to the Yaesu FT-1000MP transceiver.
+
+    Every radio command takes an optional ``timeout`` in seconds bounding
+    the whole call, retries included; when it runs out the call raises
+    ``DeadlineExceeded`` rather than ``CommandTimeoutError``.
+    """
 
     def __init__(
         self,
         port: str = DEFAULT_PORT,
         rts: "bool | None" = None,
         dtr: "bool | None" = None,
+        reconnect: "ReconnectPolicy | bool | None" = None,
+        transport: "Transport | None" = None,
+        timing: "TimingTable | None" = None,
+        lock_timeout: "float | None" = 0.0,
+        on_lock_request: "Callable[[LockHolder], bool] | None" = None,
     ):
-        self._serial = SerialPort(port=port, rts=rts, dtr=dtr)
+        """
+        Args:
+            port: Serial device, or a ``tcp://host:port``,
+                ``rfc2217://host:port`` or ``loop://`` URL.
+            rts, dtr: Line states to set on open (None = driver default).
+            reconnect: Survive USB-serial dropouts by reopening the port
+                (see ``reconnect.ReconnectingSerialPort``).  True uses the
+                default ``ReconnectPolicy``.
+            transport: How to reach ``port`` (see ``transport``); by
+                default chosen from the port string.
+            timing: Per-opcode pacing (see ``timing``); by default the
+                profile saved for ``port``, if any.
+            lock_timeout: Seconds ``open()`` waits for another program
+                using this package to release the port (see ``portlock``).
+            on_lock_request: Called when another program asks for the
+                port; return True to close it and hand it over.
+        """
+        if reconnect:
+            from .reconnect import ReconnectingSerialPort, ReconnectPolicy
+
+            policy = reconnect if isinstance(reconnect, ReconnectPolicy) else None
+            self._serial: SerialPort = ReconnectingSerialPort(
+                port=port, policy=policy, rts=rts, dtr=dtr, transport=transport,
+                timing=timing, lock_timeout=lock_timeout, on_lock_request=on_lock_request,
+            )
+        else:
+            self._serial = SerialPort(
+                port=port, rts=rts, dtr=dtr, transport=transport, timing=timing,
+                lock_timeout=lock_timeout, on_lock_request=on_lock_request,
+            )
+        self._batches = threading.local()   # per-thread queued frames
+        self._band_plan: "BandPlan | None" = None
+        self.state = StateCache()           # last known state, see ``state``
+        self._vfos = VFOTracker()
+        self._scheduler: "CommandScheduler | None" = None
 
     # -- context manager ---------------------------------------------------
 
     def __enter__(self) -> "FT1000MP":
-        self._serial.open()
+        self.open()
         return self
 
     def __exit__(
@@ -135,10 +316,191 @@ class FT1000MP:
 
     def open(self) -> None:
         self._serial.open()
+        self._vfos.forget()     # the front panel may have been used meanwhile
 
     def close(self) -> None:
         self._serial.close()
 
+    def lock_holder(self) -> "LockHolder | None":
+        """The program holding this radio's port lock, or None (see ``portlock``)."""
+        return self._serial.lock_holder()
+
+    @property
+    def profiler(self) -> "WireProfiler | None":
+        """Wire-time profiler attached to the port (see ``profiler``), or None."""
+        return self._serial.profiler
+
+    @profiler.setter
+    def profiler(self, profiler: "WireProfiler | None") -> None:
+        self._serial.profiler = profiler
+
+    def calibrate_timing(self, trials: int = 5, save: bool = True) -> "TimingTable":
+        """Measure how long each opcode needs to settle, and use that.
+
+        Only harmless commands are sent (queries, and setters writing back
+        the current state; see ``timing.calibrate``).  With ``save`` the
+        table becomes this port's profile, applied on every later open.
+        """
+        from .timing import calibrate, save_profile
+
+        self._flush_batch()
+        table = calibrate(self._serial, trials=trials)
+        self._serial.timing = table
+        if save:
+            save_profile(self._serial.port, table)
+        return table
+
+    @property
+    def outages(self) -> "list[Outage]":
+        """Serial dropouts survived so far (always empty without ``reconnect``)."""
+        return list(getattr(self._serial, "outages", []))
+
+    # -- command batching --------------------------------------------------
+
+    @contextmanager
+    def batch(self, timeout: "float | None" = None) -> Iterator[None]:
+        """Queue write-only commands and send them back to back on exit.
+
+        Inside the block, setters only record their frames; they go out
+        in one paced stream via ``SerialPort.send_commands`` when the block
+        ends.  A status query inside the block first flushes what is
+        queued.  If the block raises, queued frames are discarded.
+        Nested ``batch()`` blocks join the outer one.  Batches are per
+        thread: calls from other threads (e.g. a PTT watchdog) are not
+        queued into this one.
+
+        ``timeout`` bounds sending the queued frames on exit; the
+        ``timeout`` of individual setters inside the block is ignored.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+            frames = self._batch
+        finally:
+            self._batch = None
+        if frames:
+            self._serial.send_commands(frames, _deadline(timeout))
+
+    @property
+    def _batch(self) -> "list[bytes] | None":
+        return getattr(self._batches, "frames", None)
+
+    @_batch.setter
+    def _batch(self, frames: "list[bytes] | None") -> None:
+        self._batches.frames = frames
+
+    def _flush_batch(self, deadline: "float | None" = None) -> None:
+        if getattr(self._batches, "recording", False):
+            raise ValueError("Only setters can be scheduled; a query cannot be sent later")
+        if self._batch:
+            self._serial.send_commands(self._batch, deadline)
+            self._batch = []
+
+    # -- timed commands ----------------------------------------------------
+
+    @property
+    def scheduler(self) -> "CommandScheduler":
+        """The ``schedule.CommandScheduler`` behind ``at()`` (its landings, jitter)."""
+        if self._scheduler is None:
+            from .schedule import CommandScheduler
+
+            self._scheduler = CommandScheduler(self._serial)
+        return self._scheduler
+
+    def at(
+        self,
+        when: float,
+        commands: "Callable[[], object] | Iterable[bytes]",
+        max_late: "float | None" = None,
+    ) -> "Landing":
+        """Send ``commands`` so they land on the radio at ``when``.
+
+        Args:
+            when: Wall-clock target (``time.time()``), e.g. from
+                ``schedule.next_period()``.
+            commands: Either a function calling setters on this radio,
+                which is run right away to record their frames, or the
+                frames themselves.
+            max_late: Give up if the port is still busy this many seconds
+                after ``when`` (default ``schedule.DEFAULT_MAX_LATE``).
+
+        Returns:
+            A ``schedule.Landing`` with the measured landing error.
+
+        Raises:
+            ValueError: Nothing to send, or ``commands`` made a query.
+            DeadlineExceeded: ``when`` plus ``max_late`` has passed.
+
+        Example::
+
+            t = next_period(15.0, offset=-0.3)
+            landing = radio.at(t, lambda: radio.set_frequency_a(14_074_000))
+            print(f"{landing.error * 1000:+.1f} ms")
+        """
+        from .schedule import DEFAULT_MAX_LATE
+
+        updates: list[tuple[Callable[..., object], tuple[Any, ...]]] = []
+        if callable(commands):
+            frames, updates = self._record(commands)
+        else:
+            frames = list(commands)
+        landing = self.scheduler.at(when, frames, DEFAULT_MAX_LATE if max_late is None else max_late)
+        for update, args in updates:
+            update(*args)
+        return landing
+
+    def _note_tuned(self, vfo: str, freq_hz: int) -> None:
+        """``vfo`` was tuned by frames sent around the setters (see ``hopping``)."""
+        self.state.discard(*_WRITE_INVALIDATES)
+        self._vfos.tuned(vfo, freq_hz)
+
+    def _record(
+        self, commands: "Callable[[], object]"
+    ) -> "tuple[list[bytes], list[tuple[Callable[..., object], tuple[Any, ...]]]]":
+        """Run ``commands`` with setters queued but never sent.
+
+        Returns:
+            The frames, and the bookkeeping (``_track``) to do once they
+            have been sent.
+        """
+        outer = self._batch
+        self._batch = []
+        self._batches.recording = True
+        self._batches.updates = []
+        try:
+            commands()
+            return self._batch, self._batches.updates
+        finally:
+            self._batch = outer
+            self._batches.recording = False
+            self._batches.updates = None
+
+    def _track(self, update: "Callable[..., object]", *args: Any) -> None:
+        """Call ``update(*args)`` now, or after ``at()`` has sent the
+        frames being recorded."""
+        updates = getattr(self._batches, "updates", None)
+        if updates is None:
+            update(*args)
+        else:
+            updates.append((update, args))
+
+    def _write(self, cmd: bytes, timeout: "float | None" = None) -> None:
+        self._track(self.state.discard, *_WRITE_INVALIDATES)
+        if self._batch is not None:
+            self._batch.append(cmd)
+        else:
+            self._serial.send_command(cmd, deadline=_deadline(timeout))
+
+    def _query(self, cmd: bytes, response_length: int, timeout: "float | None" = None) -> bytes:
+        deadline = _deadline(timeout)
+        self._flush_batch(deadline)
+        data = self._serial.send_command(cmd, response_length, deadline)
+        assert data is not None
+        return data
+
     # -- validation helpers ------------------------------------------------
 
     @staticmethod
@@ -161,26 +523,67 @@ class FT1000MP:
 
     # -- frequency ---------------------------------------------------------
 
-    def set_frequency_a(self, freq_hz: int) -> None:
-        """Set VFO-A frequency in Hz."""
+    def set_frequency_a(
+        self, freq_hz: int, timeout: "float | None" = None, auto_mode: bool = False
+    ) -> None:
+        """Set VFO-A frequency in Hz.
+
+        With ``auto_mode`` the mode for that part of the band (from
+        ``band_plan``) is set too, in the same batch.  Outside the plan
+        only the frequency changes.
+        """
         self._validate_freq(freq_hz)
-        self._serial.send_command(cmd_set_freq_a(freq_hz))
+        self._tune(cmd_set_freq_a(freq_hz), freq_hz, False, timeout, auto_mode)
 
-    def set_frequency_b(self, freq_hz: int) -> None:
-        """Set VFO-B frequency in Hz."""
+    def set_frequency_b(
+        self, freq_hz: int, timeout: "float | None" = None, auto_mode: bool = False
+    ) -> None:
+        """Set VFO-B frequency in Hz (``auto_mode`` as for VFO-A)."""
         self._validate_freq(freq_hz)
-        self._serial.send_command(cmd_set_freq_b(freq_hz))
+        self._tune(cmd_set_freq_b(freq_hz), freq_hz, True, timeout, auto_mode)
+
+    def _tune(
+        self,
+        freq_cmd: bytes,
+        freq_hz: int,
+        vfo_b: bool,
+        timeout: "float | None",
+        auto_mode: bool,
+    ) -> None:
+        mode_name = self.band_plan.mode_for(freq_hz) if auto_mode else None
+        if mode_name is None:
+            self._write(freq_cmd, timeout)
+        else:
+            with self.batch(timeout):
+                self._write(freq_cmd)
+                self._write(cmd_set_mode(self._validate_mode(mode_name), vfo_b=vfo_b))
+        self._track(self._vfos.tuned, "B" if vfo_b else "A", freq_hz)
+
+    @property
+    def band_plan(self) -> "BandPlan":
+        """Plan used by ``auto_mode`` (default ``bandplan.REGION_2``)."""
+        if self._band_plan is None:
+            from .bandplan import REGION_2
+
+            self._band_plan = REGION_2
+        return self._band_plan
+
+    @band_plan.setter
+    def band_plan(self, plan: "BandPlan") -> None:
+        self._band_plan = plan
 
     # -- mode --------------------------------------------------------------
 
-    def set_mode(self, mode_name: str, vfo_b: bool = False) -> None:
+    def set_mode(
+        self, mode_name: str, vfo_b: bool = False, timeout: "float | None" = None
+    ) -> None:
         """Set operating mode by name (e.g. 'USB', 'CW', 'LSB')."""
         mode_val = self._validate_mode(mode_name)
-        self._serial.send_command(cmd_set_mode(mode_val, vfo_b=vfo_b))
+        self._write(cmd_set_mode(mode_val, vfo_b=vfo_b), timeout)
 
     # -- VFO ---------------------------------------------------------------
 
-    def select_vfo(self, vfo: str) -> None:
+    def select_vfo(self, vfo: str, timeout: "float | None" = None) -> None:
         """Select VFO A or B. Accepts 'a'/'A' or 'b'/'B'.
 
         Note: the 32-byte status response (target 0x03) returns
@@ -188,42 +591,152 @@ class FT1000MP:
         The ``read_flags().vfo_b_selected`` flag is unreliable.
         """
         vfo_val = VFO.A if vfo.upper() == "A" else VFO.B
-        self._serial.send_command(cmd_select_vfo(vfo_val))
+        self._write(cmd_select_vfo(vfo_val), timeout)
+        self._track(self._vfos.selected_vfo, "A" if vfo_val == VFO.A else "B")
+
+    @property
+    def selected_vfo(self) -> "str | None":
+        """The VFO this program believes is selected ("A"/"B"), or None.
 
-    def copy_vfo_a_to_b(self) -> None:
+        Tracked from ``select_vfo()`` and from ``get_vfos()`` samples; see
+        ``tracking``.  No radio I/O.
+        """
+        return self._vfos.selected
+
+    def copy_vfo_a_to_b(self, timeout: "float | None" = None) -> None:
         """Copy VFO-A settings to VFO-B."""
-        self._serial.send_command(cmd_vfo_a_to_b())
+        self._write(cmd_vfo_a_to_b(), timeout)
+        self._track(self._vfos.copied_a_to_b)
 
     # -- split -------------------------------------------------------------
 
-    def set_split(self, on: bool) -> None:
-        self._serial.send_command(cmd_split(on))
+    def set_split(self, on: bool, timeout: "float | None" = None) -> None:
+        self._write(cmd_split(on), timeout)
 
     # -- clarifier ---------------------------------------------------------
 
-    def set_clarifier(self, on: bool) -> None:
-        self._serial.send_command(cmd_clarifier(on))
+    def set_clarifier(self, on: bool, timeout: "float | None" = None) -> None:
+        self._write(cmd_clarifier(on), timeout)
+
+    def set_clarifier_offset(self, offset_hz: int, timeout: "float | None" = None) -> None:
+        self._write(cmd_clarifier_offset(offset_hz), timeout)
 
-    def set_clarifier_offset(self, offset_hz: int) -> None:
-        self._serial.send_command(cmd_clarifier_offset(offset_hz))
+    # -- sweeps ------------------------------------------------------------
+
+    def glide(
+        self,
+        start_hz: int,
+        stop_hz: int,
+        rate_hz_per_s: float,
+        timeout: "float | None" = None,
+    ) -> SweepResult:
+        """Slew VFO-A from ``start_hz`` to ``stop_hz`` at a steady rate.
+
+        Frames go out as fast as the link allows.  Each one carries the
+        frequency due at the moment it is sent, so when the link cannot
+        keep up, intermediate 10 Hz steps are dropped rather than queued
+        and the glide still ends on time.
+        """
+        self._validate_freq(start_hz)
+        self._validate_freq(stop_hz)
+        if rate_hz_per_s <= 0:
+            raise ValueError(f"rate_hz_per_s must be positive, got {rate_hz_per_s}")
+        result = self._ramp(cmd_set_freq_a, start_hz, stop_hz, FREQ_STEP_HZ, rate_hz_per_s, timeout)
+        self._vfos.tuned("A", stop_hz)
+        return result
+
+    def sweep_clarifier(
+        self,
+        start_hz: int,
+        stop_hz: int,
+        step_hz: int,
+        rate_hz_per_s: "float | None" = None,
+        timeout: "float | None" = None,
+    ) -> SweepResult:
+        """Step the clarifier offset from ``start_hz`` to ``stop_hz``.
+
+        Without ``rate_hz_per_s`` every step is sent, back to back.  With
+        it the sweep keeps to that slew rate, dropping steps the link
+        cannot fit in as ``glide()`` does.
+        """
+        for offset in (start_hz, stop_hz):
+            if abs(offset) > CLARIFIER_MAX_HZ:
+                raise ValueError(f"Clarifier offset must be within ±{CLARIFIER_MAX_HZ} Hz")
+        if step_hz <= 0:
+            raise ValueError(f"step_hz must be positive, got {step_hz}")
+        if rate_hz_per_s is not None and rate_hz_per_s <= 0:
+            raise ValueError(f"rate_hz_per_s must be positive, got {rate_hz_per_s}")
+        return self._ramp(cmd_clarifier_offset, start_hz, stop_hz, step_hz, rate_hz_per_s, timeout)
+
+    def _ramp(
+        self,
+        frame_for: Callable[[int], bytes],
+        start: int,
+        stop: int,
+        step: int,
+        rate: "float | None",
+        timeout: "float | None",
+    ) -> SweepResult:
+        """Send the values start, start ± step, ..., stop, paced by ``rate``.
+
+        Step ``i`` is due ``i * step / rate`` seconds in; whenever a frame
+        can be sent, the latest due step goes out and any earlier unsent
+        ones are dropped.
+        """
+        deadline = _deadline(timeout)
+        self._flush_batch(deadline)
+        self.state.discard(*_WRITE_INVALIDATES)
+        direction = 1 if stop >= start else -1
+        last_step = abs(stop - start) // step
+        sent = 0
+        index = -1
+        t0 = time.monotonic()
+        while index < last_step:
+            if rate is None:
+                due = index + 1
+            else:
+                elapsed = time.monotonic() - t0
+                due = min(last_step, int(elapsed * rate / step))
+                if due <= index:
+                    time.sleep((index + 1) * step / rate - elapsed)
+                    continue
+            index = due
+            value = stop if index == last_step else start + direction * index * step
+            self._serial.send_command(frame_for(value), deadline=deadline)
+            sent += 1
+        elapsed = time.monotonic() - t0
+        return SweepResult(
+            steps_sent=sent,
+            steps_dropped=last_step + 1 - sent,
+            elapsed=elapsed,
+            achieved_rate=sent / elapsed if elapsed > 0 else 0.0,
+        )
 
     # -- PTT ---------------------------------------------------------------
 
-    def set_ptt(self, on: bool) -> None:
-        self._serial.send_command(cmd_ptt(on))
+    def set_ptt(self, on: bool, timeout: "float | None" = None) -> None:
+        """Key or unkey the transmitter on the urgent path.
+
+        PTT is never batched: anything this thread has queued is flushed
+        first, then the frame jumps ahead of other threads' commands and
+        is written without pacing (``SerialPort.send_urgent``).
+        """
+        deadline = _deadline(timeout)
+        self._flush_batch(deadline)
+        self._serial.send_urgent(cmd_ptt(on), deadline)
 
     # -- memory ------------------------------------------------------------
 
-    def recall_memory(self, channel: int) -> None:
+    def recall_memory(self, channel: int, timeout: "float | None" = None) -> None:
         """Select a memory channel (1-99).
 
         This switches the radio into memory mode and sets the channel pointer.
         """
         if not (1 <= channel <= 99):
             raise ValueError(f"Channel must be 1-99, got {channel}")
-        self._serial.send_command(cmd_recall_memory(channel))
+        self._write(cmd_recall_memory(channel), timeout)
 
-    def vfo_to_memory(self, channel: int) -> None:
+    def vfo_to_memory(self, channel: int, timeout: "float | None" = None) -> None:
         """Store current VFO to a memory channel (1-99).
 
         Call recall_memory(channel) first to select the target channel,
@@ -231,9 +744,10 @@ class FT1000MP:
         """
         if not (1 <= channel <= 99):
             raise ValueError(f"Channel must be 1-99, got {channel}")
-        self._serial.send_command(cmd_vfo_to_memory(channel))
+        self._write(cmd_vfo_to_memory(channel), timeout)
+        self._track(cache.remove, self._memory_cache_name)
 
-    def memory_to_vfo(self, channel: int) -> None:
+    def memory_to_vfo(self, channel: int, timeout: "float | None" = None) -> None:
         """Transfer a memory channel to VFO (1-99).
 
         Call recall_memory(channel) first to select the source channel,
@@ -241,31 +755,229 @@ class FT1000MP:
         """
         if not (1 <= channel <= 99):
             raise ValueError(f"Channel must be 1-99, got {channel}")
-        self._serial.send_command(cmd_memory_to_vfo(channel))
+        self._write(cmd_memory_to_vfo(channel), timeout)
+        self._track(self._vfos.active_unknown)
+
+    @property
+    def _memory_cache_name(self) -> str:
+        return cache.cache_key("memories", self._serial.port)
+
+    def dump_memories(
+        self,
+        max_age: "float | None" = None,
+        refresh: bool = False,
+        timeout: "float | None" = None,
+    ) -> MemoryDump:
+        """Read all 99 memory channels in a single all-data transaction.
+
+        The raw 1636-byte response is cached on disk with a timestamp, so
+        later calls return the cached map without touching the radio.
+        ``vfo_to_memory()`` invalidates the cache.
+
+        Args:
+            max_age: Ignore a cached dump older than this many seconds
+                (None = any age).
+            refresh: Always read from the radio.
+            timeout: Upper bound in seconds for reading from the radio.
+
+        Returns:
+            A ``MemoryDump`` mapping channel number (1-99) to its status.
+            Empty channels report a frequency of 0 Hz.
+        """
+        name = self._memory_cache_name
+        if not refresh:
+            cached = cache.load(name)
+            if cached is not None:
+                try:
+                    timestamp = float(cached["timestamp"])
+                    raw = bytes.fromhex(cached["data"])
+                except (KeyError, TypeError, ValueError):
+                    timestamp, raw = 0.0, b""
+                fresh = max_age is None or time.time() - timestamp <= max_age
+                if fresh and len(raw) == STATUS_RESPONSE_LENGTHS[StatusTarget.ALL_DATA]:
+                    return MemoryDump(_parse_memory_channels(raw), timestamp, True)
+
+        data = self._query(
+            cmd_status_update(StatusTarget.ALL_DATA),
+            STATUS_RESPONSE_LENGTHS[StatusTarget.ALL_DATA],
+            timeout,
+        )
+        timestamp = time.time()
+        cache.save(name, {"timestamp": timestamp, "data": data.hex()})
+        return MemoryDump(_parse_memory_channels(data), timestamp)
 
     # -- status queries ----------------------------------------------------
 
-    def get_vfo_status(self, target: int = 0x02) -> VFOStatus:
+    def get_vfo_status(self, target: int = 0x02, timeout: "float | None" = None) -> VFOStatus:
         """Read current VFO status (16-byte response).
 
         target: 0x02 = current operating data (default).
         """
-        data = self._serial.send_command(cmd_status_update(target), 16)
-        assert data is not None
-        return _parse_vfo_block(data)
+        data = self._query(cmd_status_update(target), 16, timeout)
+        status = _parse_vfo_block(data)
+        if target == StatusTarget.OPERATING_DATA:
+            self.state.update(
+                CAT, active_vfo=status,
+                frequency_hz=status.frequency_hz, mode_name=status.mode_name,
+            )
+        return status
 
-    def get_both_vfo_status(self) -> tuple[VFOStatus, VFOStatus]:
+    def get_both_vfo_status(
+        self, timeout: "float | None" = None
+    ) -> tuple[VFOStatus, VFOStatus]:
         """Read both VFO statuses (32-byte response).
 
         Returns (active_vfo_status, inactive_vfo_status).  The radio
         always puts the currently selected VFO first, so after
         ``select_vfo('B')`` the first element holds VFO-B's data.
         """
-        data = self._serial.send_command(cmd_status_update(0x03), 32)
-        assert data is not None
-        return _parse_vfo_block(data[0:16]), _parse_vfo_block(data[16:32])
+        data = self._query(cmd_status_update(0x03), 32, timeout)
+        active, inactive = _parse_vfo_block(data[0:16]), _parse_vfo_block(data[16:32])
+        self.state.update(
+            CAT, active_vfo=active, inactive_vfo=inactive,
+            frequency_hz=active.frequency_hz, mode_name=active.mode_name,
+        )
+        return active, inactive
+
+    def get_vfos(self, probe: bool = True, timeout: "float | None" = None) -> VFOSnapshot:
+        """Read both VFOs labelled A and B, normally in one 32-byte read.
+
+        Which block is which comes from the tracked selection and known
+        frequencies (see ``tracking``).  Only when those cannot decide —
+        e.g. on the first call after ``open()``, or when both VFOs are on
+        the same frequency with no ``select_vfo()`` seen — is the all-data
+        dump read as well (about 3.5 s at 4800 baud), unless ``probe`` is
+        False, in which case the snapshot is a best guess with
+        ``confident=False``.  A probe that still cannot tell which VFO is
+        selected returns ``selected=None``, also with ``confident=False``.
+        A probe also refreshes the ``dump_memories()`` cache.
+        """
+        deadline = _deadline(timeout)
+        active, inactive = self.get_both_vfo_status(timeout)
+        selected = self._vfos.resolve(active, inactive)
+        if selected is not None:
+            a, b = (active, inactive) if selected == "A" else (inactive, active)
+            snapshot = VFOSnapshot(a, b, selected, confident=True)
+        elif not probe:
+            guess = self._vfos.selected or "A"
+            a, b = (active, inactive) if guess == "A" else (inactive, active)
+            snapshot = VFOSnapshot(a, b, guess, confident=False)
+        else:
+            data = self._query(
+                cmd_status_update(StatusTarget.ALL_DATA),
+                STATUS_RESPONSE_LENGTHS[StatusTarget.ALL_DATA],
+                _left(deadline),
+            )
+            cache.save(self._memory_cache_name, {"timestamp": time.time(), "data": data.hex()})
+            a_start = ALL_DATA_HEADER_LENGTH
+            b_start = a_start + STATUS_BLOCK_LENGTH
+            a = _parse_vfo_block(data[a_start:b_start])
+            b = _parse_vfo_block(data[b_start:b_start + STATUS_BLOCK_LENGTH])
+            if a == b:
+                probed: "str | None" = self._vfos.selected   # either label is right
+            elif (a, b) == (active, inactive):
+                probed = "A"
+            elif (b, a) == (active, inactive):
+                probed = "B"
+            else:
+                probed = None       # changed between the two reads
+            self._vfos.confirm(probed, a, b)
+            snapshot = VFOSnapshot(a, b, probed, confident=probed is not None, probed=True)
+        self.state.update(CAT, vfo_a=snapshot.a, vfo_b=snapshot.b, selected_vfo=snapshot.selected)
+        return snapshot
+
+    def stream(
+        self,
+        interval: float = 1.0,
+        fields: Iterable[str] = ("vfo",),
+        count: "int | None" = None,
+        timeout: "float | None" = None,
+    ) -> "StatusStream":
+        """Status samples every ``interval`` seconds, reading only ``fields``.
+
+        Use with ``for`` or ``async for``; a slow consumer skips samples
+        rather than queueing them (see ``streaming``)::
+
+            async for sample in radio.stream(0.25, fields=("flags", "vfo")):
+                print(sample.seq, sample.vfo.frequency_hz, sample.flags.transmitting)
+        """
+        from .streaming import StatusStream
+
+        return StatusStream(self, interval, fields, count, timeout)
+
+    # -- snapshot / restore ------------------------------------------------
 
-    def read_flags(self) -> RadioFlags:
+    def snapshot(self, timeout: "float | None" = None) -> RadioSnapshot:
+        """Capture what ``restore()`` can put back (a labelled VFO read and
+        the flags; see ``get_vfos``)."""
+        deadline = _deadline(timeout)
+        vfos = self.get_vfos(timeout=timeout)
+        flags = self.read_flags(_left(deadline))
+        return RadioSnapshot(vfos.a, vfos.b, flags.split, vfos.selected, time.time())
+
+    def restore(
+        self,
+        snapshot: RadioSnapshot,
+        max_age: "float | None" = RESTORE_MAX_AGE,
+        timeout: "float | None" = None,
+    ) -> int:
+        """Put the radio back as ``snapshot`` found it, sending only what differs.
+
+        The current state comes from ``state`` when every field needed is
+        cached and at most ``max_age`` seconds old (None = any age, 0 =
+        always read it).  The cache only knows what went through this
+        object, so pass 0 if the front panel may have been used since the
+        last read.  The differing commands go out as one
+        batch.  VFO selection is not restored: switching VFOs is what
+        corrupts frequency data on this radio.  Clarifier on/off and
+        offset are restored only if the same VFO is selected as in the
+        snapshot, since the commands act on the selected VFO.  Modes
+        ``SET_MODE`` cannot express (sub-modes such as CW-R or SAM, USER
+        modes) are not restored either.
+
+        Returns:
+            How many commands were saved compared with a full restore.
+        """
+        deadline = _deadline(timeout)
+        current = self._cached_snapshot(max_age)
+        if current is None:
+            current = self.snapshot(timeout)
+        frames = _restore_frames(snapshot, current)
+        with self.batch(_left(deadline)):
+            for frame in frames:
+                self._write(frame)
+        self._vfos.tuned("A", snapshot.vfo_a.frequency_hz)
+        self._vfos.tuned("B", snapshot.vfo_b.frequency_hz)
+        return len(_restore_frames(snapshot, None)) - len(frames)
+
+    def _cached_snapshot(self, max_age: "float | None") -> "RadioSnapshot | None":
+        values = [
+            self.state.get(name, max_age, _MISSING)
+            for name in ("vfo_a", "vfo_b", "split", "selected_vfo")
+        ]
+        if any(value is _MISSING for value in values):
+            return None
+        vfo_a, vfo_b, split, selected = values
+        return RadioSnapshot(vfo_a, vfo_b, split, selected, time.time())
+
+    def read_meter(self, sub: bool = False, timeout: "float | None" = None) -> int:
+        """Read the meter (0-255): S-meter on receive, the selected meter
+        on transmit.  ``sub`` reads the sub receiver's S-meter."""
+        data = self._query(cmd_read_meter(sub), METER_RESPONSE_LENGTH, timeout)
+        value = data[0]
+        self.state.update(CAT, **{"sub_meter" if sub else "meter": value})
+        return value
+
+    def meter_sampler(
+        self, capacity: "int | None" = None, decimation: int = 1, sub: bool = False
+    ) -> "MeterSampler":
+        """A ``metering.MeterSampler`` reading this radio's meter back to
+        back (``capacity`` defaults to ``metering.DEFAULT_CAPACITY``)."""
+        from .metering import DEFAULT_CAPACITY, MeterSampler
+
+        return MeterSampler(self, DEFAULT_CAPACITY if capacity is None else capacity, decimation, sub)
+
+    def read_flags(self, timeout: "float | None" = None) -> RadioFlags:
         """Read the 5-byte status flags.
 
         NOTE: The ``clarifier`` and ``vfo_b_selected`` fields from this
@@ -273,14 +985,7 @@ class FT1000MP:
         clarifier state, and compare frequencies from
         ``get_both_vfo_status()`` for VFO identity.
         """
-        data = self._serial.send_command(cmd_read_flags(), 5)
-        assert data is not None
-        flags = data[0]
-        return RadioFlags(
-            split=bool(flags & StatusFlag.SPLIT),
-            clarifier=bool(flags & StatusFlag.CLARIFIER),
-            vfo_b_selected=bool(flags & StatusFlag.VFO_B),
-            transmitting=bool(flags & StatusFlag.TRANSMITTING),
-            priority=bool(flags & StatusFlag.PRIORITY),
-            raw=flags,
-        )
+        data = self._query(cmd_read_flags(), 5, timeout)
+        flags = RadioFlags.from_raw(data[0])
+        self.state.update(CAT, flags=flags, transmitting=flags.transmitting, split=flags.split)
+        return flags
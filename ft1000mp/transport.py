@@ -0,0 +1,222 @@
+"""Byte-stream transports underneath ``SerialPort``.
+
+``SerialPort`` owns the CAT framing, retries and deadlines; a
+``Transport`` only knows how to open a pyserial-compatible handle to the
+radio and whether writes to it need per-byte pacing.
+
+========================  =====================================  ======
+Port string               Transport                              Paced
+========================  =====================================  ======
+``/dev/ttyUSB0``, COM3    ``LocalSerialTransport``               yes
+``tcp://host:port``       ``TCPTransport`` (raw, e.g. ser2net)   no
+``rfc2217://host:port``   ``RFC2217Transport``                   no
+``loop://``               ``LoopbackTransport`` (emulated radio) no
+========================  =====================================  ======
+
+Over a network, per-byte sleeps only add round trips and jitter, so
+remote transports write each 5-byte frame in one call with TCP_NODELAY
+set; the serial server at the far end clocks the bytes out.
+"""
+
+import select
+import socket
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from .exceptions import SerialConnectionError
+
+TCP_CONNECT_TIMEOUT = 5.0
+
+
+def _host_port(address: str, scheme: str) -> tuple[str, int]:
+    """Split ``scheme://host:port`` (or bare ``host:port``)."""
+    if address.startswith(f"{scheme}://"):
+        address = address[len(scheme) + 3:]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise SerialConnectionError(f"Expected {scheme}://host:port, got {address!r}")
+    return host.strip("[]"), int(port)
+
+
+class Transport(ABC):
+    """How to reach the radio.
+
+    Subclasses implement ``open()`` and say whether ``SerialPort`` must
+    pace writes byte by byte (``paced``).
+    """
+
+    paced = True
+
+    @abstractmethod
+    def open(self, port: str, baudrate: int, timeout: float) -> Any:
+        """Return an open pyserial-compatible handle (8N2 at ``baudrate``).
+
+        Raises:
+            SerialConnectionError: The radio cannot be reached.
+        """
+
+
+class LocalSerialTransport(Transport):
+    """A serial device on this machine, via pyserial."""
+
+    def open(self, port: str, baudrate: int, timeout: float) -> Any:
+        import serial  # deferred: only needed once a port is opened
+
+        try:
+            return serial.Serial(
+                port=port,
+                baudrate=baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_TWO,
+                timeout=timeout,
+            )
+        except serial.SerialException as exc:
+            raise SerialConnectionError(f"Cannot open {port}: {exc}") from exc
+
+
+class RFC2217Transport(Transport):
+    """A remote serial port speaking RFC 2217 (ser2net, ESP-Link, ...).
+
+    Baud rate and framing are negotiated with the server, so the far-end
+    UART is set to 4800 8N2 from here.
+    """
+
+    paced = False
+
+    def open(self, port: str, baudrate: int, timeout: float) -> Any:
+        import serial
+        import serial.rfc2217
+
+        host, tcp_port = _host_port(port, "rfc2217")
+        try:
+            return serial.rfc2217.Serial(
+                f"rfc2217://{host}:{tcp_port}",
+                baudrate=baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_TWO,
+                timeout=timeout,
+            )
+        except serial.SerialException as exc:
+            raise SerialConnectionError(f"Cannot open {port}: {exc}") from exc
+
+
+class _SocketHandle:
+    """The part of the pyserial API ``SerialPort`` uses, over a TCP socket."""
+
+    def __init__(self, sock: socket.socket, timeout: Optional[float]):
+        self._sock = sock
+        self.timeout = timeout
+        self.rts = True     # no modem lines on a raw socket; accepted and ignored
+        self.dtr = True
+        self.is_open = True
+
+    def write(self, data: bytes) -> int:
+        self._sock.sendall(data)
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        buf = bytearray()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while len(buf) < size:
+            left = None
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+            self._sock.settimeout(left)
+            try:
+                chunk = self._sock.recv(size - len(buf))
+            except socket.timeout:
+                break
+            if not chunk:
+                raise ConnectionResetError("Remote end closed the connection")
+            buf += chunk
+        return bytes(buf)
+
+    @property
+    def in_waiting(self) -> int:
+        readable, _, _ = select.select([self._sock], [], [], 0)
+        if not readable:
+            return 0
+        self._sock.settimeout(0)
+        try:
+            return len(self._sock.recv(65536, socket.MSG_PEEK))
+        except BlockingIOError:
+            return 0
+
+    def reset_input_buffer(self) -> None:
+        """Discard anything already received (stale replies)."""
+        self._sock.settimeout(0)
+        try:
+            while self._sock.recv(4096):
+                pass
+        except (BlockingIOError, socket.timeout):
+            pass
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_open = False
+        self._sock.close()
+
+
+class TCPTransport(Transport):
+    """A raw TCP socket to a serial server (ser2net ``raw`` / ``telnet`` off).
+
+    The server's UART must already be set to 4800 8N2; there is no way
+    to change line settings over a raw socket.
+    """
+
+    paced = False
+
+    def __init__(self, connect_timeout: float = TCP_CONNECT_TIMEOUT):
+        self.connect_timeout = connect_timeout
+
+    def open(self, port: str, baudrate: int, timeout: float) -> Any:
+        host, tcp_port = _host_port(port, "tcp")
+        try:
+            sock = socket.create_connection((host, tcp_port), timeout=self.connect_timeout)
+        except OSError as exc:
+            raise SerialConnectionError(f"Cannot connect to {port}: {exc}") from exc
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return _SocketHandle(sock, timeout)
+
+
+class LoopbackTransport(Transport):
+    """An in-memory emulated FT-1000MP (``emulator.Emulator``).
+
+    The same emulator is handed back on every open, so its state survives
+    close/reopen and tests can inspect it through ``emulator``.
+    """
+
+    paced = False
+
+    def __init__(self, emulator: Any = None):
+        if emulator is None:
+            from .emulator import Emulator
+
+            emulator = Emulator()
+        self.emulator = emulator
+
+    def open(self, port: str, baudrate: int, timeout: float) -> Any:
+        self.emulator.is_open = True
+        self.emulator.timeout = timeout
+        return self.emulator
+
+
+def transport_for(port: str) -> Transport:
+    """Pick the transport a port string asks for (see the module table)."""
+    if port.startswith("tcp://"):
+        return TCPTransport()
+    if port.startswith("rfc2217://"):
+        return RFC2217Transport()
+    if port.startswith("loop://"):
+        return LoopbackTransport()
+    return LocalSerialTransport()
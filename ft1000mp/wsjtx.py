@@ -0,0 +1,250 @@
+"""Follow WSJT-X's UDP status broadcasts into a ``StateCache``.
+
+WSJT-X sends a Status message whenever its dial frequency, mode or
+transmit state changes, and a Heartbeat every 15 seconds.  Feeding those
+into ``radio.state`` gives a second source of truth that costs no serial
+traffic; a ``state.StatePoller`` then only verifies the radio every
+``verify_interval`` while WSJT-X is running.
+
+Messages are Qt ``QDataStream`` encoded (big-endian)::
+
+    magic u32 0xADBCCBDA, schema u32, type u32, id utf8, fields...
+
+where utf8 is a u32 byte length (0xFFFFFFFF = null) followed by the
+bytes.  Only Heartbeat (0), Status (1) and Close (6) are decoded; the
+``build_*`` functions produce the same packets for tests and replays.
+
+Cache fields written (source ``"wsjtx"``): ``frequency_hz`` (the dial),
+``transmitting``, ``wsjtx_mode`` (e.g. ``"FT8"``) and ``tx_df``.
+"""
+
+import socket
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from .state import StateCache
+
+SOURCE = "wsjtx"
+MAGIC = 0xADBCCBDA
+SCHEMA = 3
+DEFAULT_PORT = 2237
+HEARTBEAT, STATUS, CLOSE = 0, 1, 6
+RECV_POLL_INTERVAL = 0.2
+
+
+@dataclass
+class WSJTXStatus:
+    """The fields of a Status message this package uses."""
+    client_id: str
+    dial_hz: int
+    mode: str
+    dx_call: str = ""
+    tx_enabled: bool = False
+    transmitting: bool = False
+    decoding: bool = False
+    rx_df: int = 0
+    tx_df: int = 0
+
+
+class _Reader:
+    """Sequential QDataStream field reader."""
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def _take(self, fmt: str) -> int:
+        (value,) = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return int(value)
+
+    def u8(self) -> int:
+        return self._take(">B")
+
+    def u32(self) -> int:
+        return self._take(">I")
+
+    def u64(self) -> int:
+        return self._take(">Q")
+
+    def boolean(self) -> bool:
+        return bool(self.u8())
+
+    def utf8(self) -> str:
+        length = self.u32()
+        if length == 0xFFFFFFFF:
+            return ""
+        raw = self.data[self.pos:self.pos + length]
+        if len(raw) != length:
+            raise struct.error("utf8 field runs past the end of the packet")
+        self.pos += length
+        return raw.decode("utf-8", errors="replace")
+
+
+def parse_header(data: bytes) -> Optional[tuple[int, str, _Reader]]:
+    """Return (message type, client id, reader at the first field), or None
+    if ``data`` is not a WSJT-X message."""
+    try:
+        reader = _Reader(data)
+        if reader.u32() != MAGIC:
+            return None
+        reader.u32()                 # schema: fields only ever get appended
+        msg_type = reader.u32()
+        return msg_type, reader.utf8(), reader
+    except struct.error:
+        return None
+
+
+def parse_status(client_id: str, reader: _Reader) -> Optional[WSJTXStatus]:
+    """Decode the body of a Status message (None if truncated)."""
+    try:
+        status = WSJTXStatus(client_id=client_id, dial_hz=reader.u64(), mode=reader.utf8())
+        status.dx_call = reader.utf8()
+        reader.utf8()                # report
+        reader.utf8()                # tx mode
+        status.tx_enabled = reader.boolean()
+        status.transmitting = reader.boolean()
+        status.decoding = reader.boolean()
+        status.rx_df = reader.u32()
+        status.tx_df = reader.u32()
+    except struct.error:
+        return None
+    return status
+
+
+# -- packet builders -----------------------------------------------------------
+
+def _utf8(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return struct.pack(">I", len(raw)) + raw
+
+
+def _header(msg_type: int, client_id: str) -> bytes:
+    return struct.pack(">III", MAGIC, SCHEMA, msg_type) + _utf8(client_id)
+
+
+def build_heartbeat(client_id: str = "WSJT-X", version: str = "2.6.1") -> bytes:
+    return _header(HEARTBEAT, client_id) + struct.pack(">I", SCHEMA) + _utf8(version) + _utf8("")
+
+
+def build_close(client_id: str = "WSJT-X") -> bytes:
+    return _header(CLOSE, client_id)
+
+
+def build_status(status: WSJTXStatus) -> bytes:
+    return (
+        _header(STATUS, status.client_id)
+        + struct.pack(">Q", status.dial_hz)
+        + _utf8(status.mode) + _utf8(status.dx_call) + _utf8("") + _utf8(status.mode)
+        + struct.pack(">???II", status.tx_enabled, status.transmitting, status.decoding,
+                      status.rx_df, status.tx_df)
+    )
+
+
+# -- listener ------------------------------------------------------------------
+
+class WSJTXListener:
+    """Receive WSJT-X broadcasts on a UDP port and update a ``StateCache``.
+
+    WSJT-X sends to one address (Settings → Reporting → UDP Server); to
+    share it with other programs point WSJT-X at a multicast group and
+    pass that group as ``group``.  The group is joined on the interface
+    the system picks, or on the one whose address is ``interface``.
+    """
+
+    def __init__(
+        self,
+        cache: StateCache,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        group: Optional[str] = None,
+        interface: Optional[str] = None,
+    ):
+        """
+        Args:
+            host: Address to listen on, when not joining ``group``.
+            group: Multicast group WSJT-X sends to.
+            interface: Local address of the interface to join ``group``
+                on (default: any).
+
+        Raises:
+            OSError: The port cannot be bound.
+        """
+        self.cache = cache
+        self.last_status: Optional[WSJTXStatus] = None
+        self.packets = 0
+        self.ignored = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if group is not None:
+            self._sock.bind(("", port))
+            local = "0.0.0.0" if interface is None else interface     # 0.0.0.0: INADDR_ANY
+            membership = socket.inet_aton(group) + socket.inet_aton(local)
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        else:
+            self._sock.bind((host, port))
+        self._sock.settimeout(RECV_POLL_INTERVAL)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ft1000mp-wsjtx", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "WSJTXListener":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sock.close()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        address: tuple[str, int] = self._sock.getsockname()
+        return address
+
+    @property
+    def running(self) -> bool:
+        """True if WSJT-X has been heard from and has not sent Close since."""
+        return self.cache.last_update(SOURCE) is not None
+
+    def handle(self, data: bytes) -> None:
+        """Apply one datagram to the cache (called by the receive thread)."""
+        header = parse_header(data)
+        if header is None:
+            self.ignored += 1
+            return
+        self.packets += 1
+        msg_type, client_id, reader = header
+        if msg_type == STATUS:
+            status = parse_status(client_id, reader)
+            if status is None:
+                self.ignored += 1
+                return
+            self.last_status = status
+            self.cache.update(
+                SOURCE, frequency_hz=status.dial_hz, transmitting=status.transmitting,
+                wsjtx_mode=status.mode, tx_df=status.tx_df,
+            )
+        elif msg_type == HEARTBEAT:
+            self.cache.update(SOURCE)
+        elif msg_type == CLOSE:
+            self.cache.forget_source(SOURCE)   # its fields stay, but it is no longer active
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data = self._sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.handle(data)
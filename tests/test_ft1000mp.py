@@ -10,16 +10,26 @@ Live tests only:     pytest tests/ -v -m live
 """
 
 import os
+import subprocess
+import sys
+import threading
 import time
+from pathlib import Path
 
 import pytest
 
 from ft1000mp.bcd import bytes_to_freq, freq_to_bytes
+from ft1000mp.emulator import EmulatedVFO, Emulator
 from ft1000mp.exceptions import (
+    CommandTimeoutError,
+    DeadlineExceeded,
+    InterlockError,
     InvalidFrequencyError,
     InvalidModeError,
+    PoolError,
     SerialConnectionError,
 )
+from ft1000mp.pool import RadioPool
 from ft1000mp.protocol import (
     MODE_BY_NAME,
     MODE_NAMES,
@@ -27,6 +37,7 @@ from ft1000mp.protocol import (
     Mode,
     Opcode,
     StatusFlag,
+    StatusTarget,
     VFO,
     cmd_clarifier,
     cmd_clarifier_offset,
@@ -62,6 +73,14 @@ from ft1000mp.transceiver import (
 SETTLE_TIME = 1.0  # seconds — radio needs settling between commands
 
 
+@pytest.fixture(autouse=True)
+def lock_dir(monkeypatch, tmp_path_factory):
+    """Per-test port lock directory, so radios a test leaves open don't leak."""
+    path = tmp_path_factory.mktemp("locks")
+    monkeypatch.setenv("FT1000MP_LOCK_DIR", str(path))
+    return path
+
+
 def radio_pause():
     """Wait for the radio to settle between commands."""
     time.sleep(SETTLE_TIME)
@@ -621,6 +640,2308 @@ class TestErrorHandling:
             radio.set_mode("INVALID")
 
 
+class TestStartupBudget:
+    """Import-time budget for one-shot invocations (cron, contest macros).
+
+    Each case runs in a fresh interpreter under ``-X importtime`` and is
+    held to a stated budget, best of a few runs so a busy CI box does
+    not fail it.  The budget is kept by not loading what is not needed,
+    which the module checks pin down: pyserial must not be imported
+    until a port is opened.
+    """
+
+    # Measured at ~1 ms and ~65 ms on a laptop; the rest is headroom
+    PACKAGE_IMPORT_BUDGET_MS = 25.0
+    CLI_HELP_BUDGET_MS = 250.0
+    RUNS = 5
+
+    # Loaded only by the features that need them
+    HEAVY = ("serial", "numpy", "asyncio", "multiprocessing", "socket",
+             "ft1000mp.archive", "ft1000mp.pool", "ft1000mp.spots", "ft1000mp.wsjtx")
+
+    def _import_ms(self, *args: str, module: "str | None" = None) -> float:
+        """Best-of-RUNS import time of ``python -X importtime *args``.
+
+        With ``module`` the cumulative time of that one import is taken,
+        otherwise the sum over every top-level import.
+        """
+        best = float("inf")
+        for _ in range(self.RUNS):
+            out = subprocess.run(
+                [sys.executable, "-X", "importtime", *args],
+                cwd=Path(__file__).resolve().parent.parent,
+                capture_output=True, text=True, check=True,
+            )
+            total = 0
+            for line in out.stderr.splitlines():
+                if not line.startswith("import time:") or "[us]" in line:
+                    continue
+                _, cumulative, name = line.split("|")
+                if (name.strip() == module) if module else not name.startswith("  "):
+                    total += int(cumulative)
+            best = min(best, total / 1000)
+        return best
+
+    def _loaded(self, statement: str) -> set[str]:
+        code = (
+            "import sys\n"
+            "before = set(sys.modules)\n"
+            f"{statement}\n"
+            "print(' '.join(sorted(set(sys.modules) - before)))\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, check=True,
+        )
+        return set(out.stdout.split())
+
+    def test_package_import_budget(self):
+        elapsed = self._import_ms("-c", "import ft1000mp", module="ft1000mp")
+        assert 0 < elapsed < self.PACKAGE_IMPORT_BUDGET_MS, f"import ft1000mp took {elapsed:.1f} ms"
+
+    def test_cli_help_budget(self):
+        elapsed = self._import_ms("cli.py", "--help")
+        assert 0 < elapsed < self.CLI_HELP_BUDGET_MS, f"cli --help imports took {elapsed:.1f} ms"
+
+    def test_package_import(self):
+        loaded = self._loaded("import ft1000mp")
+        assert {m for m in loaded if m.startswith("ft1000mp")} == {"ft1000mp"}
+        assert not loaded & set(self.HEAVY)
+
+    def test_transceiver_import(self):
+        loaded = self._loaded("from ft1000mp import FT1000MP")
+        assert "ft1000mp.transceiver" in loaded
+        assert not loaded & set(self.HEAVY)
+
+    def test_cli_import(self):
+        loaded = self._loaded("import cli")
+        assert "ft1000mp.transceiver" not in loaded
+        assert not loaded & set(self.HEAVY)
+
+    def test_lazy_attributes_resolve(self):
+        import ft1000mp
+
+        for name in ft1000mp.__all__:
+            assert getattr(ft1000mp, name) is not None
+        with pytest.raises(AttributeError):
+            ft1000mp.no_such_name
+
+
+# ===================================================================
+# EMULATOR TESTS — full stack against the in-memory emulator
+# ===================================================================
+
+
+@pytest.fixture
+def emulator():
+    return Emulator()
+
+
+@pytest.fixture
+def emulated(emulator, monkeypatch, tmp_path):
+    """FT1000MP wired to the emulator, with the disk cache in tmp_path."""
+    monkeypatch.setenv("FT1000MP_CACHE_DIR", str(tmp_path))
+    radio = FT1000MP(port="emulator")
+    radio._serial._ser = emulator
+    return radio
+
+
+class TestDumpMemories:
+    """dump_memories: one all-data transaction, parsed and cached on disk."""
+
+    def test_single_transaction(self, emulated, emulator):
+        emulator.memories[1] = EmulatedVFO(7_074_000, Mode.USB)
+        emulator.memories[99] = EmulatedVFO(14_025_000, Mode.CW)
+        dump = emulated.dump_memories()
+        assert emulator.frames == [cmd_status_update(0x00)]
+        assert len(dump.channels) == 99
+        assert dump.channels[1].frequency_hz == 7_074_000
+        assert dump.channels[99].mode == Mode.CW
+        assert dump.channels[50].frequency_hz == 0
+        assert dump.from_cache is False
+
+    def test_second_call_uses_cache(self, emulated, emulator):
+        emulator.memories[5] = EmulatedVFO(3_573_000, Mode.LSB)
+        first = emulated.dump_memories()
+        emulator.frames.clear()
+        second = emulated.dump_memories()
+        assert emulator.frames == []
+        assert second.from_cache is True
+        assert second.timestamp == first.timestamp
+        assert second.channels[5].frequency_hz == 3_573_000
+
+    def test_max_age_expires_cache(self, emulated, emulator):
+        emulated.dump_memories()
+        emulator.frames.clear()
+        dump = emulated.dump_memories(max_age=-1)
+        assert dump.from_cache is False
+        assert len(emulator.frames) == 1
+
+    def test_vfo_to_memory_invalidates_cache(self, emulated, emulator):
+        emulated.dump_memories()
+        emulated.set_frequency_a(21_074_000)
+        emulated.vfo_to_memory(7)
+        dump = emulated.dump_memories()
+        assert dump.from_cache is False
+        assert dump.channels[7].frequency_hz == 21_074_000
+
+
+class TestBatch:
+    """FT1000MP.batch: queued writes go out back to back on exit."""
+
+    def test_frames_sent_on_exit(self, emulated, emulator):
+        with emulated.batch():
+            emulated.set_frequency_a(7_074_000)
+            emulated.set_mode("USB")
+            assert emulator.frames == []
+        assert emulator.frames == [cmd_set_freq_a(7_074_000), cmd_set_mode(Mode.USB)]
+        assert emulator.vfo_a.frequency_hz == 7_074_000
+
+    def test_query_flushes_pending_writes(self, emulated, emulator):
+        with emulated.batch():
+            emulated.set_split(True)
+            flags = emulated.read_flags()
+        assert flags.split is True
+
+    def test_exception_discards_batch(self, emulated, emulator):
+        with pytest.raises(InvalidModeError):
+            with emulated.batch():
+                emulated.set_frequency_a(7_074_000)
+                emulated.set_mode("SSB")
+        assert emulator.frames == []
+
+    def test_nested_batch_joins_outer(self, emulated, emulator):
+        with emulated.batch():
+            emulated.set_split(True)
+            with emulated.batch():
+                emulated.set_clarifier(True)
+            assert emulator.frames == []
+        assert emulator.frames == [cmd_split(True), cmd_clarifier(True)]
+
+
+def _emulated_pool(n: int) -> tuple[RadioPool, list[Emulator]]:
+    emulators = [Emulator() for _ in range(n)]
+    radios = {}
+    for i, emu in enumerate(emulators):
+        radio = FT1000MP(port=f"emulator{i}")
+        radio._serial._ser = emu
+        radios[f"r{i}"] = radio
+    return RadioPool(radios), emulators
+
+
+class TestRadioPool:
+    """RadioPool: parallel fan-out and PTT interlock across radios."""
+
+    def test_tune_all(self):
+        pool, emulators = _emulated_pool(3)
+        with pool:
+            pool.tune_all(21_025_000, "CW")
+        for emu in emulators:
+            assert emu.vfo_a.frequency_hz == 21_025_000
+            assert emu.vfo_a.mode == Mode.CW
+
+    def test_fan_out_runs_in_parallel(self):
+        pool, _ = _emulated_pool(4)
+        with pool:
+            start = time.monotonic()
+            pool.run_all(lambda radio: [radio.set_split(True) for _ in range(4)])
+            elapsed = time.monotonic() - start
+        # 4 radios x 4 commands x ~30 ms pacing: ~0.12 s in parallel, ~0.5 s in series
+        assert elapsed < 0.3
+
+    def test_snapshot_all(self):
+        pool, emulators = _emulated_pool(2)
+        emulators[1].split = True
+        with pool:
+            snaps = pool.snapshot_all()
+        assert set(snaps) == {"r0", "r1"}
+        active, inactive, flags = snaps["r1"]
+        assert active.frequency_hz == emulators[1].vfo_a.frequency_hz
+        assert flags.split is True
+
+    def test_errors_are_collected(self):
+        pool, _ = _emulated_pool(2)
+        pool.radios["r1"]._serial._ser = None  # r1 is "unplugged"
+        with pytest.raises(PoolError) as info:
+            pool.run_all(lambda radio: radio.read_flags())
+        assert set(info.value.errors) == {"r1"}
+        assert set(info.value.results) == {"r0"}
+        pool.radios["r1"]._serial._ser = Emulator()
+        pool.close()
+
+    def test_ptt_interlock(self):
+        pool, emulators = _emulated_pool(2)
+        with pool:
+            pool.key("r0")
+            assert emulators[0].ptt is True
+            with pytest.raises(InterlockError):
+                pool.key("r1")
+            assert emulators[1].ptt is False
+            pool.key("r1", preempt=True)
+            assert emulators[0].ptt is False
+            assert emulators[1].ptt is True
+        # closing the pool unkeys whatever was transmitting
+        assert emulators[1].ptt is False
+
+    def test_close_closes_radios_when_unkey_fails(self):
+        pool, emulators = _emulated_pool(2)
+        pool.key("r0")
+        pool.radios["r0"]._serial._ser = None      # r0 is unplugged while keyed
+        with pytest.raises(PoolError):
+            pool.close()
+        assert emulators[1].is_open is False
+        assert pool.transmitting is None
+
+
+    def test_failed_open_closes_the_rest(self, monkeypatch):
+        pool, emulators = _emulated_pool(3)
+
+        def unplugged():
+            raise SerialConnectionError("r1 unplugged")
+
+        monkeypatch.setattr(pool.radios["r1"], "open", unplugged)
+        with pytest.raises(PoolError) as info:
+            with pool:
+                pass
+        assert set(info.value.errors) == {"r1"}
+        assert emulators[0].is_open is False
+        assert emulators[2].is_open is False
+        assert all(worker._shutdown for worker in pool._workers.values())
+
+    def test_key_skips_the_worker_queue(self):
+        pool, emulators = _emulated_pool(2)
+        gate = threading.Event()
+        with pool:
+            pool.submit("r0", lambda radio: gate.wait(5))     # r0's worker is busy
+            try:
+                start = time.monotonic()
+                pool.key("r0")
+                assert emulators[0].ptt is True
+                pool.unkey_all()
+                assert emulators[0].ptt is False
+                assert time.monotonic() - start < 1.0
+            finally:
+                gate.set()
+
+
+class _GatedEmulator(Emulator):
+    """CP210x-style adapter: RTS high blocks the CAT TX line."""
+
+    def write(self, data):
+        if self.rts:
+            return len(data)
+        return super().write(data)
+
+
+class _MuteDevice(Emulator):
+    """Some other serial device: opens fine, never answers CAT commands."""
+
+    def write(self, data):
+        return len(data)
+
+
+class _PortInfo:
+    def __init__(self, device, serial_number=None):
+        self.device = device
+        self.serial_number = serial_number
+
+
+@pytest.fixture
+def fake_ports(monkeypatch, tmp_path):
+    """Patch comports()/serial.Serial with a radio, a Digirig, a mute port and a busy one."""
+    import serial
+    import serial.tools.list_ports
+
+    monkeypatch.setenv("FT1000MP_CACHE_DIR", str(tmp_path))
+    opened = []
+
+    def factory(port=None, **kwargs):
+        if port == "/dev/busy":
+            raise serial.SerialException("busy")
+        device = {
+            "/dev/radio": Emulator,
+            "/dev/digirig": _GatedEmulator,
+            "/dev/gps": _MuteDevice,
+        }[port](port=port, **kwargs)
+        opened.append(port)
+        return device
+
+    monkeypatch.setattr(serial, "Serial", factory)
+    monkeypatch.setattr(serial.tools.list_ports, "comports", lambda: [
+        _PortInfo("/dev/radio", "A1"),
+        _PortInfo("/dev/digirig", "D1"),
+        _PortInfo("/dev/gps"),
+        _PortInfo("/dev/busy"),
+    ])
+    return opened
+
+
+class TestProbePorts:
+    """probe_ports: parallel, non-interactive radio discovery."""
+
+    def test_finds_radios_and_line_settings(self, fake_ports):
+        from ft1000mp.probe import probe_ports
+
+        found = probe_ports()
+        assert [(r.port, r.rts) for r in found] == [
+            ("/dev/digirig", False),
+            ("/dev/radio", None),
+        ]
+        assert found[1].frequency_hz == 14_195_000
+        assert found[1].serial_number == "A1"
+
+    def test_settings_cached_by_serial_number(self, fake_ports):
+        from ft1000mp import cache
+        from ft1000mp.probe import PROBE_CACHE, probe_ports
+
+        probe_ports()
+        known = cache.load(PROBE_CACHE)
+        assert known["D1"]["rts"] is False
+        assert known["A1"]["port"] == "/dev/radio"
+
+        # Second probe tries the cached RTS-off setting first: one open only
+        fake_ports.clear()
+        probe_ports(candidates=["/dev/digirig"])
+        assert fake_ports == ["/dev/digirig"]
+
+    def test_fast(self, fake_ports):
+        from ft1000mp.probe import probe_ports
+
+        start = time.monotonic()
+        probe_ports()
+        assert time.monotonic() - start < 1.0
+
+
+class TestSharedState:
+    """Shared-memory state block: owner publishes, readers get snapshots."""
+
+    @pytest.fixture
+    def block_name(self):
+        return f"ft1000mp_test_{os.getpid()}_{time.monotonic_ns()}"
+
+    def test_round_trip(self, emulated, emulator, block_name):
+        from ft1000mp.shared_state import FT1000MPStatePublisher, FT1000MPStateReader
+
+        emulator.split = True
+        emulator.vfo_a.clarifier_offset = -300
+        with FT1000MPStatePublisher(block_name) as pub:
+            seq = pub.update_from(emulated)
+            with FT1000MPStateReader(block_name) as reader:
+                state = reader.read()
+        assert state.sequence == seq
+        assert state.sequence % 2 == 0
+        assert state.vfo_a.frequency_hz == 14_195_000
+        assert state.vfo_a.clarifier_offset == -300
+        assert state.vfo_b.mode_name == "LSB"
+        assert state.flags.split is True
+
+    def test_labels_survive_vfo_b_selected(self, emulated, emulator, block_name):
+        from ft1000mp.shared_state import FT1000MPStatePublisher, FT1000MPStateReader
+
+        emulated.select_vfo("B")
+        with FT1000MPStatePublisher(block_name) as pub, FT1000MPStateReader(block_name) as reader:
+            pub.update_from(emulated)
+            state = reader.read()
+        assert state.vfo_a.frequency_hz == 14_195_000
+        assert state.vfo_b.frequency_hz == 7_074_000
+        assert (state.selected, state.confident) == ("B", True)
+
+    def test_partial_publish_keeps_last_values(self, block_name):
+        from ft1000mp.shared_state import FT1000MPStatePublisher, FT1000MPStateReader
+
+        with FT1000MPStatePublisher(block_name) as pub, FT1000MPStateReader(block_name) as reader:
+            assert reader.read().vfo_a is None
+            pub.publish(flags=RadioFlags.from_raw(0x20))
+            pub.publish(vfo_a=_parse_vfo_block(bytes(16)), vfo_b=_parse_vfo_block(bytes(16)))
+            state = reader.read()
+            assert state.flags.transmitting is True
+            assert state.vfo_a.frequency_hz == 0
+            assert reader.sequence == state.sequence
+
+    def test_reader_in_another_process(self, block_name):
+        from ft1000mp.shared_state import FT1000MPStatePublisher, FT1000MPStateReader
+
+        with FT1000MPStatePublisher(block_name) as pub:
+            pub.publish(flags=RadioFlags.from_raw(0x01))
+            code = (
+                "from ft1000mp.shared_state import FT1000MPStateReader\n"
+                f"r = FT1000MPStateReader({block_name!r})\n"
+                "print(r.read().flags.split)\n"
+                "r.close()\n"
+            )
+            out = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=Path(__file__).resolve().parent.parent,
+                capture_output=True, text=True, check=True,
+            )
+            assert out.stdout.strip() == "True"
+            # The reader exiting must not have removed the block
+            with FT1000MPStateReader(block_name) as reader:
+                assert reader.read().flags.split is True
+
+    def test_stuck_writer_detected(self, block_name, monkeypatch):
+        from ft1000mp import shared_state
+        from ft1000mp.exceptions import FT1000MPError
+
+        monkeypatch.setattr(shared_state, "READ_RETRIES", 10)
+        with shared_state.FT1000MPStatePublisher(block_name) as pub:
+            reader = shared_state.FT1000MPStateReader(block_name)
+            shared_state._SEQ.pack_into(pub._buf, shared_state._SEQ_OFFSET, 7)
+            with pytest.raises(FT1000MPError):
+                reader.read()
+            reader.close()
+
+    def test_running_owner_is_not_taken_over(self, block_name):
+        from ft1000mp import shared_state
+        from ft1000mp.exceptions import FT1000MPError
+
+        with shared_state.FT1000MPStatePublisher(block_name) as pub:
+            seq = pub.publish(flags=RadioFlags.from_raw(0x01))
+            with pytest.raises(FT1000MPError, match="running process"):
+                shared_state.FT1000MPStatePublisher(block_name)
+            # Once the owner has died, the next publisher takes over
+            dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                  capture_output=True, text=True, check=True)
+            pub._buf[16:20] = int(dead.stdout).to_bytes(4, "little")
+            heir = shared_state.FT1000MPStatePublisher(block_name)
+            assert heir.publish() > seq
+            heir.close(unlink=False)
+
+    def test_missing_block(self, block_name):
+        from ft1000mp.exceptions import FT1000MPError
+        from ft1000mp.shared_state import FT1000MPStateReader
+
+        with pytest.raises(FT1000MPError):
+            FT1000MPStateReader(block_name)
+
+
+class TestPTT:
+    """Urgent PTT path and the PTTController watchdog."""
+
+    def test_ptt_is_never_batched(self, emulated, emulator):
+        with emulated.batch():
+            emulated.set_split(True)
+            emulated.set_ptt(True)
+            assert emulator.frames == [cmd_split(True), cmd_ptt(True)]
+        assert emulator.ptt is True
+
+    def test_ptt_preempts_other_thread_batch(self, emulated, emulator):
+        import threading
+
+        frames = [cmd_split(i % 2 == 0) for i in range(20)]  # ~0.6 s of pacing
+        worker = threading.Thread(target=emulated._serial.send_commands, args=(frames,))
+        worker.start()
+        time.sleep(0.1)
+        emulated.set_ptt(True)
+        worker.join()
+        position = emulator.frames.index(cmd_ptt(True))
+        assert position < len(frames) // 2
+        assert len(emulator.frames) == len(frames) + 1
+
+    def test_yield_hands_the_lock_back(self):
+        import threading
+
+        from ft1000mp.serial_port import _PriorityLock
+
+        lock, order = _PriorityLock(), []
+
+        def take(name, urgent):
+            with lock.hold(urgent=urgent):
+                order.append(name)
+
+        with lock.hold():
+            threads = [threading.Thread(target=take, args=("normal", False)) for _ in range(8)]
+            threads.append(threading.Thread(target=take, args=("urgent", True)))
+            for thread in threads:
+                thread.start()
+                time.sleep(0.01)
+            lock.yield_to_urgent()
+            order.append("holder")
+        for thread in threads:
+            thread.join()
+        assert order == ["urgent", "holder"] + ["normal"] * 8
+
+    def test_latency_is_recorded(self, emulated, emulator):
+        from ft1000mp.ptt import PTTController
+
+        with PTTController(emulated) as ptt:
+            down = ptt.key_down()
+            assert emulator.ptt is True
+            up = ptt.key_up()
+        assert emulator.ptt is False
+        # one unpaced write, not 5 x 5 ms inter-byte sleeps
+        assert down < 0.02 and up < 0.02
+        stats = ptt.stats()
+        assert stats["key_down"]["count"] == 1
+        assert stats["key_up"]["max"] == up
+
+    def test_watchdog_time_limit(self, emulated, emulator):
+        from ft1000mp.ptt import TRIP_TIME_LIMIT, PTTController
+
+        tripped = []
+        with PTTController(emulated, max_transmit_s=0.1, interval=0.01,
+                           on_trip=tripped.append) as ptt:
+            ptt.key_down()
+            time.sleep(0.3)
+            assert emulator.ptt is False
+            assert ptt.transmitting is False
+        assert tripped == [TRIP_TIME_LIMIT]
+
+    def test_watchdog_heartbeat_loss(self, emulated, emulator):
+        from ft1000mp.ptt import TRIP_HEARTBEAT, PTTController
+
+        with PTTController(emulated, max_transmit_s=None, heartbeat_timeout_s=0.15,
+                           interval=0.01) as ptt:
+            ptt.key_down()
+            for _ in range(5):
+                time.sleep(0.05)
+                ptt.heartbeat()
+            assert emulator.ptt is True
+            time.sleep(0.3)
+            assert emulator.ptt is False
+            assert ptt.trips == [TRIP_HEARTBEAT]
+
+
+    def test_watchdog_survives_write_errors(self, emulated, emulator, caplog):
+        from ft1000mp.ptt import TRIP_TIME_LIMIT, PTTController
+
+        failures = [OSError("write failed")] * 3
+        write = emulator.write
+
+        def flaky_write(data):
+            if data == cmd_ptt(False) and failures:
+                raise failures.pop()
+            return write(data)
+
+        def bad_callback(reason):
+            raise RuntimeError("callback bug")
+
+        emulator.write = flaky_write
+        with PTTController(emulated, max_transmit_s=0.05, interval=0.01,
+                           on_trip=bad_callback) as ptt:
+            ptt.key_down()
+            assert _eventually(lambda: ptt.trips == [TRIP_TIME_LIMIT])
+            assert emulator.ptt is False and failures == []
+            assert isinstance(ptt.error, RuntimeError)
+            assert ptt._watchdog.is_alive()
+        assert "could not unkey: write failed" in caplog.text
+
+
+class TestDeadlines:
+    """Per-call timeouts bound the whole call and raise DeadlineExceeded."""
+
+    def test_not_a_command_timeout(self):
+        assert not issubclass(DeadlineExceeded, CommandTimeoutError)
+
+    def test_generous_timeout_succeeds(self, emulated, emulator):
+        emulated.set_frequency_a(7_074_000, timeout=1.0)
+        assert emulated.get_vfo_status(timeout=1.0).frequency_hz == 7_074_000
+
+    def test_deadline_cuts_retries_short(self, emulated):
+        emulated._serial._ser = _MuteDevice()
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            emulated.read_flags(timeout=0.15)
+        # default retries would take 6 x 0.4 s
+        assert time.monotonic() - start < 0.4
+
+    def test_retries_exhausted_is_command_timeout(self, emulated):
+        emulated._serial._ser = _MuteDevice()
+        emulated._serial.timeout = 0.01
+        emulated._serial.retries = 2
+        with pytest.raises(CommandTimeoutError):
+            emulated.read_flags(timeout=5.0)
+
+    def test_deadline_while_port_busy(self, emulated, emulator):
+        import threading
+
+        frames = [cmd_split(True)] * 10   # ~0.3 s holding the port
+        worker = threading.Thread(target=emulated._serial.send_commands, args=(frames,))
+        worker.start()
+        time.sleep(0.05)
+        with pytest.raises(DeadlineExceeded):
+            emulated.read_flags(timeout=0.05)
+        worker.join()
+        assert cmd_read_flags() not in emulator.frames
+
+
+class _Unpluggable(Emulator):
+    """Emulator whose USB adapter can be pulled and plugged back in."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.unplugged = False
+        self.failed_opens = 0   # opens that fail before it re-enumerates
+
+    def write(self, data):
+        if self.unplugged:
+            raise OSError(5, "Input/output error")
+        return super().write(data)
+
+
+@pytest.fixture
+def flaky_link(monkeypatch):
+    """Patch serial.Serial so every open returns the same _Unpluggable radio."""
+    import serial
+
+    link = _Unpluggable()
+    link.opened = []
+
+    def factory(port=None, **kwargs):
+        if link.failed_opens:
+            link.failed_opens -= 1
+            raise serial.SerialException("No such file or directory")
+        link.unplugged = False
+        link.is_open = True
+        link.rts = link.dtr = True   # a fresh handle has default line states
+        link.opened.append(port)
+        return link
+
+    monkeypatch.setattr(serial, "Serial", factory)
+    return link
+
+
+class TestReconnect:
+    """ReconnectingSerialPort: dropouts cost an outage, not a restart."""
+
+    FAST = dict(initial_delay=0.01, max_delay=0.02)
+
+    def _radio(self, policy, **kwargs):
+        from ft1000mp.reconnect import ReconnectPolicy
+
+        radio = FT1000MP(port="/dev/ttyUSB0", reconnect=ReconnectPolicy(**self.FAST, **policy),
+                         **kwargs)
+        radio.open()
+        return radio
+
+    def test_replays_interrupted_command(self, flaky_link):
+        radio = self._radio({})
+        flaky_link.unplugged = True
+        flaky_link.failed_opens = 2
+        radio.set_frequency_a(7_074_000)
+        assert flaky_link.vfo_a.frequency_hz == 7_074_000
+        [outage] = radio.outages
+        assert outage.recovered and outage.attempts == 3
+        assert "Input/output error" in outage.error
+
+    def test_fail_policy(self, flaky_link):
+        from ft1000mp.reconnect import FAIL
+
+        radio = self._radio({"on_outage": FAIL})
+        flaky_link.unplugged = True
+        with pytest.raises(SerialConnectionError):
+            radio.set_split(True)
+        assert flaky_link.split is False
+        radio.set_split(True)           # next call reconnects
+        assert flaky_link.split is True
+        assert len(radio.outages) == 1
+
+    def test_key_down_is_never_replayed(self, flaky_link):
+        radio = self._radio({})
+        flaky_link.unplugged = True
+        with pytest.raises(SerialConnectionError):
+            radio.set_ptt(True)
+        assert flaky_link.ptt is False
+
+    def test_replays_scheduled_batch(self, flaky_link):
+        radio = self._radio({})
+        flaky_link.unplugged = True
+        radio.at(time.time() + 0.05, [cmd_split(True)], max_late=1.0)
+        assert flaky_link.split is True
+        assert len(radio.outages) == 1
+
+    def test_restores_rts_dtr(self, flaky_link):
+        radio = self._radio({}, rts=False, dtr=False)
+        flaky_link.unplugged = True
+        radio.read_flags()
+        assert (flaky_link.rts, flaky_link.dtr) == (False, False)
+
+    def test_gives_up(self, flaky_link):
+        radio = self._radio({"give_up_after": 0.05})
+        flaky_link.unplugged = True
+        flaky_link.failed_opens = 10_000
+        with pytest.raises(SerialConnectionError):
+            radio.read_flags()
+        assert radio.outages[0].recovered is False
+        assert not radio._serial.connected
+
+    def test_waiting_for_a_reconnect_keeps_the_deadline(self, flaky_link):
+        radio = self._radio({"give_up_after": 3.0})
+        flaky_link.unplugged = True
+        flaky_link.failed_opens = 10_000
+        first = threading.Thread(target=radio.read_flags)   # reconnects, no deadline
+        first.start()
+        assert _eventually(lambda: radio._serial._reconnect_lock.locked())
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            radio.set_split(True, timeout=0.1)
+        assert time.monotonic() - start < 0.5
+        flaky_link.failed_opens = 0
+        first.join(2.0)
+        assert not first.is_alive()
+
+    def test_follows_by_id_link(self, flaky_link, monkeypatch, tmp_path):
+        from ft1000mp import reconnect
+
+        by_id = tmp_path / "by-id"
+        by_id.mkdir()
+        (tmp_path / "ttyUSB0").touch()
+        (tmp_path / "ttyUSB1").touch()
+        link = by_id / "usb-FTDI_FT232R-if00-port0"
+        link.symlink_to(tmp_path / "ttyUSB0")
+        monkeypatch.setattr(reconnect, "BY_ID_DIR", str(by_id))
+        monkeypatch.setattr(reconnect._by_id_link, "__defaults__", (str(by_id),))
+
+        port = reconnect.ReconnectingSerialPort(
+            str(tmp_path / "ttyUSB0"), reconnect.ReconnectPolicy(**self.FAST),
+        )
+        port.open()
+        link.unlink()
+        link.symlink_to(tmp_path / "ttyUSB1")    # adapter came back renamed
+        flaky_link.unplugged = True
+        port.send_command(cmd_split(True))
+        assert flaky_link.opened[-1] == str(tmp_path / "ttyUSB1")
+
+
+@pytest.fixture
+def tcp_radio():
+    """Local stand-in for ser2net: an emulator behind a TCP socket."""
+    import socket
+    import threading
+
+    server = socket.create_server(("127.0.0.1", 0))
+    emulator = Emulator()
+    emulator.chunks = []
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            while chunk := conn.recv(1024):
+                emulator.chunks.append(chunk)
+                emulator.write(chunk)
+                reply = emulator.read(emulator.in_waiting)
+                if reply:
+                    conn.sendall(reply)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"tcp://127.0.0.1:{server.getsockname()[1]}", emulator
+    server.close()
+    thread.join(timeout=1)
+
+
+class TestTransport:
+    """Pluggable transports: local serial, TCP, RFC2217, loopback."""
+
+    def test_transport_chosen_from_port(self):
+        from ft1000mp import transport
+
+        assert isinstance(transport.transport_for("/dev/ttyUSB0"), transport.LocalSerialTransport)
+        assert isinstance(transport.transport_for("tcp://shack:3001"), transport.TCPTransport)
+        assert isinstance(transport.transport_for("rfc2217://shack:2217"),
+                          transport.RFC2217Transport)
+        assert isinstance(transport.transport_for("loop://"), transport.LoopbackTransport)
+
+    def test_bad_address(self):
+        with pytest.raises(SerialConnectionError):
+            FT1000MP(port="tcp://no-port-here").open()
+
+    def test_transport_is_abstract(self):
+        from ft1000mp.transport import Transport
+
+        with pytest.raises(TypeError):
+            Transport()
+
+    def test_line_control_failure_is_wrapped(self):
+        from ft1000mp.transport import LoopbackTransport
+
+        class NoLines(Emulator):
+            def __setattr__(self, name, value):
+                if name == "dtr" and hasattr(self, "dtr"):
+                    raise OSError("Inappropriate ioctl for device")
+                super().__setattr__(name, value)
+
+        class NoLinesTransport(LoopbackTransport):
+            def open(self, port, baudrate, timeout):
+                self.emulator = NoLines(port=port, timeout=timeout)
+                return self.emulator
+
+        transport = NoLinesTransport()
+        port = SerialPort(port="loop://", transport=transport, dtr=False)
+        with pytest.raises(SerialConnectionError, match="ioctl"):
+            port.open()
+        assert not port.is_open and port.lock_holder() is None
+        assert transport.emulator.is_open is False
+
+    def test_loopback_injected(self):
+        from ft1000mp.transport import LoopbackTransport
+
+        loop = LoopbackTransport()
+        with FT1000MP(port="loop://", transport=loop) as radio:
+            start = time.monotonic()
+            for _ in range(10):
+                radio.set_split(True)
+            elapsed = time.monotonic() - start
+            assert radio.read_flags().split is True
+        assert loop.emulator.frames[0] == cmd_split(True)
+        # unpaced: ~5 ms per frame instead of ~30 ms
+        assert elapsed < 0.15
+
+    def test_tcp_round_trip(self, tcp_radio):
+        import socket
+
+        url, emulator = tcp_radio
+        with FT1000MP(port=url) as radio:
+            radio.set_frequency_a(21_074_000)
+            status = radio.get_vfo_status()
+            sock = radio._serial._ser._sock
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert status.frequency_hz == 21_074_000
+        # whole-frame writes, not one segment per byte
+        assert emulator.chunks[0] == cmd_set_freq_a(21_074_000)
+
+    def test_tcp_read_timeout(self, tcp_radio):
+        url, emulator = tcp_radio
+        emulator.write = lambda data: len(data)   # stops answering
+        radio = FT1000MP(port=url)
+        radio._serial.timeout = 0.05
+        radio._serial.retries = 2
+        with radio:
+            with pytest.raises(CommandTimeoutError):
+                radio.read_flags()
+
+
+class TestWireProfiler:
+    """WireProfiler: per-opcode split of pacing, wire, first byte and read."""
+
+    def test_breakdown(self, emulated):
+        from ft1000mp.profiler import WireProfiler
+
+        emulated.profiler = WireProfiler()
+        emulated.set_frequency_a(7_074_000)
+        emulated.read_flags()
+        emulated.read_flags()
+        stats = emulated.profiler.stats
+        assert set(stats) == {(Opcode.SET_FREQ_A, 0), (Opcode.READ_FLAGS, 5)}
+        flags = stats[(Opcode.READ_FLAGS, 5)]
+        assert flags.count == 2
+        # 5 x 5 ms inter-byte + 5 ms post-command, per call
+        assert flags.pacing_s >= 2 * 0.030
+        assert flags.wire_s == pytest.approx(2 * 10 * 11 / 4800)
+        assert flags.retries == 0 and flags.failures == 0
+        assert flags.total_s >= flags.pacing_s + flags.first_byte_s + flags.read_s
+
+    def test_timed_read_keeps_to_the_timeout(self):
+        class SlowFirstByte(Emulator):
+            timeouts = []
+
+            def read(self, size=1):
+                self.timeouts.append(self.timeout)
+                if size == 1:
+                    time.sleep(0.05)
+                return super().read(size)
+
+        ser = SlowFirstByte(timeout=0.2)
+        ser._tx += bytes(5)
+        data, waited, _ = SerialPort._timed_read(ser, 5, 0.2)
+        assert data == bytes(5) and waited >= 0.05
+        assert ser.timeouts[0] == 0.2
+        assert ser.timeouts[1] <= 0.2 - 0.05
+        assert ser.timeout == 0.2
+
+    def test_batches_and_failures(self, emulated):
+        from ft1000mp.profiler import WireProfiler
+
+        emulated.profiler = WireProfiler()
+        with emulated.batch():
+            emulated.set_split(True)
+            emulated.set_clarifier(True)
+        emulated._serial._ser = _MuteDevice()
+        emulated._serial.timeout = 0.01
+        emulated._serial.retries = 2
+        with pytest.raises(CommandTimeoutError):
+            emulated.read_flags()
+        stats = emulated.profiler.stats
+        assert stats[(Opcode.SPLIT, 0)].count == 1
+        assert stats[(Opcode.READ_FLAGS, 5)].failures == 1
+        assert stats[(Opcode.READ_FLAGS, 5)].retries == 1
+
+    def test_report(self, emulated):
+        from ft1000mp.profiler import WireProfiler
+
+        emulated.profiler = WireProfiler()
+        assert emulated.profiler.report() == "No commands profiled."
+        emulated.get_vfo_status()
+        report = emulated.profiler.report()
+        assert "STATUS_UPDATE" in report and "1st byte" in report
+
+    def test_off_by_default(self, emulated):
+        assert emulated.profiler is None
+        emulated.read_flags()
+
+
+class _SlowEmulator(Emulator):
+    """Ignores any frame that arrives while it is still busy with a setter."""
+
+    BUSY = {Opcode.SET_FREQ_A: 0.06}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._busy_until = 0.0
+
+    def _handle(self, frame):
+        now = time.monotonic()
+        if now < self._busy_until:
+            return  # dropped: the radio was not listening
+        self._busy_until = now + self.BUSY.get(frame[4], 0.0)
+        super()._handle(frame)
+
+
+class TestTimingTable:
+    """Per-opcode pacing: lookup, calibration, profiles."""
+
+    def test_default_for_unlisted_opcodes(self):
+        from ft1000mp.serial_port import INTER_BYTE_DELAY, POST_COMMAND_DELAY
+        from ft1000mp.timing import OpcodeTiming, TimingTable
+
+        table = TimingTable(OpcodeTiming(INTER_BYTE_DELAY, POST_COMMAND_DELAY))
+        table[Opcode.READ_FLAGS] = OpcodeTiming(0.001, 0.0)
+        assert table[Opcode.READ_FLAGS].settle == 0.0
+        assert table[Opcode.SET_FREQ_A].settle == POST_COMMAND_DELAY
+
+    def test_settle_applied_per_opcode(self, emulated):
+        from ft1000mp.timing import OpcodeTiming
+
+        emulated._serial.timing[Opcode.SPLIT] = OpcodeTiming(0.005, 0.2)
+        start = time.monotonic()
+        emulated.read_flags()
+        assert time.monotonic() - start < 0.1
+        start = time.monotonic()
+        emulated.set_split(True)
+        assert time.monotonic() - start >= 0.2
+
+    def test_calibrate(self, emulated, monkeypatch):
+        from ft1000mp import timing
+        from ft1000mp.timing import calibrate
+
+        monkeypatch.setattr(timing, "RECOVERY_TIME", 0.01)
+        emulated._serial._ser = _SlowEmulator()
+        emulated._serial.timeout = 0.02
+        table = calibrate(
+            emulated._serial,
+            frames={
+                Opcode.SET_FREQ_A: (cmd_set_freq_a(14_195_000), 0),
+                Opcode.READ_FLAGS: (cmd_read_flags(), 5),
+            },
+            trials=2,
+            candidates=(0.1, 0.05, 0.01, 0.0),
+        )
+        assert table[Opcode.SET_FREQ_A].settle >= 0.05
+        assert table[Opcode.READ_FLAGS].settle == 0.0
+        assert emulated._serial.retries == 6   # restored
+
+    def test_calibration_frames_restore_state(self, emulated, emulator):
+        from ft1000mp.timing import calibration_frames
+
+        emulator.vfo_b_selected = True   # A/B must still come out right
+        frames = calibration_frames(emulated._serial)
+        assert frames[Opcode.SET_FREQ_A][0] == cmd_set_freq_a(emulator.vfo_a.frequency_hz)
+        assert frames[Opcode.SET_FREQ_B][0] == cmd_set_freq_b(emulator.vfo_b.frequency_hz)
+        assert frames[Opcode.SPLIT] == (cmd_split(False), 0)
+        assert frames[Opcode.SET_MODE] == (cmd_set_mode(Mode.USB), 0)
+
+    def test_calibration_leaves_sub_modes_alone(self, emulated, emulator):
+        from ft1000mp.timing import calibration_frames
+
+        emulator.vfo_a.mode = Mode.CW          # sub-mode bit clear: reads as CW-R
+        assert emulated.get_vfo_status().mode_name == "CW-R"
+        frames = calibration_frames(emulated._serial)
+        assert Opcode.SET_MODE not in frames
+
+    def test_profile_applied_on_open(self, monkeypatch, tmp_path):
+        from ft1000mp.timing import OpcodeTiming, TimingTable, load_profile
+
+        monkeypatch.setenv("FT1000MP_CACHE_DIR", str(tmp_path))
+        with FT1000MP(port="loop://") as radio:
+            table = radio.calibrate_timing(trials=1)
+        assert load_profile("loop://") == table
+        with FT1000MP(port="loop://") as radio:
+            assert radio._serial.timing == table
+
+        path = tmp_path / "profile.json"
+        custom = TimingTable(OpcodeTiming(0.001, 0.002), {Opcode.PTT: OpcodeTiming(0.0, 0.0)})
+        custom.save(str(path))
+        assert TimingTable.load(str(path)) == custom
+
+
+class TestSweeps:
+    """glide / sweep_clarifier: keep the slew rate, drop steps when behind."""
+
+    def test_glide_drops_steps_and_ends_on_time(self, emulated, emulator):
+        # 10 kHz at 20 kHz/s = 0.5 s and 1001 steps; the link manages ~30/s
+        result = emulated.glide(14_000_000, 14_010_000, 20_000)
+        assert emulator.vfo_a.frequency_hz == 14_010_000
+        assert result.elapsed < 0.7
+        assert result.steps_dropped > 900
+        assert result.steps_total == 1001
+        assert result.achieved_rate == pytest.approx(result.steps_sent / result.elapsed)
+        sent = [f for f in emulator.frames if f[4] == Opcode.SET_FREQ_A]
+        assert sent[0] == cmd_set_freq_a(14_000_000)
+        from ft1000mp.bcd import bcd_bytes_to_freq
+
+        freqs = [bcd_bytes_to_freq(f[3::-1]) for f in sent]   # SET frames are little-endian
+        assert freqs == sorted(freqs)
+
+    def test_glide_down(self, emulated, emulator):
+        result = emulated.glide(7_010_000, 7_009_000, 10_000)
+        assert emulator.vfo_a.frequency_hz == 7_009_000
+        assert result.steps_total == 101
+
+    def test_sweep_clarifier_every_step(self, emulated, emulator):
+        result = emulated.sweep_clarifier(-100, 100, 50)
+        assert emulator.frames == [cmd_clarifier_offset(v) for v in (-100, -50, 0, 50, 100)]
+        assert (result.steps_sent, result.steps_dropped) == (5, 0)
+
+    def test_sweep_clarifier_rate_limited(self, emulated, emulator):
+        result = emulated.sweep_clarifier(0, 1000, 10, rate_hz_per_s=5000)
+        assert emulator.frames[-1] == cmd_clarifier_offset(1000)
+        assert result.steps_dropped > 0
+        assert result.elapsed < 0.4
+
+    def test_validation(self, emulated):
+        with pytest.raises(InvalidFrequencyError):
+            emulated.glide(14_000_000, 31_000_000, 1000)
+        with pytest.raises(ValueError):
+            emulated.glide(14_000_000, 14_001_000, 0)
+        with pytest.raises(ValueError):
+            emulated.sweep_clarifier(0, 20_000, 10)
+
+
+class TestBandPlan:
+    """Band-plan index: bisect lookup, plan files, auto_mode tuning."""
+
+    def test_classify(self):
+        from ft1000mp.bandplan import REGION_2
+
+        assert REGION_2.classify(14_025_000).kind == "CW"
+        assert REGION_2.classify(14_074_000).kind == "DIGITAL"
+        assert REGION_2.classify(14_070_000).kind == "DIGITAL"   # shared edge goes up
+        assert REGION_2.classify(14_350_000).kind == "PHONE"
+        assert REGION_2.mode_for(3_750_000) == "LSB"
+        assert REGION_2.mode_for(21_300_000) == "USB"
+        assert REGION_2.band(10_136_000) == "30m"
+        assert REGION_2.classify(14_350_010) is None
+        assert REGION_2.classify(5_000_000) is None
+        assert REGION_2.classify(100_000) is None
+
+    def test_rejects_overlap(self):
+        from ft1000mp.bandplan import BandPlan, Segment
+
+        with pytest.raises(ValueError):
+            BandPlan([
+                Segment("20m", 14_000_000, 14_080_000, "CW", "CW"),
+                Segment("20m", 14_070_000, 14_150_000, "DIGITAL", "USB"),
+            ])
+        with pytest.raises(ValueError):
+            BandPlan([Segment("20m", 14_000_000, 14_070_000, "CW", "SSB")])
+
+    def test_file_round_trip(self, tmp_path):
+        from ft1000mp.bandplan import REGION_2, BandPlan
+
+        path = tmp_path / "r2.json"
+        REGION_2.save(str(path))
+        plan = BandPlan.load(str(path))
+        assert plan.segments == REGION_2.segments
+        assert plan.name == REGION_2.name
+
+    def test_region_file(self, tmp_path):
+        import json
+
+        from ft1000mp.bandplan import BandPlan
+
+        path = tmp_path / "r1.json"
+        path.write_text(json.dumps({"name": "Region 1 (part)", "segments": [
+            {"band": "40m", "start_hz": 7_000_000, "stop_hz": 7_040_000, "kind": "cw", "mode": "cw"},
+            {"band": "40m", "start_hz": 7_040_000, "stop_hz": 7_060_000,
+             "kind": "digital", "mode": "usb"},
+            {"band": "40m", "start_hz": 7_060_000, "stop_hz": 7_200_000, "kind": "phone", "mode": "lsb"},
+        ]}))
+        plan = BandPlan.load(str(path))
+        assert plan.mode_for(7_100_000) == "LSB"
+        assert len(plan) == 3
+
+    def test_auto_mode_batches_mode_change(self, emulated, emulator):
+        emulated.set_frequency_a(14_025_000, auto_mode=True)
+        assert emulator.frames == [cmd_set_freq_a(14_025_000), cmd_set_mode(Mode.CW)]
+        assert emulator.vfo_a.mode == Mode.CW
+        emulator.frames.clear()
+        emulated.set_frequency_b(7_200_000, auto_mode=True)
+        assert emulator.frames == [cmd_set_freq_b(7_200_000), cmd_set_mode(Mode.LSB, vfo_b=True)]
+
+    def test_auto_mode_with_lower_case_plan(self, emulated, emulator):
+        from ft1000mp.bandplan import BandPlan, Segment
+
+        emulated.band_plan = BandPlan([Segment("20m", 14_000_000, 14_070_000, "CW", "cw")])
+        emulated.set_frequency_a(14_025_000, auto_mode=True)
+        assert emulator.frames == [cmd_set_freq_a(14_025_000), cmd_set_mode(Mode.CW)]
+
+    def test_auto_mode_outside_plan(self, emulated, emulator):
+        emulated.set_frequency_a(5_000_000, auto_mode=True)
+        assert emulator.frames == [cmd_set_freq_a(5_000_000)]
+
+
+def _history(n: int, t0: float = 1_700_000_000.0):
+    """A QSO-ish history: parked on a frequency, then a few QSYs."""
+    rows = []
+    for i in range(n):
+        freq = 14_074_000 if i < n // 2 else 14_025_000 + (i // 50) * 500
+        mode = Mode.USB if i < n // 2 else Mode.CW
+        vfo_a = VFOStatus(freq, mode, "USB" if mode == Mode.USB else "CW",
+                          (i % 7) * 10 - 30, i % 3 == 0, False)
+        vfo_b = VFOStatus(7_030_000, Mode.CW, "CW-R", 0, False, False) if i % 10 else None
+        flags = RadioFlags.from_raw(StatusFlag.SPLIT if i % 100 < 50 else 0)
+        rows.append((t0 + i * 0.1, vfo_a, vfo_b, flags))
+    return rows
+
+
+class TestArchive:
+    """Columnar status archive: encoding round trip, time index, NumPy."""
+
+    def test_round_trip(self, tmp_path):
+        from ft1000mp.archive import ArchiveReader, ArchiveWriter
+
+        path = str(tmp_path / "h.f1ma")
+        history = _history(1000)
+        with ArchiveWriter(path, chunk_rows=128) as writer:
+            for row in history:
+                writer.append(*row)
+        with ArchiveReader(path) as reader:
+            assert len(reader) == 1000
+            assert len(reader.chunks) == 8
+            got = [(r.timestamp, r.vfo_a, r.vfo_b, r.flags) for r in reader.rows()]
+        assert got == history
+
+    def test_mode_names_survive(self, tmp_path):
+        from ft1000mp.archive import ArchiveReader, ArchiveWriter
+        from ft1000mp.transceiver import _parse_vfo_block
+
+        path = str(tmp_path / "h.f1ma")
+        blocks = [
+            bytes([0, 0, 0x22, 0x5D, 0xC0, 0, 0, mode | user, sub, 0, 0, 0, 0, 0, 0, 0])
+            for mode in (Mode.CW, Mode.AM, Mode.RTTY, Mode.PKT)
+            for sub in (0, 0x80)
+            for user in (0, 0x80)
+        ]
+        statuses = [_parse_vfo_block(b) for b in blocks]
+        with ArchiveWriter(path) as writer:
+            for i, vfo in enumerate(statuses):
+                writer.append(float(i), vfo)
+        with ArchiveReader(path) as reader:
+            assert [r.vfo_a for r in reader.rows()] == statuses
+
+    def test_time_range_skips_chunks(self, tmp_path, monkeypatch):
+        from ft1000mp.archive import ArchiveReader, ArchiveWriter
+
+        path = str(tmp_path / "h.f1ma")
+        history = _history(1000)
+        with ArchiveWriter(path, chunk_rows=100) as writer:
+            for row in history:
+                writer.append(*row)
+        reader = ArchiveReader(path)
+        decoded = []
+        original = reader._raw_columns
+        monkeypatch.setattr(reader, "_raw_columns", lambda c: decoded.append(c) or original(c))
+        start, end = history[450][0], history[520][0]
+        got = list(reader.rows(start, end))
+        assert [r.timestamp for r in got] == [h[0] for h in history[450:521]]
+        assert [c.offset for c in decoded] == [c.offset for c in reader.chunks[4:6]]
+        reader.close()
+
+    def test_numpy_arrays_match_rows(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        from ft1000mp.archive import ArchiveReader, ArchiveWriter, HAS_VFO_B, RIT
+
+        path = str(tmp_path / "h.f1ma")
+        history = _history(1000)
+        with ArchiveWriter(path, chunk_rows=256) as writer:
+            for row in history:
+                writer.append(*row)
+        with ArchiveReader(path) as reader:
+            start, end = history[100][0], history[899][0]
+            chunks = list(reader.iter_arrays(start, end))
+        arrays = {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+        expected = history[100:900]
+        assert arrays["freq_a"].tolist() == [h[1].frequency_hz for h in expected]
+        assert arrays["clar_a"].tolist() == [h[1].clarifier_offset for h in expected]
+        assert arrays["mode_a"].tolist() == [h[1].mode for h in expected]
+        assert ((arrays["bits_a"] & RIT) > 0).tolist() == [h[1].rit for h in expected]
+        assert ((arrays["present"] & HAS_VFO_B) > 0).tolist() == [h[2] is not None for h in expected]
+        assert arrays["flags"].tolist() == [h[3].raw for h in expected]
+        assert np.allclose(arrays["time"], [h[0] for h in expected])
+
+    def test_smaller_than_json_lines(self, tmp_path):
+        import json
+        from dataclasses import asdict
+
+        from ft1000mp.archive import ArchiveWriter
+
+        path = tmp_path / "h.f1ma"
+        history = _history(5000)
+        with ArchiveWriter(str(path)) as writer:
+            for row in history:
+                writer.append(*row)
+        jsonl = "".join(
+            json.dumps({"t": t, "a": asdict(a), "b": b and asdict(b), "flags": asdict(f)}) + "\n"
+            for t, a, b, f in history
+        )
+        assert path.stat().st_size * 20 < len(jsonl)
+
+    def test_append_and_torn_tail(self, tmp_path):
+        from ft1000mp.archive import ArchiveReader, ArchiveWriter
+
+        path = tmp_path / "h.f1ma"
+        history = _history(300)
+        with ArchiveWriter(str(path), chunk_rows=100) as writer:
+            for row in history[:150]:
+                writer.append(*row)
+        # A second session that dies mid-chunk: no index, torn last chunk.
+        writer = ArchiveWriter(str(path), chunk_rows=100)
+        for row in history[150:250]:
+            writer.append(*row)
+        writer.flush()
+        writer._f.write(b"CHNK\x05")
+        writer._f.flush()
+        with ArchiveReader(str(path)) as reader:
+            assert len(reader) == 250
+        with ArchiveWriter(str(path), chunk_rows=100) as writer:
+            with pytest.raises(ValueError):
+                writer.append(history[0][0], history[0][1])
+            for row in history[250:]:
+                writer.append(*row)
+        with ArchiveReader(str(path)) as reader:
+            assert [r.timestamp for r in reader.rows()] == [h[0] for h in history]
+
+    def test_not_an_archive(self, tmp_path):
+        from ft1000mp.archive import ArchiveReader
+        from ft1000mp.exceptions import ArchiveError
+
+        path = tmp_path / "x.bin"
+        path.write_bytes(b"hello world")
+        with pytest.raises(ArchiveError):
+            ArchiveReader(str(path))
+
+
+def _eventually(predicate, timeout: float = 2.0) -> bool:
+    """Poll ``predicate`` until it is true or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestQSYEngine:
+    """Spot parsing, rules, and the coalescing tuning queue."""
+
+    def test_parse_spot(self):
+        from ft1000mp.spots import parse_spot
+
+        spot = parse_spot("DX de W3LPL-#:   14025.0  K1ABC   CW 23 dB 25 WPM CQ   1759Z")
+        assert (spot.frequency_hz, spot.dx_call, spot.spotter) == (14_025_000, "K1ABC", "W3LPL-#")
+        assert (spot.mode, spot.snr_db) == ("CW", 23)
+        assert parse_spot("DX de EA1ABC: 7155.0 ON4XYZ SSB up 5 1200Z").mode == "LSB"
+        assert parse_spot("DX de K1TTT: 14074.0 JA1XX FT8 -12 dB 0000Z").snr_db == -12
+        assert parse_spot("DX de N0XX: 21010.0 3b8cf").mode is None
+        assert parse_spot("WWV de VE7CC <18>:   SFI=70, A=5") is None
+
+    def test_rules(self, emulated):
+        from ft1000mp.spots import QSYEngine, SpotRule, parse_spot
+
+        rules = [
+            SpotRule(exclude=True, calls=r"/B$"),
+            SpotRule(priority=10, bands={"20m"}, modes={"CW"}, min_snr_db=10),
+            SpotRule(priority=1, bands={"20m", "40m"}),
+        ]
+        with QSYEngine(emulated, rules) as engine:
+            assert engine.priority(parse_spot("DX de A1A: 14025.0 K1ABC CW 20 dB")) == 10
+            assert engine.priority(parse_spot("DX de A1A: 14025.0 K1ABC CW 5 dB")) == 1
+            assert engine.priority(parse_spot("DX de A1A: 14025.0 K1ABC/B CW 20 dB")) is None
+            assert engine.priority(parse_spot("DX de A1A: 21025.0 K1ABC CW 20 dB")) is None
+
+    def test_burst_is_coalesced(self, emulated, emulator):
+        from ft1000mp.spots import QSYEngine, SpotRule
+
+        rules = [SpotRule(priority=5, calls="^DL"), SpotRule(priority=1)]
+        with QSYEngine(emulated, rules, min_interval=0.3) as engine:
+            engine.feed("DX de A1A: 14010.0 W1AW CW")
+            assert _eventually(lambda: engine.stats().tuned == 1)
+            for i in range(20):
+                engine.feed(f"DX de A1A: {14030 + i}.0 K1ABC CW")
+                engine.feed(f"DX de A1A: {14060 + i}.0 DL1XX CW")
+            assert _eventually(lambda: engine.stats().tuned == 3)
+            stats = engine.stats()
+        # Only the newest spot of each call reached the radio, DL first.
+        freqs = [f for f in emulator.frames if f[4] == Opcode.SET_FREQ_A]
+        assert freqs == [
+            cmd_set_freq_a(14_010_000), cmd_set_freq_a(14_079_000), cmd_set_freq_a(14_049_000),
+        ]
+        assert stats.superseded == 38
+        assert stats.received == 41
+        assert stats.latency_max_s >= 0.3 and stats.tunes_per_s > 0
+        assert emulator.vfo_a.mode == Mode.CW
+
+    def test_stale_and_duplicate(self, emulated, emulator):
+        from ft1000mp.spots import QSYEngine, parse_spot
+
+        with QSYEngine(emulated, max_age=5.0, min_interval=0.0) as engine:
+            engine.feed(parse_spot("DX de A1A: 14025.0 K1ABC CW", received=time.monotonic() - 10))
+            engine.feed("DX de A1A: 7030.0 K2ABC CW")
+            assert _eventually(lambda: engine.stats().tuned == 1)
+            engine.feed("DX de B1B: 7030.0 K2ABC CW")
+            assert _eventually(lambda: engine.stats().duplicate == 1)
+            stats = engine.stats()
+        assert stats.stale == 1
+        assert emulator.vfo_a.frequency_hz == 7_030_000
+
+    def test_queue_is_bounded(self, emulated):
+        from ft1000mp.spots import QSYEngine
+
+        with QSYEngine(emulated, min_interval=60, max_queued=3) as engine:
+            engine.feed("DX de A1A: 14010.0 W1AW CW")
+            assert _eventually(lambda: engine.stats().tuned == 1)
+            for i in range(100):
+                engine.feed(f"DX de A1A: {14020 + i % 10}.0 K{i % 10}ABC CW")
+                assert len(engine._heap) <= 2 * engine.max_queued
+            stats = engine.stats()
+        assert stats.dropped > 0 and len(engine._pending) <= 2 * engine.max_queued
+
+    def test_failures_are_recorded(self, emulated, emulator, tmp_path):
+        from ft1000mp.spots import QSYEngine
+
+        with QSYEngine(emulated, min_interval=0.0) as engine:
+            tune = engine._tune
+
+            def broken(spot):
+                raise RuntimeError("bug")
+
+            engine._tune = broken
+            engine.feed("DX de A1A: 14025.0 K1ABC CW")
+            assert _eventually(lambda: engine.stats().failed == 1)
+            assert isinstance(engine.error, RuntimeError)
+            engine._tune = tune                  # the tuning thread carried on
+            engine.feed("DX de A1A: 7030.0 K2ABC CW")
+            assert _eventually(lambda: emulator.vfo_a.frequency_hz == 7_030_000)
+            engine.follow_file(str(tmp_path))    # a directory: open() fails
+            assert _eventually(lambda: isinstance(engine.error, IsADirectoryError))
+
+    def test_auto_mode_without_mode_hint(self, emulated, emulator):
+        from ft1000mp.spots import QSYEngine
+
+        with QSYEngine(emulated) as engine:
+            engine.feed("DX de A1A: 3750.0 K1ABC")
+            assert _eventually(lambda: engine.stats().tuned == 1)
+        assert emulator.vfo_a.mode == Mode.LSB
+
+    def test_udp_feed(self, emulated, emulator):
+        import socket
+
+        from ft1000mp.spots import QSYEngine
+
+        with QSYEngine(emulated) as engine:
+            address = engine.listen_udp()
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx:
+                tx.sendto(b"DX de A1A: 21025.0 K1ABC CW 1200Z\r\nnot a spot\r\n", address)
+            assert _eventually(lambda: emulator.vfo_a.frequency_hz == 21_025_000)
+
+    def test_file_tail(self, emulated, emulator, tmp_path):
+        from ft1000mp.spots import QSYEngine
+
+        path = tmp_path / "spots.txt"
+        path.write_text("DX de A1A: 28025.0 OLD1 CW\n")
+        with QSYEngine(emulated) as engine:
+            engine.follow_file(str(path))
+            time.sleep(0.1)
+            with open(path, "a") as f:
+                f.write("DX de A1A: 18080.0 K1ABC CW\nDX de A1A: 180")
+            assert _eventually(lambda: emulator.vfo_a.frequency_hz == 18_080_000)
+            with open(path, "a") as f:
+                f.write("90.0 K2ABC CW\n")
+            assert _eventually(lambda: emulator.vfo_a.frequency_hz == 18_090_000)
+            assert engine.stats().received == 2
+
+
+class TestStateCache:
+    """radio.state, the WSJT-X listener, and the backing-off poller."""
+
+    def test_reads_update_cache(self, emulated, emulator):
+        from ft1000mp.state import CAT
+
+        emulated.get_both_vfo_status()
+        emulated.read_flags()
+        obs = emulated.state.observation("frequency_hz")
+        assert (obs.value, obs.source) == (14_195_000, CAT)
+        assert emulated.state.get("inactive_vfo").frequency_hz == 7_074_000
+        assert emulated.state.get("transmitting") is False
+        assert emulated.state.get("frequency_hz", max_age=-1) is None
+        assert emulated.state.external_age() is None
+
+    def test_status_packet(self):
+        from ft1000mp.state import StateCache
+        from ft1000mp.wsjtx import WSJTXStatus, build_status, parse_header, parse_status
+
+        packet = build_status(WSJTXStatus("WSJT-X", 14_074_000, "FT8", "K1ABC",
+                                          tx_enabled=True, transmitting=True, tx_df=1500))
+        msg_type, client_id, reader = parse_header(packet)
+        status = parse_status(client_id, reader)
+        assert (msg_type, status.dial_hz, status.mode, status.dx_call) == (1, 14_074_000, "FT8", "K1ABC")
+        assert status.transmitting and status.tx_df == 1500
+        assert parse_header(b"not wsjt-x") is None
+        assert parse_status("x", parse_header(packet[:30])[2]) is None
+        assert StateCache().get("frequency_hz", default=0) == 0
+
+    def test_listener_replay(self):
+        import socket
+
+        from ft1000mp.state import StateCache
+        from ft1000mp.wsjtx import (
+            SOURCE, WSJTXListener, WSJTXStatus, build_close, build_heartbeat, build_status,
+        )
+
+        cache = StateCache()
+        captured = [
+            build_heartbeat(),
+            build_status(WSJTXStatus("WSJT-X", 7_074_000, "FT8")),
+            b"garbage",
+            build_status(WSJTXStatus("WSJT-X", 7_074_000, "FT8", transmitting=True)),
+        ]
+        with WSJTXListener(cache, port=0) as listener:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx:
+                for packet in captured:
+                    tx.sendto(packet, listener.address)
+                assert _eventually(lambda: listener.packets == 3 and listener.ignored == 1)
+                obs = cache.observation("frequency_hz")
+                assert (obs.value, obs.source) == (7_074_000, SOURCE)
+                assert cache.get("transmitting") is True
+                assert listener.running and cache.external_age() < 1
+                tx.sendto(build_close(), listener.address)
+                assert _eventually(lambda: not listener.running)
+        assert cache.get("wsjtx_mode") == "FT8"
+
+    def test_listener_joins_group(self):
+        import socket
+
+        from ft1000mp.state import StateCache
+        from ft1000mp.wsjtx import WSJTXListener, WSJTXStatus, build_status
+
+        cache = StateCache()
+        try:
+            listener = WSJTXListener(cache, port=0, group="239.255.0.1", interface="127.0.0.1")
+        except OSError as exc:
+            pytest.skip(f"no multicast here: {exc}")
+        with listener, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx:
+            tx.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton("127.0.0.1"))
+            tx.sendto(build_status(WSJTXStatus("WSJT-X", 10_136_000, "FT8")),
+                      ("239.255.0.1", listener.address[1]))
+            assert _eventually(lambda: listener.packets == 1)
+        assert cache.get("frequency_hz") == 10_136_000
+
+    def test_setter_drops_wsjtx_frequency(self, emulated):
+        from ft1000mp.wsjtx import SOURCE
+
+        emulated.state.update(SOURCE, frequency_hz=14_074_000, mode_name="USB")
+        emulated.set_split(True)
+        assert emulated.state.get("frequency_hz") is None
+        assert emulated.state.get("mode_name") is None
+
+    def test_poller_backs_off_and_verifies(self, emulated, emulator):
+        from ft1000mp.state import StatePoller
+        from ft1000mp.wsjtx import SOURCE
+
+        mismatches = []
+        with StatePoller(emulated, interval=0.02, verify_interval=60.0,
+                         on_mismatch=lambda obs, hz: mismatches.append((obs.value, hz))) as poller:
+            assert _eventually(lambda: poller.polls >= 3)
+            emulated.state.update(SOURCE, frequency_hz=14_074_000)
+            time.sleep(0.3)             # let a poll already in flight finish
+            settled = poller.polls
+            time.sleep(0.2)
+            assert poller.polls == settled and poller.current_interval == 60.0
+            emulated.state.update(SOURCE, frequency_hz=14_074_000)
+            poller.poll()
+        assert poller.verifications >= 1
+        assert mismatches == [(14_074_000, 14_195_000)]
+
+
+def _status_reads(emulator) -> list[int]:
+    return [f[3] for f in emulator.frames if f[4] == Opcode.STATUS_UPDATE]
+
+
+class TestVFOTracking:
+    """get_vfos(): labelled A/B from one 32-byte read, probing only when ambiguous."""
+
+    def test_first_call_probes_then_tracks(self, emulated, emulator):
+        snap = emulated.get_vfos()
+        assert (snap.a.frequency_hz, snap.b.frequency_hz) == (14_195_000, 7_074_000)
+        assert snap.selected == "A" and snap.confident and snap.probed
+        assert _status_reads(emulator) == [StatusTarget.VFO_DATA, StatusTarget.ALL_DATA]
+        emulator.frames.clear()
+        snap = emulated.get_vfos()
+        assert snap.confident and not snap.probed
+        assert _status_reads(emulator) == [StatusTarget.VFO_DATA]
+        assert emulated.dump_memories().from_cache
+
+    def test_select_vfo_is_tracked(self, emulated, emulator):
+        emulated.select_vfo("B")
+        snap = emulated.get_vfos()
+        assert not snap.probed and snap.selected == "B"
+        assert snap.a.frequency_hz == 14_195_000 and snap.active.frequency_hz == 7_074_000
+        assert emulated.state.get("vfo_b").frequency_hz == 7_074_000
+
+    def test_front_panel_switch_and_knob(self, emulated, emulator):
+        emulated.get_vfos()
+        emulator.vfo_b_selected = True              # A/B button on the radio
+        snap = emulated.get_vfos()
+        assert (snap.selected, snap.probed) == ("B", False)
+        assert snap.b.frequency_hz == 7_074_000
+        emulator.vfo_b.frequency_hz = 7_080_000     # tuning knob on B
+        snap = emulated.get_vfos()
+        assert (snap.selected, snap.probed, snap.b.frequency_hz) == ("B", False, 7_080_000)
+        assert emulated.selected_vfo == "B"
+
+    def test_own_commands_keep_tracking(self, emulated, emulator):
+        emulated.get_vfos()
+        emulated.set_frequency_b(21_200_000)
+        emulated.copy_vfo_a_to_b()
+        emulated.set_frequency_a(28_400_000)
+        emulator.frames.clear()
+        snap = emulated.get_vfos()
+        assert not snap.probed
+        assert (snap.a.frequency_hz, snap.b.frequency_hz) == (28_400_000, 14_195_000)
+
+    def test_failed_tune_is_not_tracked(self, emulated, emulator):
+        emulated.get_vfos()
+        emulated._serial._ser = None
+        with pytest.raises(SerialConnectionError):
+            emulated.set_frequency_b(21_200_000)
+        assert emulated._vfos.frequency["B"] == 7_074_000
+
+    def test_ambiguous_without_probe(self, emulated, emulator):
+        emulator.vfo_b = EmulatedVFO(14_195_000, Mode.USB)
+        emulator.vfo_b_selected = True
+        snap = emulated.get_vfos(probe=False)
+        assert not snap.confident and not snap.probed
+        assert _status_reads(emulator) == [StatusTarget.VFO_DATA]
+        snap = emulated.get_vfos()
+        assert not snap.confident and snap.probed and snap.selected is None
+        emulated.select_vfo("B")
+        emulator.frames.clear()
+        assert emulated.get_vfos().selected == "B"
+        assert _status_reads(emulator) == [StatusTarget.VFO_DATA]
+
+
+class TestSnapshotRestore:
+    """snapshot()/restore() send only the commands that differ, in one batch."""
+
+    def test_nothing_changed(self, emulated, emulator):
+        snap = emulated.snapshot()
+        emulator.frames.clear()
+        assert emulated.restore(snap) == 7
+        writes = [f for f in emulator.frames if f[4] not in (Opcode.STATUS_UPDATE, Opcode.READ_FLAGS)]
+        assert writes == []
+
+    def test_restores_what_differs(self, emulated, emulator):
+        snap = emulated.snapshot()
+        emulated.set_frequency_a(7_010_000)
+        emulated.set_mode("CW")
+        emulated.set_split(True)
+        emulator.frames.clear()
+        sent = []
+        original = emulated._serial.send_commands
+        emulated._serial.send_commands = lambda frames, deadline=None: (
+            sent.append(list(frames)), original(frames, deadline))
+        assert emulated.restore(snap) == 4
+        assert sent == [[cmd_set_freq_a(14_195_000), cmd_set_mode(Mode.USB), cmd_split(False)]]
+        assert (emulator.vfo_a.frequency_hz, emulator.vfo_a.mode, emulator.split) == (
+            14_195_000, Mode.USB, False)
+
+    def test_clarifier_only_on_same_vfo(self, emulated, emulator):
+        emulator.vfo_a.clarifier_offset = 500
+        emulator.vfo_a.rit = True
+        snap = emulated.snapshot()
+        emulator.vfo_a.clarifier_offset = 0     # on the front panel
+        emulator.vfo_a.rit = False
+        assert emulated.restore(snap) == 7       # the fresh cache missed it
+        assert emulated.restore(snap, max_age=0) == 5
+        assert (emulator.vfo_a.clarifier_offset, emulator.vfo_a.rit) == (500, True)
+        emulated.select_vfo("B")
+        emulator.vfo_b.clarifier_offset = -300
+        emulator.frames.clear()
+        emulated.restore(snap, max_age=0)
+        assert emulator.vfo_b.clarifier_offset == -300
+        assert not any(f[4] == Opcode.CLARIFIER for f in emulator.frames)
+
+    def test_sub_modes_are_not_restored(self, emulated, emulator):
+        emulator.vfo_a.mode = Mode.CW            # reads back as CW-R
+        snap = emulated.snapshot()
+        assert snap.vfo_a.mode_name == "CW-R"
+        emulator.vfo_a.mode = Mode.USB
+        emulator.vfo_b.mode = Mode.USB
+        emulator.frames.clear()
+        emulated.restore(snap, max_age=0)
+        assert emulator.vfo_a.mode == Mode.USB
+        assert emulator.vfo_b.mode == Mode.LSB
+        assert cmd_set_mode(Mode.CW) not in emulator.frames
+
+    def test_unknown_selection_counts_no_clarifier(self, emulated, emulator):
+        import dataclasses
+
+        snap = dataclasses.replace(emulated.snapshot(), selected=None)
+        emulator.frames.clear()
+        assert emulated.restore(snap) == 5       # freq and mode x2, split
+        assert not any(f[4] == Opcode.CLARIFIER for f in emulator.frames)
+
+    def test_uses_fresh_cache(self, emulated, emulator):
+        snap = emulated.snapshot()
+        emulator.frames.clear()
+        assert emulated.restore(snap) == 7       # RESTORE_MAX_AGE by default
+        assert emulator.frames == []
+        emulated.set_frequency_b(21_000_000)     # writes invalidate the cache
+        emulator.frames.clear()
+        assert emulated.restore(snap, max_age=60) == 6
+        assert emulator.vfo_b.frequency_hz == 7_074_000
+        assert cmd_set_freq_b(7_074_000) in emulator.frames
+
+
+class TestStream:
+    """stream(): sync and async sampling, cheapest reads, skipping under backpressure."""
+
+    def test_reads_only_requested_fields(self, emulated, emulator):
+        samples = list(emulated.stream(0.01, fields=("flags",), count=3))
+        assert all(s.flags is not None and s.vfo is None for s in samples)
+        assert [f[4] for f in emulator.frames] == [Opcode.READ_FLAGS] * 3
+        emulator.frames.clear()
+        (sample,) = emulated.stream(0.01, fields=("vfo",), count=1)
+        assert sample.vfo.frequency_hz == 14_195_000
+        assert emulator.frames == [cmd_status_update(StatusTarget.OPERATING_DATA)]
+        emulator.frames.clear()
+        (sample,) = emulated.stream(0.01, fields=("vfo", "vfos"), count=1)
+        assert emulator.frames == [cmd_status_update(StatusTarget.VFO_DATA)]
+        assert sample.vfo == sample.vfos.a and sample.vfos.b.frequency_hz == 7_074_000
+
+    def test_cadence_and_skipping(self, emulated):
+        stream = emulated.stream(0.1, fields=("flags",), count=6)
+        start = time.monotonic()
+        seqs = []
+        for sample in stream:
+            seqs.append(sample.seq)
+            if sample.seq == 2:
+                time.sleep(0.35)            # slow consumer: misses slots
+        assert seqs[:3] == [0, 1, 2]
+        assert stream.skipped >= 2 and seqs[3] == 3 + stream.skipped
+        assert len(seqs) == 6
+        assert time.monotonic() - start < 0.1 * (seqs[-1] + 2)
+
+    def test_async(self, emulated, emulator):
+        import asyncio
+
+        async def collect():
+            return [s async for s in emulated.stream(0.1, fields=("vfos",), count=3)]
+
+        samples = asyncio.run(collect())
+        assert [s.seq for s in samples] == [0, 1, 2]
+        assert all(s.vfos.a.frequency_hz == 14_195_000 for s in samples)
+        assert samples[0].timestamp <= samples[-1].timestamp
+
+    def test_timeout_covers_the_whole_sample(self, emulated):
+        timeouts = []
+        read_flags, get_vfos = emulated.read_flags, emulated.get_vfos
+
+        def slow_flags(timeout=None):
+            timeouts.append(timeout)
+            time.sleep(0.1)
+            return read_flags(timeout)
+
+        def vfos(probe=True, timeout=None):
+            timeouts.append(timeout)
+            return get_vfos(probe, timeout)
+
+        emulated.read_flags, emulated.get_vfos = slow_flags, vfos
+        next(iter(emulated.stream(1.0, fields=("flags", "vfos"), timeout=2.0)))
+        assert timeouts[0] == pytest.approx(2.0, abs=0.01)
+        assert timeouts[1] < 2.0 - 0.1
+
+    def test_bad_fields(self, emulated):
+        with pytest.raises(ValueError):
+            emulated.stream(1.0, fields=("smeter",))
+        with pytest.raises(ValueError):
+            emulated.stream(0, fields=("flags",))
+
+
+class TestPortLock:
+    """Cross-process port lock: busy errors name the holder, handoff is quick."""
+
+    @pytest.fixture
+    def device(self, tmp_path):
+        return str(tmp_path / "ttyUSB9")
+
+    @staticmethod
+    def _port(device, **kwargs):
+        from ft1000mp.transport import LoopbackTransport
+
+        return SerialPort(port=device, transport=LoopbackTransport(), **kwargs)
+
+    def test_busy_error_names_holder(self, device):
+        from ft1000mp.exceptions import PortBusyError
+        from ft1000mp.portlock import lock_holder
+
+        first = self._port(device)
+        first.open()
+        with pytest.raises(PortBusyError) as info:
+            self._port(device).open()
+        assert isinstance(info.value, SerialConnectionError)
+        assert info.value.holder.pid == os.getpid()
+        assert lock_holder(device).pid == os.getpid()
+        first.close()
+        assert lock_holder(device) is None
+        second = self._port(device)
+        second.open()
+        second.close()
+
+    def test_lock_dir_is_shared_between_users(self, device, tmp_path, monkeypatch):
+        import stat
+
+        shared = tmp_path / "shared-locks"
+        monkeypatch.setenv("FT1000MP_LOCK_DIR", str(shared))
+        old_umask = os.umask(0o077)
+        try:
+            port = self._port(device)
+            port.open()
+        finally:
+            os.umask(old_umask)
+        assert stat.S_IMODE(shared.stat().st_mode) == 0o1777
+        (lock_file,) = shared.glob("*.lock")
+        assert stat.S_IMODE(lock_file.stat().st_mode) == 0o666
+        port.close()
+
+    def test_unusable_lock_dir_opens_unlocked(self, device, tmp_path, monkeypatch):
+        (tmp_path / "not-a-dir").write_text("")
+        monkeypatch.setenv("FT1000MP_LOCK_DIR", str(tmp_path / "not-a-dir" / "locks"))
+        port = self._port(device)
+        with pytest.warns(UserWarning, match="unlocked"):
+            port.open()
+        assert port.is_open
+        port.close()
+
+    def test_holder_of_dead_process_is_ignored(self, device):
+        import json
+
+        from ft1000mp.portlock import PortLock, lock_holder
+
+        lock = PortLock(device)
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True, check=True)
+        os.makedirs(os.path.dirname(lock.path), exist_ok=True)
+        with open(lock.path, "w") as f:
+            json.dump({"pid": int(dead.stdout), "program": "x", "port": device, "since": 0}, f)
+        assert lock_holder(device) is None
+        self._port(device).open()          # the stale file does not block
+
+    def test_symlink_shares_lock(self, device, tmp_path):
+        from ft1000mp.exceptions import PortBusyError
+
+        Path(device).touch()
+        link = tmp_path / "by-id-link"
+        link.symlink_to(device)
+        first = self._port(device)
+        first.open()
+        with pytest.raises(PortBusyError):
+            self._port(str(link)).open()
+        first.close()
+
+    def test_urls_are_not_locked(self):
+        first, second = self._port("loop://"), self._port("loop://")
+        first.open()
+        second.open()
+        assert first.lock_holder() is None
+
+    def test_cooperative_handoff(self, device):
+        requests = []
+        first = self._port(device, on_lock_request=lambda r: requests.append(r) or True)
+        first.open()
+        second = self._port(device, lock_timeout=2.0)
+        start = time.monotonic()
+        second.open()
+        elapsed = time.monotonic() - start
+        assert not first.is_open and second.is_open
+        assert requests[0].pid == os.getpid()
+        assert elapsed < 0.5, f"handoff took {elapsed * 1000:.0f} ms"
+        second.close()
+
+    def test_declined_request_times_out_without_keeping_lock(self, device):
+        from ft1000mp.exceptions import PortBusyError
+
+        first = self._port(device, on_lock_request=lambda r: False)
+        first.open()
+        with pytest.raises(PortBusyError):
+            self._port(device, lock_timeout=0.2).open()
+        assert first.is_open
+        first.close()
+        third = self._port(device, lock_timeout=1.0)
+        third.open()                  # the abandoned waiter let go
+        third.close()
+
+    def test_handoff_between_processes(self, device):
+        from ft1000mp.transport import LoopbackTransport
+
+        code = (
+            "import sys, time\n"
+            "from ft1000mp.serial_port import SerialPort\n"
+            "from ft1000mp.transport import LoopbackTransport\n"
+            f"port = SerialPort({device!r}, transport=LoopbackTransport(),\n"
+            "                  on_lock_request=lambda r: True)\n"
+            "port.open()\n"
+            "print('ready', flush=True)\n"
+            "while port.is_open:\n"
+            "    time.sleep(0.01)\n"
+        )
+        holder = subprocess.Popen(
+            [sys.executable, "-c", code], stdout=subprocess.PIPE, text=True,
+            cwd=Path(__file__).resolve().parent.parent, env=os.environ.copy(),
+        )
+        try:
+            assert holder.stdout.readline().strip() == "ready"
+            radio = FT1000MP(port=device, transport=LoopbackTransport(), lock_timeout=5.0)
+            assert radio.lock_holder().pid == holder.pid
+            start = time.monotonic()
+            radio.open()
+            elapsed = time.monotonic() - start
+            assert elapsed < 0.5, f"handoff took {elapsed * 1000:.0f} ms"
+            assert holder.wait(timeout=5) == 0
+            radio.close()
+        finally:
+            holder.kill()
+
+
+class TestScheduledCommands:
+    """radio.at(): frames encoded up front, last byte lands on the target."""
+
+    @pytest.fixture
+    def arrivals(self, emulator):
+        """Wall-clock time each complete frame reached the emulator."""
+        times = []
+        write = emulator.write
+
+        def timed_write(data):
+            count = len(emulator.frames)
+            written = write(data)
+            times.extend([time.time()] * (len(emulator.frames) - count))
+            return written
+
+        emulator.write = timed_write
+        return times
+
+    def test_lands_on_target(self, emulated, emulator, arrivals):
+        for i in range(5):
+            target = time.time() + 0.1
+            landing = emulated.at(target, lambda: emulated.set_frequency_a(14_074_000 + i * 1000))
+            assert emulator.vfo_a.frequency_hz == 14_074_000 + i * 1000
+            assert abs(landing.error) < 0.010, f"{landing.error * 1000:+.1f} ms"
+            # The report matches when the frame really arrived (plus one byte on the wire).
+            assert abs(arrivals[-1] - target) < 0.010
+            assert abs(landing.landed - arrivals[-1]) < 0.005
+        assert emulated.scheduler.jitter < 0.010
+        assert len(emulated.scheduler.landings) == 5
+
+    def test_batch_starts_early_by_its_pacing(self, emulated, emulator, arrivals):
+        frames = [cmd_set_freq_a(7_074_000), cmd_set_mode(Mode.USB), cmd_split(True)]
+        lead = emulated.scheduler.lead(frames)
+        assert lead > emulated.scheduler.lead(frames[:1])
+        target = time.time() + 0.15
+        landing = emulated.at(target, frames)
+        assert emulator.frames[-3:] == frames
+        assert arrivals[-3] < target - 0.02          # the first frame went out early
+        assert abs(arrivals[-1] - target) < 0.010
+        assert landing.frames == 3
+
+    def test_frames_are_encoded_before_waiting(self, emulated, emulator):
+        before = len(emulator.frames)
+        with pytest.raises(InvalidFrequencyError):
+            emulated.at(time.time() + 60, lambda: emulated.set_frequency_a(50_000_000))
+        with pytest.raises(ValueError):
+            emulated.at(time.time() + 60, lambda: emulated.read_flags())
+        with pytest.raises(ValueError):
+            emulated.at(time.time() + 60, [])
+        assert len(emulator.frames) == before
+
+    def test_bookkeeping_waits_for_the_send(self, emulated, emulator):
+        emulated.select_vfo("A")
+        with pytest.raises(DeadlineExceeded):
+            emulated.at(time.time() - 2.0, lambda: (
+                emulated.set_frequency_a(7_074_000), emulated.select_vfo("B")))
+        assert emulated._vfos.frequency["A"] is None
+        assert emulated.selected_vfo == "A"
+        emulated.at(time.time() + 0.05, lambda: emulated.set_frequency_a(7_074_000))
+        assert emulated._vfos.frequency["A"] == 7_074_000
+
+    def test_past_target_is_refused(self, emulated):
+        with pytest.raises(DeadlineExceeded):
+            emulated.at(time.time() - 2.0, [cmd_split(True)])
+        landing = emulated.at(time.time() - 0.05, [cmd_split(True)], max_late=1.0)
+        assert landing.error > 0.04
+
+    def test_next_period(self):
+        from ft1000mp.schedule import next_period
+
+        assert next_period(15, now=1000.0) == 1005.0
+        assert next_period(15, now=1005.0) == 1020.0
+        assert next_period(15, offset=-0.5, now=1000.0) == 1004.5
+        assert next_period(15, offset=-0.5, now=1004.6) == 1019.5
+
+
+class TestHopTable:
+    """Compiled hop tables played on schedule, with per-hop landing stats."""
+
+    def test_compile_packs_frames(self):
+        from ft1000mp.hopping import NCDXF_FREQUENCIES_HZ, ncdxf_table
+
+        table = ncdxf_table()
+        assert len(table) == 5
+        assert len(table.buffer) == 5 * 2 * 5
+        assert table.frames[0] == (cmd_set_freq_a(14_100_000), cmd_set_mode(Mode.CW))
+        assert b"".join(b"".join(f) for f in table.frames) == table.buffer
+        assert [h.freq_hz for h in table.hops] == list(NCDXF_FREQUENCIES_HZ)
+        assert table.offsets == (0.0, 10.0, 20.0, 30.0, 40.0)
+        assert table.period == 50.0
+
+    def test_compile_validates_once(self):
+        from ft1000mp.hopping import Hop, HopTable
+
+        with pytest.raises(InvalidFrequencyError):
+            HopTable.compile([Hop(50_000_000)])
+        with pytest.raises(InvalidModeError):
+            HopTable.compile([Hop(14_100_000, "SSTV")])
+        with pytest.raises(ValueError):
+            HopTable.compile([Hop(14_100_000, dwell=0)])
+        with pytest.raises(ValueError):
+            HopTable.compile([])
+        assert len(HopTable.compile([Hop(14_100_000)]).buffer) == 5
+
+    def test_plays_on_cadence(self, emulated, emulator):
+        from ft1000mp.hopping import Hop, HopExecutor, HopTable
+
+        table = HopTable.compile(
+            [Hop(14_100_000, "CW", 0.1), Hop(18_110_000, None, 0.1), Hop(21_150_000, "USB", 0.1)]
+        )
+        executor = HopExecutor(emulated, table)
+        start = time.time() + 0.3
+        executor.run(cycles=2, start=start)
+        sent = emulator.frames[-10:]
+        assert b"".join(sent) == table.buffer * 2
+        assert emulator.vfo_a.frequency_hz == 21_150_000
+        assert executor.last.target == pytest.approx(start + 0.5)
+        stats = executor.stats()
+        assert [s.played for s in stats] == [2, 2, 2]
+        for entry in stats:
+            assert abs(entry.mean_error) < 0.010 and abs(entry.worst_error) < 0.010
+        assert emulated._vfos.frequency["A"] == 21_150_000
+
+    def test_rejects_overlapping_cycles(self, emulated, emulator):
+        from ft1000mp.hopping import Hop, HopExecutor, HopTable
+
+        executor = HopExecutor(emulated, HopTable.compile([Hop(14_100_000, dwell=0.2)] * 2))
+        with pytest.raises(ValueError):
+            executor.run(cycles=2, start=time.time(), cycle=0.3)
+        assert emulator.frames == []
+
+    def test_busy_port_skips_hop(self, emulated):
+        import threading
+
+        from ft1000mp.hopping import Hop, HopExecutor, HopTable
+
+        table = HopTable.compile([Hop(14_100_000, dwell=0.3), Hop(18_110_000, dwell=0.3)])
+        executor = HopExecutor(emulated, table, max_late=0.05)
+        start = time.time() + 0.3
+
+        def hog():
+            with emulated._serial._lock.hold():
+                time.sleep(start - time.time() + 0.15)   # past hop 0's deadline
+
+        threading.Thread(target=hog).start()
+        executor.run(cycles=1, start=start)
+        stats = executor.stats()
+        assert (stats[0].played, stats[0].missed) == (0, 1)
+        assert (stats[1].played, stats[1].missed) == (1, 0)
+
+    def test_stop(self, emulated):
+        import threading
+
+        from ft1000mp.hopping import Hop, HopExecutor, HopTable
+
+        executor = HopExecutor(emulated, HopTable.compile([Hop(14_100_000, dwell=5.0)]))
+        threading.Timer(0.2, executor.stop).start()
+        t = time.monotonic()
+        executor.run(cycles=None, start=time.time() + 0.05)
+        assert time.monotonic() - t < 1.0
+        assert executor.hops_played == 1
+
+
+class TestMeter:
+    """READ_METER (0xF7) and the ring-buffer sampler."""
+
+    def test_read_meter(self, emulated, emulator):
+        from ft1000mp.protocol import cmd_read_meter
+
+        assert cmd_read_meter() == bytes([0, 0, 0, 0x00, 0xF7])
+        assert cmd_read_meter(sub=True) == bytes([0, 0, 0, 0x01, 0xF7])
+        emulator.meter, emulator.sub_meter = 170, 40
+        assert emulated.read_meter() == 170
+        assert emulated.read_meter(sub=True) == 40
+        assert emulator.frames[-1] == cmd_read_meter(sub=True)
+        assert emulated.state.get("meter") == 170
+        assert emulated.state.get("sub_meter") == 40
+
+    def test_decimation_and_wraparound(self):
+        pytest.importorskip("numpy")
+        from ft1000mp.metering import MeterSampler
+
+        sampler = MeterSampler(None, capacity=4, decimation=3)
+        for i in range(20):
+            sampler.add(i * 10 % 256, 1000.0 + i)
+        assert sampler.reads == 20 and sampler.samples == 6 and len(sampler) == 4
+        data = sampler.arrays()
+        # groups of 3 reads: [0..2] [3..5] ... [15..17]; the last two reads wait
+        assert data["time"].tolist() == [1008.0, 1011.0, 1014.0, 1017.0]
+        assert data["min"].tolist() == [60, 90, 120, 150]
+        assert data["max"].tolist() == [80, 110, 140, 170]
+        assert data["mean"].tolist() == [70.0, 100.0, 130.0, 160.0]
+        assert sampler.arrays(last=2)["time"].tolist() == [1014.0, 1017.0]
+        with pytest.raises(ValueError):
+            MeterSampler(None, decimation=0)
+
+    def test_background_sampling(self, emulated, emulator):
+        pytest.importorskip("numpy")
+        emulator.meter = 99
+        with emulated.meter_sampler(capacity=64) as sampler:
+            time.sleep(0.3)
+        data = sampler.arrays()
+        assert len(data["time"]) == len(sampler) > 0
+        assert (data["max"] == 99).all() and sampler.errors == 0
+        assert (data["time"][1:] >= data["time"][:-1]).all()
+        assert sampler.rate > 0
+
+    def test_errors_back_off_and_lost_port_stops(self, emulated):
+        pytest.importorskip("numpy")
+        emulated._serial._ser = _MuteDevice()
+        emulated._serial.timeout = 0.001
+        emulated._serial.retries = 1
+        with emulated.meter_sampler(capacity=8) as sampler:
+            time.sleep(0.25)
+        assert 1 <= sampler.errors <= 5 and sampler.error is None
+        emulated._serial._ser = None
+        sampler.start()
+        sampler._thread.join(1.0)
+        assert not sampler._thread.is_alive()
+        assert isinstance(sampler.error, SerialConnectionError)
+        sampler.stop()
+
+    def test_unexpected_error_is_recorded(self, emulated, monkeypatch):
+        pytest.importorskip("numpy")
+        sampler = emulated.meter_sampler(capacity=8)
+
+        def sample():
+            raise OSError("EIO")
+
+        monkeypatch.setattr(sampler, "sample", sample)
+        sampler.start()
+        sampler._thread.join(1.0)
+        assert not sampler._thread.is_alive()
+        assert isinstance(sampler.error, OSError) and sampler.errors == 1
+        sampler.stop()
+
+    def test_benchmark_samples_per_second(self):
+        pytest.importorskip("numpy")
+        from ft1000mp.timing import OpcodeTiming
+        from ft1000mp.transport import LoopbackTransport
+
+        loop = LoopbackTransport()
+        with FT1000MP(port="loop://", transport=loop) as radio:
+            radio._serial.timing[Opcode.READ_METER] = OpcodeTiming(0.0, 0.0)  # calibrated
+            with radio.meter_sampler(decimation=10) as sampler:
+                time.sleep(0.5)
+        assert sampler.errors == 0
+        assert sampler.rate > 1000, f"meter sampling on the emulator: {sampler.rate:,.0f} reads/s"
+
+
+
+class TestScriptMode:
+    """cli --script: every line validated first, writes batched, failures located."""
+
+    def test_parse_reports_every_bad_line(self):
+        import cli
+
+        with pytest.raises(ValueError) as info:
+            cli.parse_script("freq 14.195\nmode SSB  # typo\n\nbogus\nsplit\n")
+        problems = str(info.value).splitlines()
+        assert [p.split(":")[0] for p in problems] == ["line 2", "line 4", "line 5"]
+        assert problems[2].startswith("line 5: usage:")
+        actions = cli.parse_script("# tune\nfreq 14.195\nflags\n")
+        assert [(a.command, a.write, a.line) for a in actions] == [
+            ("freq", True, 2), ("flags", False, 3)]
+
+    def test_consecutive_writes_are_one_batch(self, emulated, emulator, capsys):
+        import cli
+
+        actions = cli.parse_script("freq 7.074\nmode usb\nsplit on\nflags\n")
+        sent = []
+        original = emulated._serial.send_commands
+        emulated._serial.send_commands = lambda frames, deadline=None: (
+            sent.append(list(frames)), original(frames, deadline))
+        assert cli.run_script(emulated, actions) == 0
+        assert sent == [[cmd_set_freq_a(7_074_000), cmd_set_mode(Mode.USB), cmd_split(True)]]
+        assert "Split       : ON" in capsys.readouterr().out
+
+    def test_failure_names_its_line(self, emulated, emulator, capsys):
+        import cli
+
+        emulated._serial.timeout = 0.01
+        emulated._serial.retries = 1
+        emulator.write = lambda data: len(data)     # radio stops answering
+        assert cli.run_script(emulated, cli.parse_script("split on\nflags\n")) == 1
+        assert capsys.readouterr().err.startswith("Error: line 2:")
+        emulated._serial._ser = None                 # unplugged: the batch send fails
+        actions = cli.parse_script("split on\nclar on\nflags\n")
+        assert cli.run_script(emulated, actions) == 1
+        assert capsys.readouterr().err.startswith("Error: lines 1-2:")
+
+    def test_json_document(self, tmp_path, monkeypatch, capsys):
+        import json
+
+        import cli
+
+        script = tmp_path / "tune.txt"
+        script.write_text("freq 21.025\nmode cw\nstatus\n", encoding="utf-8")
+        monkeypatch.setattr(sys, "argv", ["cli.py", "loop://", "--script", str(script), "--json"])
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+        assert exit_info.value.code == 0
+        doc = json.loads(capsys.readouterr().out)
+        assert doc["ok"] is True and doc["error"] is None
+        assert [r["line"] for r in doc["results"]] == [1, 2, 3]
+        assert doc["results"][2]["current"]["frequency_hz"] == 21_025_000
+
+    def test_clarifier_offset_range_checked_at_parse(self):
+        import cli
+
+        assert cli.parse_script("clar -9999\n")[0].command == "clar"
+        with pytest.raises(ValueError, match="line 1: clarifier offset"):
+            cli.parse_script("clar 12000\n")
+
+    def test_json_errors_are_json(self, tmp_path, monkeypatch, capsys):
+        import json
+
+        import cli
+
+        script = tmp_path / "bad.txt"
+        script.write_text("freq 21.025\nbogus\n", encoding="utf-8")
+        monkeypatch.setattr(sys, "argv", ["cli.py", "loop://", "--script", str(script), "--json"])
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+        assert exit_info.value.code == 2
+        doc = json.loads(capsys.readouterr().out)
+        assert doc["ok"] is False and doc["results"] == []
+        assert doc["error"].startswith("line 2:")
+
+    def test_json_needs_script(self, monkeypatch, capsys):
+        import cli
+
+        monkeypatch.setattr(sys, "argv", ["cli.py", "loop://", "--json"])
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+        assert exit_info.value.code == 2
+        assert "--json needs --script" in capsys.readouterr().err
+
+
+class TestWatch:
+    """cli watch: the dashboard redraws only what changed and exits on Ctrl-C."""
+
+    VALUES = {key: "-" for key in ("a_freq", "a_mode", "a_clar", "b_freq", "b_mode",
+                                   "b_clar", "split", "tx", "rit", "rate", "latency")}
+
+    def test_lines_for_changes_only(self):
+        import io
+
+        import cli
+
+        out = io.StringIO()
+        display = cli.WatchDisplay(out)
+        display.update(self.VALUES)
+        assert len(out.getvalue().splitlines()) == len(cli.WATCH_FIELDS)
+        out.truncate(0)
+        out.seek(0)
+        display.update({**self.VALUES, "split": "ON"})
+        assert out.getvalue() == "  Split       : ON\n"
+
+    def test_ansi_rewrites_one_row_in_place(self):
+        import io
+
+        import cli
+
+        out = io.StringIO()
+        display = cli.WatchDisplay(out, ansi=True)
+        display.update(self.VALUES)
+        out.truncate(0)
+        out.seek(0)
+        display.update({**self.VALUES, "tx": "ON"})
+        up = len(cli.WATCH_FIELDS) - [k for k, _ in cli.WATCH_FIELDS].index("tx")
+        assert out.getvalue() == f"\x1b[{up}A\r  TX          : ON\x1b[K\x1b[{up}B\r"
+
+    def test_refreshes_until_interrupted(self, emulated, emulator, capsys):
+        import cli
+
+        calls = []
+        read_flags = emulated.read_flags
+
+        def flags_then_ctrl_c():
+            calls.append(None)
+            if len(calls) == 2:
+                emulator.split = True
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return read_flags()
+
+        emulated.read_flags = flags_then_ctrl_c
+        cli.watch(emulated, rate_hz=50)
+        out = capsys.readouterr().out
+        assert "  VFO-A       : 14.195000 MHz" in out
+        assert out.count("Split") == 2 and "  Split       : ON" in out
+        with pytest.raises(ValueError):
+            cli.watch(emulated, rate_hz=0)
+
+    def test_labels_follow_the_selected_vfo(self, emulated, emulator, capsys):
+        import cli
+
+        emulated.select_vfo("B")
+        emulator.vfo_b.rit = True
+        calls = []
+        read_flags = emulated.read_flags
+
+        def flags_then_ctrl_c():
+            calls.append(None)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return read_flags()
+
+        emulated.read_flags = flags_then_ctrl_c
+        emulator.frames.clear()
+        cli.watch(emulated, rate_hz=50)
+        out = capsys.readouterr().out
+        assert "  VFO-A       : 14.195000 MHz" in out
+        assert "  VFO-B       : 7.074000 MHz" in out
+        assert "Active RIT  : ON (VFO-B)" in out
+        assert cmd_status_update(StatusTarget.ALL_DATA) not in emulator.frames
+
 # ===================================================================
 # LIVE INTEGRATION TESTS — require radio on serial port
 # ===================================================================
@@ -650,66 +2971,23 @@ def radio():
 
 @pytest.fixture(scope="session", autouse=False)
 def saved_state(radio):
-    """Capture VFO-A/B state before live tests and restore after."""
-    radio_pause()
-    flags = radio.read_flags()
+    """Capture VFO-A/B, split and clarifier state before live tests and restore after.
+
+    VFO selection is not restored: select_vfo() is broken on the FT-1000MP
+    (Hamlib disables it with #if 0) because it corrupts frequency data.
+    """
     radio_pause()
-    vfo_a, vfo_b = radio.get_both_vfo_status()
+    snapshot = radio.snapshot()
     radio_pause()
 
-    state = {
-        "vfo_a_freq": vfo_a.frequency_hz,
-        "vfo_b_freq": vfo_b.frequency_hz,
-        "vfo_a_mode": vfo_a.mode_name,
-        "vfo_b_mode": vfo_b.mode_name,
-        "split": flags.split,
-        "clarifier": flags.clarifier,
-        "vfo_b_selected": flags.vfo_b_selected,
-    }
-
-    yield state
+    yield snapshot
 
-    # --- Restore state ---
-    # Select VFO-A first so freq/mode sets target the right VFO
-    radio.select_vfo("A")
-    radio_pause()
-    radio.set_frequency_a(state["vfo_a_freq"])
+    # Select VFO-A again so the clarifier is restored on the VFO it was read from
     radio_pause()
-    # Restore VFO-A mode — use base mode name (strip sub-mode qualifiers)
-    mode_a = state["vfo_a_mode"]
-    if mode_a in MODE_BY_NAME:
-        radio.set_mode(mode_a)
-    elif mode_a in ("CW-R", "CW"):
-        radio.set_mode("CW")
-    elif mode_a == "SAM":
-        radio.set_mode("AM")
-    elif mode_a in ("RTTY-R",):
-        radio.set_mode("RTTY")
-    elif mode_a in ("PKT-L", "PKT-FM"):
-        radio.set_mode("PKT")
-    radio_pause()
-    radio.set_frequency_b(state["vfo_b_freq"])
-    radio_pause()
-    # Restore VFO-B mode
-    mode_b = state["vfo_b_mode"]
-    if mode_b in MODE_BY_NAME:
-        radio.set_mode(mode_b, vfo_b=True)
-    elif mode_b in ("CW-R", "CW"):
-        radio.set_mode("CW", vfo_b=True)
-    elif mode_b == "SAM":
-        radio.set_mode("AM", vfo_b=True)
-    elif mode_b in ("RTTY-R",):
-        radio.set_mode("RTTY", vfo_b=True)
-    elif mode_b in ("PKT-L", "PKT-FM"):
-        radio.set_mode("PKT", vfo_b=True)
-    radio_pause()
-    radio.set_split(state["split"])
+    radio.select_vfo("A")
     radio_pause()
-    radio.set_clarifier(state["clarifier"])
+    radio.restore(snapshot, max_age=0)
     radio_pause()
-    # NOTE: We intentionally do NOT restore VFO-B selection here.
-    # select_vfo() is broken on the FT-1000MP (Hamlib disables it with #if 0)
-    # because it corrupts frequency data. Radio is left on VFO-A.
 
 
 # --- Helper to map sub-mode display names back to base modes ---